@@ -0,0 +1,11 @@
+"""
+RulesKit (Python) — reference runtime for the typed rules-as-functions spec.
+
+Rule implementations register against their operationId (see `ruleskit.rules`);
+`Runtime` dispatches payloads to them and `ruleskit.service` exposes the same
+`/apply/...` paths as the OpenAPI document over HTTP.
+"""
+from .runtime import Runtime, RuleError, UnknownOperation, RuleNotImplemented, rule, batch_rule
+from .tracing import Tracer
+
+__all__ = ['Runtime', 'RuleError', 'UnknownOperation', 'RuleNotImplemented', 'rule', 'batch_rule', 'Tracer']
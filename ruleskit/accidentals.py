@@ -0,0 +1,119 @@
+"""
+Chord accidental stacking and key-signature positions.
+
+Accidental glyphs are reduced once to a shape table (`SHAPES`): advance width
+in staff spaces and vertical reach above / below the note's staff position in
+steps (half spaces), from the Bravura outlines. A chord's accidentals then
+become intervals [position - below, position + above] to be packed into
+columns leftwards from the noteheads: an accidental goes into the first
+column where its interval at most touches the ones already there, so
+accidentals a seventh apart share a column and a sixth apart do not.
+
+Placement order decides how well a cluster packs, so `stack` tries a few
+orders — the usual outside-in zigzag (top, bottom, second from top, ...) and
+plain top-down — and keeps the narrowest result. Every order is a greedy
+first-fit over at most a few columns, so the search stays linear in chord
+size times orders.
+
+Key-signature positions are a table keyed by (clef, fifths), built once at
+import from the per-clef sequences.
+"""
+from collections import namedtuple
+
+Shape = namedtuple('Shape', 'width above below')
+
+# Advance (sp) and vertical reach (steps) per accidental; Bravura metrics.
+SHAPES = {
+    'sharp': Shape(0.996, 3, 3),
+    'flat': Shape(0.904, 4, 2),
+    'natural': Shape(0.672, 3, 3),
+    'doubleSharp': Shape(0.988, 1, 1),
+    'doubleFlat': Shape(1.644, 4, 2),
+}
+ALIASES = {'#': 'sharp', 'b': 'flat', 'n': 'natural', 'x': 'doubleSharp', 'bb': 'doubleFlat',
+           'accidentalSharp': 'sharp', 'accidentalFlat': 'flat', 'accidentalNatural': 'natural',
+           'accidentalDoubleSharp': 'doubleSharp', 'accidentalDoubleFlat': 'doubleFlat'}
+
+KEY_SEQUENCES = {  # x-rule parameters.<clef>.<sharps|flats>
+    ('treble', 1): (8, 5, 9, 6, 3, 7, 4),
+    ('treble', -1): (4, 7, 3, 6, 2, 5, 1),
+    ('bass', 1): (3, 6, 2, 5, 1, 4, 0),
+    ('bass', -1): (6, 3, 7, 4, 1, 5, 2),
+}
+KEY_SIGNATURES = {
+    (clef, sign * n): seq[:n]
+    for (clef, sign), seq in KEY_SEQUENCES.items()
+    for n in range(0 if sign > 0 else 1, len(seq) + 1)
+}
+
+def key_signature_positions(clef, fifths):
+    try:
+        return KEY_SIGNATURES[(clef, fifths)]
+    except KeyError:
+        clefs = sorted({c for c, _ in KEY_SEQUENCES})
+        if clef not in clefs:
+            raise ValueError(f'unknown clef {clef!r}; expected one of {", ".join(clefs)}') from None
+        raise ValueError(f'fifths must be between -7 and 7, got {fifths}') from None
+
+def shape(glyph):
+    s = SHAPES.get(ALIASES.get(glyph, glyph))
+    if s is None:
+        raise ValueError(f'unknown accidental {glyph!r}; expected one of {", ".join(SHAPES)}')
+    return s
+
+def _zigzag(order):
+    out, lo, hi = [], 0, len(order) - 1
+    while lo <= hi:
+        out.append(order[lo])
+        if lo != hi:
+            out.append(order[hi])
+        lo, hi = lo + 1, hi - 1
+    return out
+
+def _pack(items, order):
+    """First-fit columns for items [(position, shape)] in the given order."""
+    columns = []   # per column: list of (low, high)
+    assigned = [0] * len(items)
+    for i in order:
+        pos, s = items[i]
+        low, high = pos - s.below, pos + s.above
+        for c, spans in enumerate(columns):
+            if all(high <= lo or low >= hi for lo, hi in spans):
+                spans.append((low, high))
+                assigned[i] = c
+                break
+        else:
+            assigned[i] = len(columns)
+            columns.append([(low, high)])
+    return assigned
+
+class Stack:
+    def __init__(self, columns, widths, offsets, total):
+        self.columns = columns     # column per accidental (0 = next to the noteheads)
+        self.widths = widths       # width per column
+        self.offsets = offsets     # left edge per accidental, relative to the notehead column (< 0)
+        self.total = total         # lead-in width: padding + columns + gaps
+
+def stack(accidentals, padding, gap):
+    """accidentals: [(staff position, glyph)] -> Stack."""
+    items = [(pos, shape(glyph)) for pos, glyph in accidentals]
+    if not items:
+        return Stack([], [], [], 0.0)
+    top_down = sorted(range(len(items)), key=lambda i: -items[i][0])
+    best = None
+    for order in (_zigzag(top_down), top_down):
+        assigned = _pack(items, order)
+        widths = [0.0] * (max(assigned) + 1)
+        for c, (_, s) in zip(assigned, items):
+            widths[c] = max(widths[c], s.width)
+        total = padding + sum(widths) + gap * (len(widths) - 1)
+        if best is None or total < best[0] - 1e-12:
+            best = (total, assigned, widths)
+    total, assigned, widths = best
+    # Column c's right edge sits at -(padding + widths[:c] + c gaps); glyphs are right-aligned.
+    right, x = [], -padding
+    for w in widths:
+        right.append(x)
+        x -= w + gap
+    offsets = [right[c] - s.width for c, (_, s) in zip(assigned, items)]
+    return Stack(assigned, widths, offsets, total)
@@ -0,0 +1,140 @@
+"""
+Offline batch evaluation: stream newline-delimited `{"operationId", "input"}`
+records (optionally with `fixtures`: {font, staffSize, paper}) through the runtime and write one NDJSON result per record, in input
+order, without running the service. A record for an operation the runtime
+does not implement yet (the service's 501) gets a `skipped` result rather
+than an `error`, so mixed workloads such as ruleskit.synth output run through.
+
+Input is processed in chunks of --chunk-size records across a process pool;
+at most 2 x --workers chunks are in flight, so memory stays bounded however
+large the input is. Every result line carries `next`, the input byte offset
+just past its record: after a crash, rerun with `--offset <last next>` (and
+--output pointing at the same file, which is then appended to).
+
+With --trace FILE, rule spans from every worker are collected and written as
+one Chrome trace JSON file (--trace-sample to time only a fraction).
+
+Usage: python -m ruleskit.batch [FILE|-] [--output FILE] [--workers N]
+                                [--chunk-size N] [--offset BYTES] [--trace FILE]
+"""
+import argparse, json, os, sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .runtime import Runtime, RuleNotImplemented
+from .fixtures import from_fixtures
+from .tracing import Tracer
+
+_RUNTIME = None
+
+def _init_worker(trace_sample=None):
+    global _RUNTIME
+    _RUNTIME = Runtime(tracer=Tracer(trace_sample) if trace_sample else None)
+
+def _apply_line(line):
+    try:
+        rec = json.loads(line)
+        rid = rec['operationId']
+    except (ValueError, KeyError, TypeError) as e:
+        return {'error': f'invalid record: {e}'}
+    try:
+        ctx = from_fixtures(rec.get('fixtures'))
+        return {'operationId': rid, 'output': _RUNTIME.apply(rid, rec.get('input') or {}, ctx)}
+    except RuleNotImplemented:
+        return {'operationId': rid, 'skipped': 'not implemented'}
+    except Exception as e:
+        return {'operationId': rid, 'error': f'{type(e).__name__}: {e}'}
+
+def process_chunk(chunk):
+    """Evaluate [(next_offset, raw_line), ...]; returns (result lines, trace events)."""
+    if _RUNTIME is None:
+        _init_worker()
+    out = []
+    for nxt, line in chunk:
+        res = _apply_line(line)
+        res['next'] = nxt
+        out.append(json.dumps(res, separators=(',',':')) + '\n')
+    return out, (_RUNTIME.tracer.drain() if _RUNTIME.tracer else [])
+
+def read_chunks(stream, offset, size):
+    pos = offset
+    chunk = []
+    for line in stream:
+        pos += len(line)
+        if line.strip():
+            chunk.append((pos, line))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _open_input(path, offset):
+    if path in (None, '-'):
+        stream = sys.stdin.buffer
+        remaining = offset
+        while remaining > 0:
+            skipped = stream.read(min(remaining, 1 << 20))
+            if not skipped:
+                break
+            remaining -= len(skipped)
+        return stream
+    stream = open(path, 'rb')
+    stream.seek(offset)
+    return stream
+
+def run(stream, sink, offset=0, workers=None, chunk_size=512, trace=None, trace_sample=1.0):
+    chunks = read_chunks(stream, offset, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    sample = trace_sample if trace else None
+    events = []
+    count = 0
+    def emit(result):
+        nonlocal count
+        lines, evs = result
+        sink.writelines(lines)
+        events.extend(evs)
+        count += len(lines)
+    if workers == 1:
+        _init_worker(sample)
+        for chunk in chunks:
+            emit(process_chunk(chunk))
+    else:
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(sample,)) as pool:
+            for chunk in chunks:
+                pending.append(pool.submit(process_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    emit(pending.popleft().result())
+            while pending:
+                emit(pending.popleft().result())
+    if trace:
+        Tracer(trace_sample).write(trace, events)
+    return count
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Evaluate NDJSON rule requests offline')
+    ap.add_argument('input', nargs='?', default='-', help='NDJSON file of {operationId, input} records (default: stdin)')
+    ap.add_argument('--output', '-o', help='result NDJSON file (default: stdout; appended to when --offset > 0)')
+    ap.add_argument('--workers', type=int, default=None, help='process pool size (default: CPU count; 1 = inline)')
+    ap.add_argument('--chunk-size', type=int, default=512)
+    ap.add_argument('--offset', type=int, default=0, help='input byte offset to resume from (the last `next` written)')
+    ap.add_argument('--trace', help='write Chrome trace JSON of rule spans here')
+    ap.add_argument('--trace-sample', type=float, default=1.0, help='fraction of invocations traced')
+    args = ap.parse_args(argv)
+    stream = _open_input(args.input, args.offset)
+    if args.output:
+        sink = open(args.output, 'a' if args.offset else 'w', encoding='utf-8')
+    else:
+        sink = sys.stdout
+    try:
+        n = run(stream, sink, args.offset, args.workers, args.chunk_size, args.trace, args.trace_sample)
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    print(f'Processed {n} records.', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Batched beam geometry. Beam groups from many requests are packed into ragged
+flat arrays (`BeamBatch`: positions, stem signs and per-group offsets) and
+solved in one pass over the arrays:
+
+1. stem-tip targets: note position + sign * STEM_LENGTH_SP (kneed groups with
+   mixed stems fit the note positions themselves);
+2. closed-form least-squares slope per group from running sums
+   (Sx, Sy, Sxx, Sxy) — no per-group lists are built;
+3. clamp to MAX_SLOPE_SP_PER_SPACE and quantize the total rise to RISE_QUANT_SP,
+   rounding toward flat unless the fractional quant reaches PREFER_SHALLOW;
+4. shift the beam outwards so no stem is shorter than MIN_STEM_SP;
+5. primary segment from first to last stem (centre line; stems meet the
+   beam's outer edge).
+
+Inputs carry no horizontal positions, so stems sit NOTE_SPACE_SP apart and
+slopes are staff spaces of rise per staff space of run.
+
+The solved `BeamSolution` arrays are what the refining rules work on:
+`refine_clearance` (RULE.Beaming.slope_with_clearance) re-scores candidate
+slopes around each solved slope against obstacle boxes, and `balance_voices`
+(RULE.Beaming.cross_voice_mixed_stem_slope_balance) pools the per-group sums
+of several voices into one common slope.
+"""
+from array import array
+import math
+
+STEM_LENGTH_SP = 3.5
+MIN_STEM_SP = 2.5
+NOTE_SPACE_SP = 1.0
+MAX_SLOPE_SP_PER_SPACE = 0.5   # x-rule parameters.max_slope_sp_per_space
+PREFER_SHALLOW = 0.6           # x-rule parameters.prefer_shallow_beams_weight
+RISE_QUANT_SP = 0.25
+NOTEHEAD_HALF_SP = 0.5
+
+def _sign(direction):
+    if direction == 'up':
+        return 1
+    if direction == 'down':
+        return -1
+    raise ValueError(f'stem direction must be up or down, got {direction!r}')
+
+class BeamBatch:
+    """Ragged packing of beam groups: group g owns items offsets[g]:offsets[g+1]."""
+
+    def __init__(self):
+        self.offsets = array('q', [0])
+        self.positions = array('d')
+        self.signs = array('b')
+        self.thickness = array('d')
+
+    def __len__(self):
+        return len(self.thickness)
+
+    def add(self, positions, directions, thickness):
+        if len(positions) != len(directions):
+            raise ValueError(f'{len(positions)} note positions but {len(directions)} stem directions')
+        if len(positions) < 2:
+            raise ValueError('a beam group needs at least two notes')
+        if not thickness > 0:
+            raise ValueError(f'beamThicknessSP must be positive, got {thickness}')
+        self.positions.extend(float(p) for p in positions)
+        self.signs.extend(_sign(d) for d in directions)
+        self.offsets.append(len(self.positions))
+        self.thickness.append(float(thickness))
+        return len(self.thickness) - 1
+
+class BeamSolution:
+    """Per-group solved arrays; the beam centre line is y = y0 + slope * x."""
+
+    def __init__(self, batch, n):
+        self.batch = batch
+        self.slope = array('d', bytes(8 * n))
+        self.raw_slope = array('d', bytes(8 * n))
+        self.y0 = array('d', bytes(8 * n))
+        self.sign = array('b', bytes(n))      # +1 up, -1 down, 0 kneed
+        self.sxx = array('d', bytes(8 * n))   # centred sums, reused by pooling
+        self.sxy = array('d', bytes(8 * n))
+
+    def line(self, g, x):
+        return self.y0[g] + self.slope[g] * x
+
+    def segments(self, g):
+        b = self.batch
+        n = b.offsets[g + 1] - b.offsets[g]
+        x2 = (n - 1) * NOTE_SPACE_SP
+        return [{'x1': 0.0, 'y1': self.y0[g], 'x2': x2, 'y2': self.line(g, x2)}]
+
+def quantize(slope, span):
+    """Clamp and quantize a slope so the total rise over span is a multiple of RISE_QUANT_SP."""
+    slope = max(-MAX_SLOPE_SP_PER_SPACE, min(MAX_SLOPE_SP_PER_SPACE, slope))
+    if span <= 0:
+        return 0.0
+    quants = abs(slope) * span / RISE_QUANT_SP
+    whole = math.floor(quants)
+    if quants - whole >= PREFER_SHALLOW:
+        whole += 1
+    return math.copysign(whole * RISE_QUANT_SP / span, slope)
+
+def _fit_intercept(sol, g, slope):
+    """Intercept for a slope: through the target centroid, then out to MIN_STEM_SP."""
+    b = sol.batch
+    start, end = b.offsets[g], b.offsets[g + 1]
+    positions, thickness = b.positions, b.thickness[g]
+    sign = sol.sign[g]
+    n = end - start
+    xbar = (n - 1) * NOTE_SPACE_SP / 2.0
+    if sign == 0:
+        mean = sum(positions[start:end]) / n
+        return mean - slope * xbar
+    half = thickness / 2.0
+    tips = 0.0
+    bound = -math.inf if sign > 0 else math.inf
+    for i in range(start, end):
+        x = (i - start) * NOTE_SPACE_SP
+        y = positions[i]
+        tips += y + sign * STEM_LENGTH_SP
+        # Centre line must sit at least MIN_STEM_SP beyond the notehead (+ half beam).
+        need = y + sign * (MIN_STEM_SP - half) - slope * x
+        bound = max(bound, need) if sign > 0 else min(bound, need)
+    y0 = tips / n - sign * half - slope * xbar
+    return max(y0, bound) if sign > 0 else min(y0, bound)
+
+def solve(batch):
+    n = len(batch)
+    sol = BeamSolution(batch, n)
+    offsets, positions, signs = batch.offsets, batch.positions, batch.signs
+    for g in range(n):
+        start, end = offsets[g], offsets[g + 1]
+        k = end - start
+        up = sum(1 for i in range(start, end) if signs[i] > 0)
+        sign = 1 if up == k else -1 if up == 0 else 0
+        sol.sign[g] = sign
+        sx = sy = sxx = sxy = 0.0
+        for i in range(start, end):
+            x = (i - start) * NOTE_SPACE_SP
+            t = positions[i] + sign * STEM_LENGTH_SP
+            sx += x
+            sy += t
+            sxx += x * x
+            sxy += x * t
+        cxx = sxx - sx * sx / k
+        cxy = sxy - sx * sy / k
+        raw = cxy / cxx if cxx else 0.0
+        sol.sxx[g], sol.sxy[g], sol.raw_slope[g] = cxx, cxy, raw
+        slope = quantize(raw, (k - 1) * NOTE_SPACE_SP)
+        sol.slope[g] = slope
+        sol.y0[g] = _fit_intercept(sol, g, slope)
+    return sol
+
+def _clearance(sol, g, y0, slope, obstacles):
+    """Smallest gap between the beam band and noteheads / obstacle boxes under it."""
+    b = sol.batch
+    start, end = b.offsets[g], b.offsets[g + 1]
+    half = b.thickness[g] / 2.0
+    sign = sol.sign[g] or 1
+    best = math.inf
+    for i in range(start, end):
+        x = (i - start) * NOTE_SPACE_SP
+        inner = y0 + slope * x - sign * half
+        best = min(best, sign * (inner - (b.positions[i] + sign * NOTEHEAD_HALF_SP)))
+    x_end = (end - start - 1) * NOTE_SPACE_SP
+    for box in obstacles:
+        x1, x2 = max(box['x'], 0.0), min(box['x'] + box['w'], x_end)
+        # Only boxes under the beam on the notehead side constrain it.
+        if x1 > x2 or sign * (box['y'] + box['h'] / 2.0 - (y0 + slope * (x1 + x2) / 2.0)) > 0:
+            continue
+        near = box['y'] + box['h'] if sign > 0 else box['y']
+        for x in (x1, x2):
+            best = min(best, sign * (y0 + slope * x - sign * half - near))
+    return best
+
+def refine_clearance(sol, g, obstacles, min_clearance, penalty_weight, steps=4):
+    """
+    Re-score slopes within `steps` rise quanta of the solved slope: each
+    candidate is pushed outwards until it clears obstacles by min_clearance;
+    cost = penalty_weight * |slope change| + outward shift. Returns
+    (slope, y0, clearance) and updates the solution in place.
+    """
+    b = sol.batch
+    start, end = b.offsets[g], b.offsets[g + 1]
+    span = (end - start - 1) * NOTE_SPACE_SP
+    sign = sol.sign[g] or 1
+    base = sol.slope[g]
+    best = None
+    for k in range(-steps, steps + 1):
+        slope = base + k * RISE_QUANT_SP / span
+        if abs(slope) > MAX_SLOPE_SP_PER_SPACE + 1e-12:
+            continue
+        y0 = _fit_intercept(sol, g, slope)
+        gap = _clearance(sol, g, y0, slope, obstacles)
+        shift = max(0.0, min_clearance - gap)
+        cost = penalty_weight * abs(slope - base) + shift
+        if best is None or cost < best[0] - 1e-12:
+            best = (cost, slope, y0 + sign * shift, gap + shift)
+    _, slope, y0, gap = best
+    sol.slope[g], sol.y0[g] = slope, y0
+    return slope, y0, gap
+
+def balance_voices(sol, groups, balance_weight):
+    """
+    Common slope for several voices' groups: the pooled least-squares slope
+    (sum of centred Sxy over sum of centred Sxx, each voice keeping its own
+    intercept). Each voice moves balance_weight of the way towards it.
+    Returns (common slope, per-voice slopes, balance score in [0, 1]).
+    """
+    sxx = sum(sol.sxx[g] for g in groups)
+    common = sum(sol.sxy[g] for g in groups) / sxx if sxx else 0.0
+    spans = [(sol.batch.offsets[g + 1] - sol.batch.offsets[g] - 1) * NOTE_SPACE_SP for g in groups]
+    common = quantize(common, max(spans))
+    voices = [quantize(sol.slope[g] + balance_weight * (common - sol.slope[g]), s) for g, s in zip(groups, spans)]
+    spread = sum(abs(v - common) for v in voices) / len(voices)
+    return common, voices, min(1.0, spread / MAX_SLOPE_SP_PER_SPACE)
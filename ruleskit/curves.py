@@ -0,0 +1,122 @@
+"""
+Candidate scoring for slurs and ties. All candidate cubic Béziers are sampled
+at once into flat arrays (SAMPLES points per curve, from a shared Bernstein
+weight table), and each candidate's clearance to the nearby boxes is the
+signed distance from its samples to the box (negative inside).
+
+`choose` evaluates candidates in order of their base cost (curvature terms)
+and adds a collision cost per box as it goes; a candidate is dropped as soon
+as its partial cost reaches the best complete score, and boxes farther from
+a candidate's sample bounding box than the clearance threshold are skipped
+without touching its samples. Work is therefore bounded by
+candidates x nearby boxes, and usually far less.
+"""
+from array import array
+import math
+
+SAMPLES = 17
+
+def _weights(n):
+    ts = [i / (n - 1) for i in range(n)]
+    return tuple(array('d', (w(t) for t in ts)) for w in (
+        lambda t: (1 - t) ** 3,
+        lambda t: 3 * t * (1 - t) ** 2,
+        lambda t: 3 * t * t * (1 - t),
+        lambda t: t ** 3,
+    ))
+
+_W = _weights(SAMPLES)
+
+def control_points(value):
+    """Flat [x0, y0, ..., x3, y3] or [[x, y] * 4] -> 8-tuple of floats."""
+    flat = [c for p in value for c in p] if value and isinstance(value[0], (list, tuple)) else list(value)
+    if len(flat) != 8:
+        raise ValueError(f'a cubic Bézier needs 4 control points (8 numbers), got {len(flat)} numbers')
+    return tuple(float(v) for v in flat)
+
+def curvature(points):
+    """Control-polygon height over chord length."""
+    x0, y0, x1, y1, x2, y2, x3, y3 = points
+    dx, dy = x3 - x0, y3 - y0
+    chord = math.hypot(dx, dy)
+    if chord == 0:
+        return 0.0
+    h = max(abs(dx * (y - y0) - dy * (x - x0)) for x, y in ((x1, y1), (x2, y2))) / chord
+    return h / chord
+
+class CurveSamples:
+    """Samples of many curves in flat arrays; curve c owns [c*SAMPLES, (c+1)*SAMPLES)."""
+
+    def __init__(self, curves):
+        n = len(curves)
+        self.count = n
+        self.xs = array('d', bytes(8 * n * SAMPLES))
+        self.ys = array('d', bytes(8 * n * SAMPLES))
+        self.bounds = []
+        w0, w1, w2, w3 = _W
+        for c, (x0, y0, x1, y1, x2, y2, x3, y3) in enumerate(curves):
+            base = c * SAMPLES
+            for i in range(SAMPLES):
+                self.xs[base + i] = w0[i] * x0 + w1[i] * x1 + w2[i] * x2 + w3[i] * x3
+                self.ys[base + i] = w0[i] * y0 + w1[i] * y1 + w2[i] * y2 + w3[i] * y3
+            sx = self.xs[base:base + SAMPLES]
+            sy = self.ys[base:base + SAMPLES]
+            self.bounds.append((min(sx), min(sy), max(sx), max(sy)))
+
+    def clearance(self, c, box):
+        """Signed distance from curve c to a BBox {x, y, w, h} (negative = inside)."""
+        bx0, by0 = box['x'], box['y']
+        bx1, by1 = bx0 + box['w'], by0 + box['h']
+        xs, ys = self.xs, self.ys
+        near = math.inf   # squared distance of the nearest outside sample
+        depth = 0.0       # deepest inside sample
+        for i in range(c * SAMPLES, (c + 1) * SAMPLES):
+            x, y = xs[i], ys[i]
+            dx = bx0 - x if x < bx0 else x - bx1 if x > bx1 else 0.0
+            dy = by0 - y if y < by0 else y - by1 if y > by1 else 0.0
+            if dx or dy:
+                d2 = dx * dx + dy * dy
+                if d2 < near:
+                    near = d2
+            else:
+                d = min(x - bx0, bx1 - x, y - by0, by1 - y)
+                if d > depth:
+                    depth = d
+        return -depth if depth else math.sqrt(near)
+
+    def _far(self, c, box, threshold):
+        x0, y0, x1, y1 = self.bounds[c]
+        dx = max(box['x'] - x1, 0.0, x0 - box['x'] - box['w'])
+        dy = max(box['y'] - y1, 0.0, y0 - box['y'] - box['h'])
+        return math.hypot(dx, dy) >= threshold
+
+    def min_clearance(self, c, boxes):
+        return min((self.clearance(c, b) for b in boxes), default=None)
+
+def choose(samples, base_costs, boxes, threshold, collision_penalty, candidates=None):
+    """
+    Pick the candidate (curve index into `samples`, default all) minimising
+    base cost + collision cost, where each box closer than `threshold` costs
+    collision_penalty * (1 + shortfall/threshold).
+    Returns (index, score, evaluated candidate count).
+    """
+    if candidates is None:
+        candidates = range(samples.count)
+    order = sorted(candidates, key=lambda c: (base_costs[c], c))
+    best, best_score, evaluated = None, math.inf, 0
+    for c in order:
+        score = base_costs[c]
+        if score >= best_score:
+            break  # remaining candidates start no cheaper
+        evaluated += 1
+        for box in boxes:
+            if samples._far(c, box, threshold):
+                continue
+            gap = samples.clearance(c, box)
+            if gap < threshold:
+                score += collision_penalty * (1.0 + (threshold - gap) / threshold)
+                if score >= best_score:
+                    break
+        if score < best_score:
+            best, best_score = c, score
+    return best, best_score, evaluated
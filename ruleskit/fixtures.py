@@ -0,0 +1,118 @@
+"""
+Immutable fixture contexts keyed by (font, staff size, paper), the fixture
+triple carried by REGISTRY test plans and real jobs
+(e.g. {font: Bravura, staffSize: 20pt, paper: A4}).
+
+A context is computed once per normalised triple and kept in a bounded LRU
+cache (FIXTURE_CACHE_SIZE entries), since the triple comes straight from
+service query parameters: staff-space constants, optical-size scalars and the font's
+whitelisted glyph metrics pre-scaled to points. Rules receive it by reference
+as their second argument, so rendering one score at several sizes reuses the
+per-size work.
+
+Only fonts that ship are accepted: the default font plus every compiled
+smufl/<font>.glyphs.bin (scripts/build_smufl_table.py), listed once per
+process. Any other name, and any non-positive staff size, is a ValueError.
+"""
+from collections import namedtuple
+from functools import lru_cache
+import re
+
+from . import smufl
+from .rules.optical_size import scalars
+
+DEFAULT_FIXTURES = {'font': 'Bravura', 'staffSize': '20pt', 'paper': 'A4'}
+FIXTURE_CACHE_SIZE = 64
+GLYPH_TABLE_SUFFIX = '.glyphs.bin'
+
+# Paper sizes in points (portrait width, height).
+PAPER_PT = {
+    'a3': (841.89, 1190.55),
+    'a4': (595.28, 841.89),
+    'a5': (419.53, 595.28),
+    'b4': (708.66, 1000.63),
+    'letter': (612.0, 792.0),
+    'legal': (612.0, 1008.0),
+    'tabloid': (792.0, 1224.0),
+}
+
+_LENGTH = re.compile(r'^\s*([0-9]*\.?[0-9]+)\s*(pt|mm)?\s*$', re.I)
+
+def parse_length_pt(value):
+    """'20pt', '7mm' or a bare number (points) -> float points."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = _LENGTH.match(str(value))
+    if not m:
+        raise ValueError(f'invalid length {value!r}; expected e.g. 20pt or 7mm')
+    n = float(m.group(1))
+    return n * 72.0 / 25.4 if (m.group(2) or 'pt').lower() == 'mm' else n
+
+_Context = namedtuple('FixtureContext', (
+    'font staff_size_pt paper paper_size_pt staff_space_pt '
+    'stroke_scalar spacing_scalar staff_line_thickness_sp '
+    'glyphs advances_pt bboxes_pt'
+))
+
+class FixtureContext(_Context):
+    """Per-(font, staffSize, paper) constants; metrics tuples are indexed by glyph id
+    (bboxes as (x, y, w, h) in points)."""
+    __slots__ = ()
+
+    def to_pt(self, sp):
+        return sp * self.staff_space_pt
+
+    def to_sp(self, pt):
+        return pt / self.staff_space_pt
+
+    def glyph_id(self, glyph):
+        return self.glyphs.glyph_id(glyph)
+
+    def advance_pt(self, glyph):
+        return self.advances_pt[self.glyph_id(glyph)] if self.glyphs else None
+
+    def bbox_pt(self, glyph):
+        return self.bboxes_pt[self.glyph_id(glyph)] if self.glyphs else None
+
+@lru_cache(maxsize=1)
+def fonts():
+    """Font names with a compiled glyph table, plus the default font."""
+    tables = (smufl.ROOT / 'smufl').glob('*' + GLYPH_TABLE_SUFFIX)
+    return frozenset([DEFAULT_FIXTURES['font'], *(p.name[:-len(GLYPH_TABLE_SUFFIX)] for p in tables)])
+
+def _load_glyphs(font):
+    path = smufl.ROOT / 'smufl' / (font + GLYPH_TABLE_SUFFIX)
+    return smufl.load_table(path) if path.exists() else None
+
+@lru_cache(maxsize=FIXTURE_CACHE_SIZE)
+def _build(font, staff_size_pt, paper):
+    if paper not in PAPER_PT:
+        raise ValueError(f'unknown paper {paper!r}; expected one of {", ".join(sorted(PAPER_PT))}')
+    sp_pt = staff_size_pt / 4.0
+    stroke, spacing = scalars(staff_size_pt)
+    glyphs = _load_glyphs(font)
+    advances, bboxes = (), ()
+    line_sp = None
+    if glyphs is not None:
+        adv = [glyphs.advance(i) for i in range(len(glyphs.glyphs))]
+        advances = tuple(None if a is None else a * sp_pt for a in adv)
+        boxes = [glyphs.bbox(i) for i in range(len(glyphs.glyphs))]
+        bboxes = tuple(None if b is None else (b['x'] * sp_pt, b['y'] * sp_pt, b['w'] * sp_pt, b['h'] * sp_pt) for b in boxes)
+        if 'staffLine' in glyphs.ids and glyphs.thickness('staffLine') is not None:
+            line_sp = glyphs.thickness('staffLine') * stroke
+    return FixtureContext(font, staff_size_pt, paper, PAPER_PT[paper], sp_pt,
+                          stroke, spacing, line_sp, glyphs, advances, bboxes)
+
+def fixture_context(font=None, staffSize=None, paper=None):
+    """Return the shared context for a fixture triple (REGISTRY key names)."""
+    d = DEFAULT_FIXTURES
+    font = font or d['font']
+    if font not in fonts():
+        raise ValueError(f'unknown font {font!r}; expected one of {", ".join(sorted(fonts()))}')
+    size = parse_length_pt(staffSize or d['staffSize'])
+    if not 0.0 < size < float('inf'):
+        raise ValueError(f'staff size must be positive, got {staffSize!r}')
+    return _build(font, size, (paper or d['paper']).lower())
+
+def from_fixtures(fixtures):
+    return fixture_context(**{k: v for k, v in (fixtures or {}).items() if k in DEFAULT_FIXTURES})
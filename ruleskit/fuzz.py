@@ -0,0 +1,132 @@
+"""
+Schema-driven input generation for any operationId, from the typed components.
+
+`compile_generator` turns a component schema into a closure `gen(rnd)` once
+(refs resolved, enums/required/minItems/minimum/exclusiveMinimum honoured), so
+producing inputs afterwards is just calls into nested closures. Optional
+properties are included with probability 1/2.
+
+Adversarial mode keeps inputs schema-valid but pushes them to the edges:
+arrays up to `huge_items` long, degenerate BBoxes (zero, negative or
+enormous extents) and extreme StaffSpace values.
+"""
+import random
+
+STAFF_SPACE_EXTREMES = (0.0, 1e-9, 1e-3, 1e3, 1e6, -1e6)
+NUMBER_EXTREMES = (0.0, -0.0, 1e-12, -1e-12, 1e9, -1e9)
+
+class _Compiler:
+    def __init__(self, comps, adversarial=False, max_items=8, huge_items=10000):
+        self.comps = comps
+        self.adversarial = adversarial
+        self.max_items = max_items
+        self.huge_items = huge_items
+        self.cache = {}
+
+    def ref(self, name):
+        gen = self.cache.get(name)
+        if gen is None:
+            # Placeholder breaks recursive refs; replaced once compiled.
+            self.cache[name] = lambda rnd: self.cache[name](rnd)
+            if name == 'BBox' and self.adversarial:
+                gen = self.bbox(self.compile(self.comps[name]))
+            elif name == 'StaffSpace' and self.adversarial:
+                gen = self.staff_space(self.compile(self.comps[name]))
+            else:
+                gen = self.compile(self.comps.get(name) or {})
+            self.cache[name] = gen
+        return gen
+
+    def bbox(self, normal):
+        def gen(rnd):
+            if rnd.random() < 0.5:
+                return normal(rnd)
+            kind = rnd.randrange(4)
+            x, y = rnd.uniform(-50, 50), rnd.uniform(-50, 50)
+            if kind == 0:
+                return {'x': x, 'y': y, 'w': 0.0, 'h': 0.0}
+            if kind == 1:
+                return {'x': x, 'y': y, 'w': -rnd.uniform(0, 10), 'h': -rnd.uniform(0, 10)}
+            if kind == 2:
+                return {'x': x, 'y': y, 'w': 1e9, 'h': 1e-9}
+            return {'x': 1e9, 'y': -1e9, 'w': rnd.uniform(0, 5), 'h': rnd.uniform(0, 5)}
+        return gen
+
+    def staff_space(self, normal):
+        return lambda rnd: rnd.choice(STAFF_SPACE_EXTREMES) if rnd.random() < 0.5 else normal(rnd)
+
+    def compile(self, schema):
+        if '$ref' in schema:
+            return self.ref(schema['$ref'].split('/')[-1])
+        if 'allOf' in schema:
+            merged = {}
+            for part in schema['allOf']:
+                part = self.comps.get(part['$ref'].split('/')[-1], {}) if '$ref' in part else part
+                merged.update(part)
+            return self.compile(merged)
+        if 'enum' in schema:
+            values = tuple(schema['enum'])
+            return lambda rnd: rnd.choice(values)
+        t = schema.get('type')
+        if t == 'object':
+            return self.object(schema)
+        if t == 'array':
+            return self.array(schema)
+        if t in ('number', 'integer'):
+            return self.number(schema, t == 'integer')
+        if t == 'boolean':
+            return lambda rnd: rnd.random() < 0.5
+        if t == 'string':
+            return lambda rnd: ''.join(rnd.choice('abcdefgh0123456789') for _ in range(rnd.randint(1, 8)))
+        return lambda rnd: {}
+
+    def object(self, schema):
+        required = set(schema.get('required') or ())
+        props = [(k, self.compile(v), k in required) for k, v in (schema.get('properties') or {}).items()]
+        def gen(rnd):
+            return {k: g(rnd) for k, g, req in props if req or rnd.random() < 0.5}
+        return gen
+
+    def array(self, schema):
+        item = self.compile(schema.get('items') or {})
+        lo = int(schema.get('minItems') or 0)
+        hi = max(lo, self.max_items)
+        huge = max(lo, self.huge_items)
+        adversarial = self.adversarial
+        def gen(rnd):
+            n = rnd.randint(lo, huge) if adversarial and rnd.random() < 0.2 else rnd.randint(lo, hi)
+            return [item(rnd) for _ in range(n)]
+        return gen
+
+    def number(self, schema, integer):
+        lo = schema.get('minimum')
+        xlo = schema.get('exclusiveMinimum')
+        base = lo if lo is not None else (xlo if xlo is not None else -20)
+        top = base + 40
+        def valid(v):
+            return (lo is None or v >= lo) and (xlo is None or v > xlo)
+        extremes = tuple(v for v in NUMBER_EXTREMES if valid(v))
+        adversarial = self.adversarial
+        def gen(rnd):
+            if adversarial and extremes and rnd.random() < 0.3:
+                v = rnd.choice(extremes)
+                return int(v) if integer else v
+            if integer:
+                v = rnd.randint(int(base), int(top))
+                return v + 1 if not valid(v) else v
+            v = rnd.uniform(base, top)
+            return v if valid(v) else base + 1e-6
+        return gen
+
+def compile_generator(component, comps, adversarial=False, max_items=8, huge_items=10000):
+    return _Compiler(comps, adversarial, max_items, huge_items).ref(component)
+
+def generators(operations, comps, adversarial=False, **kw):
+    """{operationId: gen(rnd)} for every operation's request component."""
+    c = _Compiler(comps, adversarial, **kw)
+    return {rid: c.ref(op.request) for rid, op in operations.items() if op.request}
+
+def samples(gen, count, seed=0):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield gen(rnd)
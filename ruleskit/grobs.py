@@ -0,0 +1,231 @@
+"""
+Grob property store keyed by coverage/grob_property_registry.yaml.
+
+Property names (X_offset, Y_extent, outside_staff_priority, ...) are interned
+to small integer ids in registry order, and grobs are plain integer ids, so no
+grob carries its own key dict. Values live per property, not per grob:
+
+- numeric registry types get a dense column — `array('d')` for number?,
+  `array('q')` for integer?/index?, `array('b')` for boolean? and an
+  interleaved `array('d')` for number-pair? (extents, positions). Missing
+  values are NaN / INT_MISSING / -1.
+- a numeric property starts sparse ({grob: value}) and is promoted to a
+  dense column once it is set on more than 1/DENSE_FRACTION of the grobs;
+- non-numeric types (lists, symbols, alists, markup, ...) stay sparse.
+
+`GrobStore.column(name)` returns a zero-copy memoryview over a dense column
+that rules can read and write in place. It is always flat: a pair column has
+a stride of 2, grob i's pair at [2*i] and [2*i + 1]. Columns grow
+by reallocation, so a view taken before `add` grows the store keeps
+addressing the old buffer; take views after the grobs are added.
+"""
+from array import array
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+import math
+
+from .spec import ROOT
+
+REGISTRY = ROOT / 'coverage' / 'grob_property_registry.yaml'
+
+INT_MISSING = -2 ** 63
+DENSE_FRACTION = 16
+MIN_DENSE = 64
+
+# registry type -> (array typecode, stride)
+DENSE_KINDS = {
+    'number?': ('d', 1),
+    'non-negative-number?': ('d', 1),
+    'integer?': ('q', 1),
+    'index?': ('q', 1),
+    'boolean?': ('b', 1),
+    'number-pair?': ('d', 2),
+}
+_MISSING = {'d': math.nan, 'q': INT_MISSING, 'b': -1}
+
+class PropertyRegistry:
+    """Interned property table: id <-> name, plus the registry type per id."""
+
+    def __init__(self, entries):
+        self.names = tuple(e['name'] for e in entries)
+        self.types = tuple(e.get('type') for e in entries)
+        self.ids = {n: i for i, n in enumerate(self.names)}
+        self.kinds = tuple(DENSE_KINDS.get(t) for t in self.types)
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name):
+        pid = self.ids.get(name)
+        if pid is None:
+            pid = self.ids.get(name.replace('-', '_'))
+            if pid is None:
+                raise KeyError(f'unknown grob property {name!r}')
+        return pid
+
+@lru_cache(maxsize=None)
+def load_registry(path=REGISTRY):
+    import yaml
+    doc = yaml.load(Path(path).read_text(), Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    return PropertyRegistry(doc.get('properties') or [])
+
+def _dense_missing(value, code):
+    if code == 'd':
+        return value != value
+    return value == _MISSING[code]
+
+class GrobView(Mapping):
+    """Read-only mapping view of one grob's set properties (no copy)."""
+    __slots__ = ('store', 'grob')
+
+    def __init__(self, store, grob):
+        self.store = store
+        self.grob = grob
+
+    def __getitem__(self, name):
+        value = self.store.get(self.grob, name, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(name)
+        return value
+
+    def __iter__(self):
+        names = self.store.registry.names
+        return (names[pid] for pid in self.store._set_ids(self.grob))
+
+    def __len__(self):
+        return sum(1 for _ in self.store._set_ids(self.grob))
+
+_ABSENT = object()
+
+class GrobStore:
+    """
+    Grobs 0..n-1 and their properties. `dense` names properties to keep in
+    dense columns from the start (e.g. the ones a rule is about to read with
+    `column`), skipping the sparse phase and the promotion copy.
+    """
+
+    def __init__(self, capacity=0, registry=None, dense=()):
+        self.registry = registry or load_registry()
+        self.capacity = max(capacity, 0)
+        self.size = 0
+        self.grob_types = []          # interned grob type names
+        self._type_ids = {}
+        self.types = array('H', bytes(2 * self.capacity))  # grob -> type id
+        self.dense = {}               # pid -> array
+        self.sparse = {}              # pid -> {grob: value}
+        for name in dense:
+            pid = self.registry.intern(name)
+            if self.registry.kinds[pid] is None:
+                raise TypeError(f'grob property {name!r} ({self.registry.types[pid]}) has no dense column')
+            self._promote(pid)
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self, need):
+        cap = max(need, 2 * self.capacity, 16)
+        self.types = array('H', self.types[:self.size]) + array('H', bytes(2 * (cap - self.size)))
+        for pid, col in self.dense.items():
+            code, stride = self.registry.kinds[pid]
+            fresh = array(code, col[:self.size * stride])
+            fresh.extend([_MISSING[code]] * ((cap - self.size) * stride))
+            self.dense[pid] = fresh
+        self.capacity = cap
+
+    def add(self, grob_type, **props):
+        tid = self._type_ids.get(grob_type)
+        if tid is None:
+            tid = self._type_ids[grob_type] = len(self.grob_types)
+            self.grob_types.append(grob_type)
+        if self.size == self.capacity:
+            self._grow(self.size + 1)
+        grob = self.size
+        self.types[grob] = tid
+        self.size += 1
+        for name, value in props.items():
+            self.set(grob, name, value)
+        return grob
+
+    def grob_type(self, grob):
+        return self.grob_types[self.types[grob]]
+
+    def _promote(self, pid):
+        code, stride = self.registry.kinds[pid]
+        col = array(code, [_MISSING[code]]) * (self.capacity * stride)
+        for grob, value in self.sparse.pop(pid, {}).items():
+            self._store_dense(col, code, stride, grob, value)
+        self.dense[pid] = col
+        return col
+
+    def _store_dense(self, col, code, stride, grob, value):
+        if stride == 2:
+            col[2 * grob], col[2 * grob + 1] = (math.nan, math.nan) if value is None else map(float, value)
+        elif value is None:
+            col[grob] = _MISSING[code]
+        else:
+            col[grob] = float(value) if code == 'd' else int(value)
+
+    def set(self, grob, name, value):
+        """Set a property (None clears it)."""
+        if not 0 <= grob < self.size:
+            raise IndexError(f'no grob {grob}')
+        pid = self.registry.intern(name)
+        col = self.dense.get(pid)
+        kind = self.registry.kinds[pid]
+        if col is None and kind is not None:
+            bucket = self.sparse.get(pid)
+            if value is not None and bucket is not None and len(bucket) >= max(MIN_DENSE, self.size // DENSE_FRACTION):
+                col = self._promote(pid)
+        if col is not None:
+            self._store_dense(col, kind[0], kind[1], grob, value)
+        elif value is None:
+            self.sparse.get(pid, {}).pop(grob, None)
+        else:
+            self.sparse.setdefault(pid, {})[grob] = value
+
+    def get(self, grob, name, default=None):
+        pid = self.registry.intern(name)
+        col = self.dense.get(pid)
+        if col is None:
+            return self.sparse.get(pid, {}).get(grob, default)
+        code, stride = self.registry.kinds[pid]
+        if stride == 2:
+            x, y = col[2 * grob], col[2 * grob + 1]
+            return default if x != x else (x, y)
+        value = col[grob]
+        if _dense_missing(value, code):
+            return default
+        return bool(value) if code == 'b' else value
+
+    def column(self, name):
+        """
+        Zero-copy flat memoryview over the property's dense column (promotes
+        it); pairs are interleaved with stride 2 (grob i at [2*i], [2*i + 1]).
+        """
+        pid = self.registry.intern(name)
+        kind = self.registry.kinds[pid]
+        if kind is None:
+            raise TypeError(f'grob property {name!r} ({self.registry.types[pid]}) has no dense column')
+        col = self.dense.get(pid)
+        if col is None:
+            col = self._promote(pid)
+        return memoryview(col)[:self.size * kind[1]]
+
+    def grob(self, grob):
+        return GrobView(self, grob)
+
+    def _set_ids(self, grob):
+        for pid, col in self.dense.items():
+            code, stride = self.registry.kinds[pid]
+            if not _dense_missing(col[stride * grob], code):
+                yield pid
+        for pid, bucket in self.sparse.items():
+            if grob in bucket:
+                yield pid
+
+    def nbytes(self):
+        """Approximate payload bytes (columns + sparse entries, excluding values)."""
+        dense = sum(col.itemsize * len(col) for col in self.dense.values())
+        sparse = sum(len(b) for b in self.sparse.values()) * 16
+        return dense + sparse + self.types.itemsize * len(self.types)
@@ -0,0 +1,182 @@
+"""
+Worklist fixed-point solver for collision priority lattices.
+
+Grobs form a chain along the stacking axis (outward from the staff), with
+`gaps[i]` the current clearance between grob i and grob i+1. An edge (i, i+1)
+is in conflict when its gap is below what its resolver requires; the
+resolver decides who yields and by how much, and the yielding grob moves away
+from its partner (outer grobs outwards, inner grobs inwards) by the minimal
+delta. That move only changes the mover's other edge, so only that edge is
+re-queued — nothing else is re-examined.
+
+Priorities are precompiled into an integer rank table (`rank_table`), and the
+worklist pops conflicts whose weaker grob has the lowest rank first ("move
+lower-priority objects first"). Forced grobs never move, and a grob never
+reverses direction — a weak grob wedged between stronger neighbours would
+otherwise be pushed back and forth — so when the resolver's choice would
+have to reverse, its partner takes the shift instead. Conflicts neither side
+can take, and anything left after `max_steps` (default MAX_STEPS_PER_EDGE
+per edge, a hard bound), are settled by a monotone sweep: outward edge by
+edge, and where the outer grob is forced, the inner one moves inward and the
+shift is carried down the chain until an edge is satisfied again, which
+reaches a fixed point in one pass. `Solution.converged` says whether the
+sweep was needed; `Solution.unresolved` lists edges it could not settle
+because forced grobs on both sides leave no room.
+
+Pairwise policies plug in with `edge_resolver(type_a, type_b)`; pairs without
+one use `rank_resolver` (DEFAULT_MIN_GAP_SP, lower rank yields).
+"""
+from array import array
+import heapq
+
+DEFAULT_PRIORITY = ('stem', 'notehead', 'accidental', 'dynamic', 'lyric')  # x-rule parameters.priority, strongest first
+DEFAULT_MIN_GAP_SP = 0.2
+MAX_STEPS_PER_EDGE = 8
+EPSILON = 1e-9
+
+_EDGES = {}
+
+def rank_table(priority=DEFAULT_PRIORITY):
+    """'stem > notehead > ...' or a sequence, strongest first -> {type: rank}; unknown types rank 0."""
+    if isinstance(priority, str):
+        priority = [p.strip() for p in priority.split('>')]
+    n = len(priority)
+    return {t: n - i for i, t in enumerate(priority)}
+
+def edge_resolver(type_a, type_b):
+    """Register fn(inner_type, outer_type, gap, ranks) -> (inner_move, outer_move) for a type pair."""
+    def register(fn):
+        _EDGES[frozenset((type_a, type_b))] = fn
+        return fn
+    return register
+
+def yield_policy(min_gap, stronger=None):
+    """Resolver: the weaker grob (given, or by rank; ties: outer) moves away by the shortfall."""
+    def resolve(inner, outer, gap, ranks):
+        need = min_gap - gap
+        if need <= EPSILON:
+            return None
+        if stronger is not None:
+            inner_yields = stronger == outer and inner != outer
+        else:
+            inner_yields = ranks.get(inner, 0) < ranks.get(outer, 0)
+        return (need, 0.0) if inner_yields else (0.0, need)
+    return resolve
+
+rank_resolver = yield_policy(DEFAULT_MIN_GAP_SP)
+
+def resolver_for(type_a, type_b):
+    return _EDGES.get(frozenset((type_a, type_b)), rank_resolver)
+
+class Solution:
+    def __init__(self, offsets, steps, converged, unresolved=()):
+        self.offsets = offsets      # array('d'): displacement along the stacking axis
+        self.steps = steps
+        self.converged = converged
+        self.unresolved = list(unresolved)  # edges still in conflict (forced grobs on both sides)
+
+def solve(types, gaps, ranks=None, forced=(), max_steps=None, resolvers=None):
+    """`resolvers` ({frozenset((type_a, type_b)): resolver}) overrides registered edge resolvers."""
+    n = len(types)
+    if len(gaps) < n - 1:
+        raise ValueError(f'{n} grobs need {n - 1} gaps, got {len(gaps)}')
+    ranks = ranks or rank_table()
+    rank = array('q', (ranks.get(t, 0) for t in types))
+    pinned = set(forced)
+    overrides = resolvers or {}
+    resolvers = [overrides.get(frozenset(types[i:i + 2])) or resolver_for(types[i], types[i + 1])
+                 for i in range(n - 1)]
+    offsets = array('d', bytes(8 * n))
+    if max_steps is None:
+        max_steps = MAX_STEPS_PER_EDGE * max(n - 1, 1)
+
+    heading = array('b', bytes(n))  # direction each grob has moved so far
+
+    def can_move(g, direction):
+        return g not in pinned and heading[g] != -direction
+
+    def conflict(i):
+        """(inner move, outer move) resolving edge i, or None when satisfied."""
+        gap = gaps[i] + offsets[i + 1] - offsets[i]
+        return resolvers[i](types[i], types[i + 1], gap, ranks)
+
+    def assign(i, move):
+        # The resolver's choice, unless that grob is forced or would have to
+        # reverse direction; then the partner takes the whole shift.
+        d_in, d_out = move
+        need = d_in + d_out
+        if d_in and not can_move(i, -1):
+            d_in, d_out = 0.0, need
+        elif d_out and not can_move(i + 1, 1):
+            d_in, d_out = need, 0.0
+        if (d_in and not can_move(i, -1)) or (d_out and not can_move(i + 1, 1)):
+            return None
+        return d_in, d_out
+
+    def push(heap, i):
+        if 0 <= i < n - 1 and conflict(i) is not None:
+            heapq.heappush(heap, (min(rank[i], rank[i + 1]), i))
+
+    heap = []
+    for i in range(n - 1):
+        push(heap, i)
+    steps = 0
+    deferred = False
+    while heap and steps < max_steps:
+        _, i = heapq.heappop(heap)
+        move = conflict(i)
+        if move is None:
+            continue
+        move = assign(i, move)
+        if move is None:
+            deferred = True
+            continue
+        steps += 1
+        d_in, d_out = move
+        if d_in:
+            offsets[i] -= d_in
+            heading[i] = -1
+            push(heap, i - 1)
+        if d_out:
+            offsets[i + 1] += d_out
+            heading[i + 1] = 1
+            push(heap, i + 1)
+    converged = not heap and not deferred
+    unresolved = [] if converged else _settle(conflict, offsets, pinned, n)
+    return Solution(offsets, steps, converged, unresolved)
+
+def _settle(conflict, offsets, pinned, n):
+    """Monotone sweep over the chain; returns the edges forced grobs keep in conflict."""
+    unresolved = []
+    for i in range(n - 1):
+        move = conflict(i)
+        if move is None:
+            continue
+        if i + 1 not in pinned:
+            offsets[i + 1] += sum(move)
+            continue
+        # Outer grob forced: move inward, re-checking each edge below until one holds.
+        j = i
+        while j >= 0:
+            move = conflict(j)
+            if move is None:
+                break
+            if j in pinned:
+                unresolved.append(j)
+                break
+            offsets[j] -= sum(move)
+            j -= 1
+    return unresolved
+
+def resolve_pair(type_a, box_a, type_b, box_b, ranks=None, resolver=None):
+    """
+    Two vertical intervals {y, h} (BBoxes) under the pair's resolver (or
+    `resolver`). Returns (move_a, move_b): how far each grob moves away from
+    the other (>= 0; the upper one moves up, the lower one down).
+    """
+    ranks = ranks or rank_table()
+    a_above = box_a['y'] + box_a['h'] / 2.0 >= box_b['y'] + box_b['h'] / 2.0
+    (ti, bi), (to, bo) = ((type_b, box_b), (type_a, box_a)) if a_above else ((type_a, box_a), (type_b, box_b))
+    gap = bo['y'] - (bi['y'] + bi['h'])
+    d_inner, d_outer = (resolver or resolver_for(ti, to))(ti, to, gap, ranks) or (0.0, 0.0)
+    return (d_outer, d_inner) if a_above else (d_inner, d_outer)
@@ -0,0 +1,129 @@
+"""
+Lyrics layout for all verses of a system at once.
+
+Lyric text is not placed yet, so its boxes are in text coordinates: x is
+where the syllable sits on the line (shared with hyphens, extenders and
+stanza numbers), y is relative to the syllable's own baseline (y < 0 is a
+descender). A verse is one line of syllables under the staff, verse 0
+nearest to it.
+
+`layout` takes the verses of a system as arrays of syllable boxes and works
+in one pass over them:
+
+* baselines — each verse's ascent and descent are the maxima over its
+  syllables, so verse 0's baseline sits MIN_DISTANCE_SP + ascent below the
+  staff and every later verse clears the descenders of the one above it by
+  VERSE_GAP_SP. A verse carrying melisma or extender lines is lowered by
+  their baseline bias. Depths are measured downward from the staff baseline.
+* spacing — syllables of a verse are swept left to right and pushed right
+  until every gap fits what it holds: a hyphen with HYPHEN_MIN_GAP_SP on
+  both sides, an extender of at least MIN_LINE_LENGTH_SP, or a word space.
+  Hyphens and extenders belong to the gap their centre falls in.
+* stanza numbers — a verse's number goes on its baseline, moved left to
+  clear the verse's first (spaced) syllable by the stanza gap.
+
+Cost is O(n log n) in the syllables of a system (one sort per verse), so a
+page of verses is one short loop rather than a call per syllable.
+"""
+from bisect import bisect_left
+from collections import namedtuple
+
+MIN_DISTANCE_SP = 0.7            # x-rule Lyrics.vertical_alignment_with_baselines min_distance_sp
+VERSE_GAP_SP = 0.4               # between one verse's descenders and the next verse's ascenders
+MAX_VARIANCE_SP = 0.2            # x-rule Lyrics.baseline_adjustment_with_variance max_variance_sp
+HYPHEN_MIN_GAP_SP = 0.3          # x-rule Lyrics.hyphen_melisma_spacing_interaction hyphen_min_gap_sp
+MELISMA_BASELINE_BIAS_SP = 0.1   # x-rule Lyrics.hyphen_melisma_spacing_interaction melisma_baseline_bias_sp
+MIN_LINE_LENGTH_SP = 1.0         # x-rule Lyrics.extender_spacing_policy min_line_length_sp
+EXTENDER_BASELINE_BIAS_SP = 0.1  # x-rule Lyrics.extender_spacing_policy baseline_bias_sp
+EXTENDER_GAP_SP = 0.2            # between a syllable and the extender line on either side
+WORD_GAP_SP = 0.5
+STANZA_MIN_GAP_SP = 0.2          # x-rule StanzaNumber.align_with_lyrics_policy min_gap_sp
+
+# Nominal extent of a lyric line with no syllables (also used by collision rules).
+LYRIC_ASCENT_SP = 1.2
+LYRIC_DESCENT_SP = 0.4
+
+Verse = namedtuple('Verse', 'syllables hyphens extenders melismas', defaults=((), (), ()))
+Verse.__doc__ = 'Boxes ({x, y, w, h}) of one verse line: syllables, hyphens, extender and melisma lines.'
+
+def extent(boxes):
+    """(ascent, descent) of a verse line; nominal when it has no syllables."""
+    if not boxes:
+        return LYRIC_ASCENT_SP, LYRIC_DESCENT_SP
+    return max(b['y'] + b['h'] for b in boxes), max(max(-b['y'] for b in boxes), 0.0)
+
+def line_length(box):
+    return max(box['w'], MIN_LINE_LENGTH_SP)
+
+def space(syllables, hyphens=(), extenders=()):
+    """Rightward shift per syllable (input order) so every gap fits its hyphen, extender or word space."""
+    order = sorted(range(len(syllables)), key=lambda i: syllables[i]['x'])
+    centres = [syllables[i]['x'] + syllables[i]['w'] / 2 for i in order]
+    need = [WORD_GAP_SP] * max(len(order) - 1, 0)
+    for boxes, size in ((hyphens, lambda b: b['w'] + 2 * HYPHEN_MIN_GAP_SP),
+                        (extenders, lambda b: line_length(b) + 2 * EXTENDER_GAP_SP)):
+        for b in boxes:
+            k = bisect_left(centres, b['x'] + b['w'] / 2) - 1
+            if 0 <= k < len(need):
+                need[k] = max(need[k], size(b))
+    shifts = [0.0] * len(syllables)
+    prev = None
+    for k, i in enumerate(order):
+        s = syllables[i]
+        if prev is not None:
+            right = prev['x'] + prev['w'] + shifts[order[k - 1]]
+            shifts[i] = max(0.0, right + need[k - 1] - s['x'])
+        prev = s
+    return shifts
+
+class Layout:
+    def __init__(self, staff_baseline, depths, extents, offsets, first_x):
+        self.staff_baseline = staff_baseline
+        self.depths = depths      # per verse: baseline depth below the staff baseline
+        self.extents = extents    # per verse: (ascent, descent)
+        self.offsets = offsets    # per verse: rightward shift per syllable
+        self.first_x = first_x    # per verse: left edge of its first spaced syllable (None if empty)
+
+    def baseline(self, verse):
+        """Absolute y of a verse's baseline."""
+        return self.staff_baseline - self.depths[verse]
+
+    def depth(self, verse, box=None, variance=0.0):
+        """
+        Baseline depth of a verse; with a box and a variance the baseline may
+        rise toward the staff (by at most min(variance, MAX_VARIANCE_SP)) as
+        far as that syllable's own ascent allows.
+        """
+        stable = self.depths[verse]
+        if box is None or variance <= 0:
+            return stable
+        own = stable - self.extents[verse][0] + box['y'] + box['h']
+        return max(own, stable - min(variance, MAX_VARIANCE_SP))
+
+    def stanza(self, verse, box, min_gap=STANZA_MIN_GAP_SP):
+        """(leftward x offset, baseline y) of a stanza number for this verse."""
+        first = self.first_x[verse]
+        x_offset = 0.0 if first is None else max(0.0, box['x'] + box['w'] + min_gap - first)
+        return x_offset, self.baseline(verse)
+
+def layout(verses, staff_baseline):
+    """verses: [Verse] nearest the staff first -> Layout."""
+    depths, extents, offsets, first_x = [], [], [], []
+    depth = None
+    for v in verses:
+        ascent, descent = extent(v.syllables)
+        bias = 0.0
+        if v.extenders:
+            bias = EXTENDER_BASELINE_BIAS_SP
+        if v.melismas:
+            bias = max(bias, MELISMA_BASELINE_BIAS_SP)
+        if depth is None:
+            depth = MIN_DISTANCE_SP + ascent + bias
+        else:
+            depth += extents[-1][1] + VERSE_GAP_SP + ascent + bias
+        depths.append(depth)
+        extents.append((ascent, descent))
+        shifts = space(v.syllables, v.hyphens, list(v.extenders) + list(v.melismas))
+        offsets.append(shifts)
+        first_x.append(min((s['x'] + d for s, d in zip(v.syllables, shifts)), default=None))
+    return Layout(staff_baseline, depths, extents, offsets, first_x)
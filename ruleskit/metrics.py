@@ -0,0 +1,161 @@
+"""
+Service metrics in Prometheus text format (GET /metrics).
+
+Per operationId, labelled with agent and rule status (ratified/provisional):
+request counts by HTTP code, error counts, request latency and rule execution
+latency histograms, batch-size histogram, single-flight outcomes
+(computed/coalesced) and their hit ratio. Plus the number of requests being
+handled right now (in-handler concurrency; requests waiting in the listen
+backlog are not visible here).
+
+Each process keeps its own registry, so under `ruleskit.prefork` a scrape
+reaches one worker and sees only that worker's traffic. Every series is
+therefore labelled `worker="<pid>"`; aggregate across workers in the query
+(e.g. `sum without (worker) (...)`). A replaced worker starts new series
+under its new pid.
+
+Counters are sharded: each thread is dealt one of SHARDS buckets round-robin
+on first use (thread idents are aligned addresses, useless modulo SHARDS),
+each guarded by its own lock, and shards are summed only at scrape
+time, so request threads rarely contend. `Metrics` also implements the tracer
+protocol (`sampled`/`record`) so the runtime reports rule latency and batch
+size through the same hook as `ruleskit.tracing`.
+"""
+import itertools
+import os
+import threading
+from bisect import bisect_left
+
+SHARDS = 16
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+class _Shard:
+    __slots__ = ('lock', 'counters', 'hists', 'active')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.hists = {}
+        self.active = 0
+
+    def inc(self, key, n=1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def observe(self, key, buckets, value):
+        h = self.hists.get(key)
+        if h is None:
+            h = self.hists[key] = [0] * (len(buckets) + 1) + [0.0]
+        h[bisect_left(buckets, value)] += 1
+        h[-1] += value
+
+class Metrics:
+    def __init__(self, worker=None):
+        self.worker = os.getpid() if worker is None else worker
+        self._shards = [_Shard() for _ in range(SHARDS)]
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+        self.ops = {}
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = self._shards[next(self._next_shard) % SHARDS]
+            return shard
+
+    # Tracer protocol: rule-level spans from the runtime.
+    def sampled(self):
+        return True
+
+    def record(self, op, start_ns, end_ns, batch=1, cache=None, cat=None):
+        self.ops[op.operation_id] = op
+        s = self._shard()
+        with s.lock:
+            s.observe(('rule_seconds', op.operation_id), LATENCY_BUCKETS, (end_ns - start_ns) / 1e9)
+            s.observe(('batch_size', op.operation_id), BATCH_BUCKETS, batch)
+
+    def request(self, op, code, seconds, cache=None):
+        self.ops[op.operation_id] = op
+        rid = op.operation_id
+        s = self._shard()
+        with s.lock:
+            s.inc(('requests', rid, code))
+            if code >= 400:
+                s.inc(('errors', rid))
+            if cache is not None:
+                s.inc(('cache', rid, cache))
+            s.observe(('request_seconds', rid), LATENCY_BUCKETS, seconds)
+
+    def enter(self):
+        s = self._shard()
+        with s.lock:
+            s.active += 1
+
+    def leave(self):
+        s = self._shard()
+        with s.lock:
+            s.active -= 1
+
+    def _merged(self):
+        counters, hists, active = {}, {}, 0
+        for s in self._shards:
+            with s.lock:
+                for k, v in s.counters.items():
+                    counters[k] = counters.get(k, 0) + v
+                for k, h in s.hists.items():
+                    acc = hists.get(k)
+                    hists[k] = list(h) if acc is None else [a + b for a, b in zip(acc, h)]
+                active += s.active
+        return counters, hists, active
+
+    def _labels(self, rid=None, **extra):
+        pairs = [('worker', self.worker)]
+        if rid is not None:
+            op = self.ops[rid]
+            pairs += [('operation', rid), ('agent', op.agent or ''), ('status', op.status or '')]
+        pairs += list(extra.items())
+        return ','.join('%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in pairs)
+
+    def _histogram(self, out, name, kind, buckets, hists):
+        out.append(f'# TYPE {name} histogram')
+        for (k, rid), h in sorted(hists.items()):
+            if k != kind:
+                continue
+            cum = 0
+            for le, n in zip(buckets, h):
+                cum += n
+                out.append(f'{name}_bucket{{{self._labels(rid, le=le)}}} {cum}')
+            cum += h[len(buckets)]
+            out.append(f'{name}_bucket{{{self._labels(rid, le="+Inf")}}} {cum}')
+            out.append(f'{name}_sum{{{self._labels(rid)}}} {h[-1]}')
+            out.append(f'{name}_count{{{self._labels(rid)}}} {cum}')
+
+    def render(self, inflight_computations=0):
+        counters, hists, active = self._merged()
+        out = ['# TYPE ruleskit_requests_total counter']
+        for key, n in sorted(counters.items(), key=str):
+            if key[0] == 'requests':
+                out.append(f'ruleskit_requests_total{{{self._labels(key[1], code=key[2])}}} {n}')
+        out.append('# TYPE ruleskit_errors_total counter')
+        for key, n in sorted(counters.items(), key=str):
+            if key[0] == 'errors':
+                out.append(f'ruleskit_errors_total{{{self._labels(key[1])}}} {n}')
+        out.append('# TYPE ruleskit_singleflight_total counter')
+        ratios = {}
+        for key, n in sorted(counters.items(), key=str):
+            if key[0] == 'cache':
+                out.append(f'ruleskit_singleflight_total{{{self._labels(key[1], outcome=key[2])}}} {n}')
+                hit, total = ratios.get(key[1], (0, 0))
+                ratios[key[1]] = (hit + (n if key[2] == 'coalesced' else 0), total + n)
+        out.append('# TYPE ruleskit_cache_hit_ratio gauge')
+        for rid, (hit, total) in sorted(ratios.items()):
+            out.append(f'ruleskit_cache_hit_ratio{{{self._labels(rid)}}} {hit / total if total else 0.0}')
+        self._histogram(out, 'ruleskit_request_duration_seconds', 'request_seconds', LATENCY_BUCKETS, hists)
+        self._histogram(out, 'ruleskit_rule_duration_seconds', 'rule_seconds', LATENCY_BUCKETS, hists)
+        self._histogram(out, 'ruleskit_batch_size', 'batch_size', BATCH_BUCKETS, hists)
+        out.append('# TYPE ruleskit_requests_in_progress gauge')
+        out.append(f'ruleskit_requests_in_progress{{{self._labels()}}} {active}')
+        out.append('# TYPE ruleskit_inflight_computations gauge')
+        out.append(f'ruleskit_inflight_computations{{{self._labels()}}} {inflight_computations}')
+        return '\n'.join(out) + '\n'
@@ -0,0 +1,126 @@
+"""
+Layered, copy-on-write override maps for context inheritance
+(score -> staffGroup -> staff -> voice -> grob).
+
+Each `Layer` stores its own deltas and a reference to its parent; a delta
+value of None is a revert: the property is removed at that level and below
+(unless re-set). The effective map of a layer — its parent's map with its
+own deltas applied — is built on first use and cached on the layer, so
+`get` and `flattened` are O(1) after that and siblings build on the same
+cached parent map. `set` / `revert` drop the cache of that layer and of the
+layers below it (whose maps were built on it); nothing above or beside it is
+touched, and dropped maps are rebuilt lazily on their next use.
+
+With inherit=False (the rule's allow_inherit parameter turned off) a layer
+sees only its own deltas.
+"""
+
+LEVELS = ('score', 'staffGroup', 'staff', 'voice', 'grob')
+
+class Layer:
+    __slots__ = ('name', 'parent', 'delta', 'children', '_flat')
+
+    def __init__(self, name=None, parent=None, delta=None):
+        self.name = name
+        self.parent = parent
+        self.delta = dict(delta or {})
+        self.children = []
+        self._flat = None
+        if parent is not None:
+            parent.children.append(self)
+
+    def child(self, name=None, delta=None):
+        return Layer(name, self, delta)
+
+    def set(self, prop, value):
+        self.delta[prop] = value
+        self._invalidate()
+
+    def revert(self, prop):
+        self.set(prop, None)
+
+    def _invalidate(self):
+        stack = [self]
+        while stack:
+            layer = stack.pop()
+            if layer._flat is not None:
+                layer._flat = None
+                stack.extend(layer.children)
+
+    def flattened(self, inherit=True):
+        """Effective properties at this layer (cached; do not mutate)."""
+        if not inherit:
+            own = {}
+            _apply(own, self.delta)
+            return own
+        if self._flat is None:
+            flat = dict(self.parent.flattened()) if self.parent is not None else {}
+            _apply(flat, self.delta)
+            self._flat = flat
+        return self._flat
+
+    def get(self, prop, default=None, inherit=True):
+        if not inherit:
+            value = self.delta.get(prop)
+            return default if value is None else value
+        return self.flattened().get(prop, default)
+
+    def resolve(self, delta, inherit=True):
+        """
+        Effective properties of a leaf below this layer (e.g. a grob) with these
+        deltas, without a layer for it; with inherit=False, just its own deltas.
+        """
+        out = dict(self.flattened()) if inherit else {}
+        _apply(out, delta or {})
+        return out
+
+def _apply(flat, delta):
+    for prop, value in delta.items():
+        if value is None:
+            flat.pop(prop, None)
+        else:
+            flat[prop] = value
+
+class ContextTree:
+    """Named layers built from {id, parent?, properties} records in any order."""
+
+    def __init__(self, contexts=()):
+        self.root = Layer('score')
+        self.layers = {}
+        specs = {}
+        for c in contexts:
+            cid = c.get('id')
+            if cid is None:
+                raise ValueError('context without id')
+            if cid in specs:
+                raise ValueError(f'duplicate context {cid!r}')
+            specs[cid] = c
+        for cid in specs:
+            self._build(cid, specs, ())
+
+    def _build(self, cid, specs, chain):
+        layer = self.layers.get(cid)
+        if layer is not None:
+            return layer
+        if cid in chain:
+            raise ValueError(f'override context cycle: {" -> ".join(chain + (cid,))}')
+        spec = specs.get(cid)
+        if spec is None:
+            raise ValueError(f'unknown parent context {cid!r}')
+        parent_id = spec.get('parent')
+        parent = self.root if parent_id is None else self._build(parent_id, specs, chain + (cid,))
+        layer = self.layers[cid] = parent.child(cid, spec.get('properties'))
+        return layer
+
+    def __getitem__(self, cid):
+        return self.layers[cid]
+
+    def get(self, cid):
+        return self.layers.get(cid) if cid is not None else self.root
+
+def chain(levels):
+    """Layer for a single score->...->grob chain given {level: deltas}."""
+    layer = None
+    for level in LEVELS:
+        layer = Layer(level, layer, levels.get(level))
+    return layer
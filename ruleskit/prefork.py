@@ -0,0 +1,173 @@
+"""
+Pre-forked rule service: one parent loads every piece of shared, read-only
+state — spec index, all rule families, SMuFL glyph tables and the fixture
+contexts for the configured (font, staffSize, paper) triples — freezes it
+(`gc.freeze`, so the collector never touches those pages again) and then
+forks N workers that accept on the parent's listening socket. Workers share
+the warm state copy-on-write instead of each re-importing and re-loading it.
+
+The parent supervises the pool:
+- a worker that dies is replaced (with a short back-off when it crash-loops);
+- SIGHUP performs a rolling restart: each worker is replaced by a fresh fork
+  and only then asked to stop;
+- SIGTERM / SIGINT stop every worker and exit.
+Workers stop gracefully on SIGTERM: they stop accepting, close idle
+keep-alive connections, finish in-flight requests (answering with
+Connection: close) and exit, or are cut off after DRAIN_TIMEOUT. /stats and
+/metrics are per worker (metric series carry a worker=<pid> label).
+
+Usage: python -m ruleskit.prefork [--host 127.0.0.1] [--port 8080]
+                                  [--workers N] [--warm FONT:SIZE:PAPER ...]
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+from .runtime import Runtime
+from .fixtures import fixture_context, DEFAULT_FIXTURES
+from .service import RuleServer
+from . import rules
+
+RESPAWN_BACKOFF = 1.0  # seconds before replacing a worker that died young
+DRAIN_TIMEOUT = 30.0   # seconds a stopping worker waits for in-flight requests
+POLL_INTERVAL = 0.1
+
+def parse_warm(spec):
+    """'Bravura:20pt:A4' -> fixture dict (missing parts take the defaults)."""
+    keys = ('font', 'staffSize', 'paper')
+    return {k: v for k, v in zip(keys, spec.split(':')) if v}
+
+def warm(fixtures=()):
+    """Load and freeze shared state in the parent; returns the Runtime."""
+    runtime = Runtime()
+    rules.load_all()
+    for f in fixtures or (DEFAULT_FIXTURES,):
+        fixture_context(**f)
+    gc.collect()
+    gc.freeze()
+    return runtime
+
+def listen(host, port, backlog=128):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+def _worker(sock, runtime):
+    # Runs in the forked child; never returns.
+    for sig in (signal.SIGHUP, signal.SIGINT):
+        signal.signal(sig, signal.SIG_IGN)
+    server = RuleServer(sock.getsockname(), runtime=runtime, sock=sock)
+    # Join request threads on close so a stop drains in-flight requests; idle
+    # keep-alive connections are closed by drain(), and DRAIN_TIMEOUT bounds
+    # the wait for the rest.
+    server.daemon_threads = False
+
+    def stop(*_):
+        deadline = threading.Timer(DRAIN_TIMEOUT, os._exit, (1,))
+        deadline.daemon = True
+        deadline.start()
+        threading.Thread(target=server.drain).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    code = 0
+    try:
+        server.serve_forever()
+    except BaseException:
+        code = 1
+    finally:
+        server.server_close()
+        os._exit(code)
+
+class Supervisor:
+    def __init__(self, sock, runtime, workers):
+        self.sock = sock
+        self.runtime = runtime
+        self.size = workers
+        self.workers = {}  # pid -> start time (monotonic)
+        self.stopping = False
+        self.restarts = 0
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            _worker(self.sock, self.runtime)
+        self.workers[pid] = time.monotonic()
+        return pid
+
+    def _stop(self, pid):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def rolling_restart(self):
+        for pid in list(self.workers):
+            self.spawn()
+            self._stop(pid)
+        self.restarts += 1
+
+    def _reap(self, pid, status):
+        started = self.workers.pop(pid, None)
+        if started is None or self.stopping:
+            return
+        if os.waitstatus_to_exitcode(status) != 0 and time.monotonic() - started < RESPAWN_BACKOFF:
+            time.sleep(RESPAWN_BACKOFF)
+        if len(self.workers) < self.size:
+            self.spawn()
+
+    def run(self):
+        pending = []
+        signal.signal(signal.SIGHUP, lambda *_: pending.append('restart'))
+        signal.signal(signal.SIGTERM, lambda *_: pending.append('stop'))
+        signal.signal(signal.SIGINT, lambda *_: pending.append('stop'))
+        for _ in range(self.size):
+            self.spawn()
+        while self.workers:
+            while pending:
+                action = pending.pop(0)
+                if action == 'restart' and not self.stopping:
+                    self.rolling_restart()
+                elif action == 'stop' and not self.stopping:
+                    self.stopping = True
+                    for pid in list(self.workers):
+                        self._stop(pid)
+            # Poll: a blocking waitpid would be resumed after signal handlers.
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(POLL_INTERVAL)
+                continue
+            self._reap(pid, status)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8080)
+    ap.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    ap.add_argument('--warm', action='append', default=[], metavar='FONT:SIZE:PAPER',
+                    help='fixture triple to precompute in the parent (repeatable; default Bravura:20pt:A4)')
+    args = ap.parse_args(argv)
+    t0 = time.perf_counter()
+    runtime = warm([parse_warm(w) for w in args.warm])
+    sock = listen(args.host, args.port)
+    print(f'Warmed {len(runtime.implemented())}/{len(runtime.operations)} rules in '
+          f'{(time.perf_counter() - t0) * 1e3:.1f} ms; forking {args.workers} workers on http://{args.host}:{args.port}')
+    sys.stdout.flush()
+    sup = Supervisor(sock, runtime, args.workers)
+    try:
+        sup.run()
+    finally:
+        sock.close()
+    print(f'Stopped (rolling restarts: {sup.restarts})')
+
+if __name__ == '__main__':
+    main()
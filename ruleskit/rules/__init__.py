@@ -0,0 +1,53 @@
+"""
+Rule implementations, one module per rule family. Importing a family module
+registers its functions with `ruleskit.runtime.rule`.
+
+Families are imported lazily: `FAMILIES` maps the family segment of an
+operationId (RULE.<Family>.<name>) to its module, and the runtime calls
+`load_family` the first time an operation of that family is applied.
+"""
+from importlib import import_module
+
+FAMILIES = {
+    'Accidental': 'accidentals',
+    'BarNumber': 'outside_staff',
+    'Beaming': 'beaming',
+    'Collision': 'collision',
+    'DurationLine': 'spanners',
+    'Fingering': 'outside_staff',
+    'Glissando': 'spanners',
+    'InstrumentSwitch': 'outside_staff',
+    'Lyrics': 'lyrics',
+    'MetronomeMark': 'outside_staff',
+    'NoteSpacing': 'spacing',
+    'OpticalSize': 'optical_size',
+    'Ornaments': 'outside_staff',
+    'Ottava': 'spanners',
+    'OutputProperty': 'output_property',
+    'Pedal': 'spanners',
+    'RehearsalMarks': 'outside_staff',
+    'RepeatVolta': 'spanners',
+    'Slur': 'curves',
+    'Spacing': 'spacing',
+    'StanzaNumber': 'lyrics',
+    'Tab': 'tab',
+    'TabStaffSymbol': 'tab',
+    'TempoMarks': 'outside_staff',
+    'Text': 'outside_staff',
+    'TextSpanner': 'spanners',
+    'Tie': 'curves',
+    'TrillSpanner': 'spanners',
+    'Vertical': 'vertical',
+}
+
+def load_family(operation_id):
+    parts = operation_id.split('.')
+    module = FAMILIES.get(parts[1]) if len(parts) > 2 else None
+    if module is None:
+        return False
+    import_module(f'{__name__}.{module}')
+    return True
+
+def load_all():
+    for module in sorted(set(FAMILIES.values())):
+        import_module(f'{__name__}.{module}')
@@ -0,0 +1,47 @@
+"""
+Accidental rules on `ruleskit.accidentals`.
+
+RULE.Accidental.leading_padding_and_column_inflation moves the column's left
+edge out by the accidental's width plus `paddingSP` and reports the inflated
+`columnMinWidthSP` (plus `columnLeftSP`). With optional `chordAccidentals`
+([{position, glyph}], position in staff steps) the chord's accidentals are
+stacked into columns instead, CLUSTER_STACK_GAP_SP apart (`stackGapSP`
+overrides), and `accidentalColumns` / `accidentalXOffsetsSP` give each
+accidental's column and left edge relative to the noteheads. The batch form
+stacks every chord of the batch against the same shape table.
+
+RULE.Accidental.key_signature_positions_by_clef reads the precomputed
+(clef, fifths) table.
+"""
+from ..runtime import rule, batch_rule
+from ..accidentals import key_signature_positions, stack
+
+CLUSTER_STACK_GAP_SP = 0.2   # x-rule parameters.cluster_stack_gap
+
+def _lead_in(payload):
+    pad = payload['paddingSP']
+    chord = payload.get('chordAccidentals')
+    out = {}
+    if chord:
+        gap = payload.get('stackGapSP', CLUSTER_STACK_GAP_SP)
+        s = stack([(a['position'], a['glyph']) for a in chord], pad, gap)
+        lead = s.total
+        out['accidentalColumns'] = s.columns
+        out['accidentalXOffsetsSP'] = s.offsets
+    else:
+        lead = payload['accidentalBBox']['w'] + pad
+    out['columnMinWidthSP'] = payload['noteheadWidthSP'] + lead
+    out['columnLeftSP'] = payload['columnLeft'] - lead
+    return out
+
+@batch_rule('RULE.Accidental.leading_padding_and_column_inflation')
+def leading_padding_batch(payloads, ctx):
+    return [_lead_in(p) for p in payloads]
+
+@rule('RULE.Accidental.leading_padding_and_column_inflation')
+def leading_padding_and_column_inflation(payload, ctx):
+    return _lead_in(payload)
+
+@rule('RULE.Accidental.key_signature_positions_by_clef')
+def key_signature_positions_by_clef(payload, ctx):
+    return {'positions': [float(p) for p in key_signature_positions(payload['clef'], int(payload['fifths']))]}
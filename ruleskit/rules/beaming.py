@@ -0,0 +1,67 @@
+"""
+Beam geometry and its refinements, on the batched solver in `ruleskit.beams`.
+
+- RULE.Beaming.geometry_slope_and_segments — least-squares slope through the
+  stem tips, clamped and quantized, plus the primary beam segment.
+- RULE.Beaming.slope_with_clearance — re-scores slopes around the solved one
+  against `nearbyGrobs` boxes (same x/y frame as the segments).
+- RULE.Beaming.cross_voice_mixed_stem_slope_balance — pooled slope across the
+  voices' beams; each voice moves towards it by BALANCE_WEIGHT.
+
+The batch forms pack every payload into one `BeamBatch`, solve it once and
+refine the solved arrays in place.
+"""
+from ..runtime import rule, batch_rule
+from ..beams import BeamBatch, solve, refine_clearance, balance_voices
+
+MIN_CLEARANCE_SP = 0.25      # x-rule parameters.min_clearance_sp
+SLOPE_PENALTY_WEIGHT = 0.5   # x-rule parameters.slope_penalty_weight
+BALANCE_WEIGHT = 0.6         # x-rule parameters.balance_weight
+
+@batch_rule('RULE.Beaming.geometry_slope_and_segments')
+def geometry_batch(payloads, ctx):
+    batch = BeamBatch()
+    for p in payloads:
+        batch.add(p['notePositionsSP'], p['stemDirections'], p['beamThicknessSP'])
+    sol = solve(batch)
+    return [{'slopeSPPerSpace': sol.slope[g], 'segments': sol.segments(g)} for g in range(len(payloads))]
+
+@rule('RULE.Beaming.geometry_slope_and_segments')
+def geometry_slope_and_segments(payload, ctx):
+    return geometry_batch([payload], ctx)[0]
+
+@batch_rule('RULE.Beaming.slope_with_clearance')
+def slope_with_clearance_batch(payloads, ctx):
+    batch = BeamBatch()
+    for p in payloads:
+        batch.add(p['notePositionsSP'], p['stemDirections'], p['beamThicknessSP'])
+    sol = solve(batch)
+    out = []
+    for g, p in enumerate(payloads):
+        slope, _, gap = refine_clearance(sol, g, p.get('nearbyGrobs') or (), MIN_CLEARANCE_SP, SLOPE_PENALTY_WEIGHT)
+        out.append({'slopeSPPerSpaceAdjusted': slope, 'minClearanceSP': gap, 'segments': sol.segments(g)})
+    return out
+
+@rule('RULE.Beaming.slope_with_clearance')
+def slope_with_clearance(payload, ctx):
+    return slope_with_clearance_batch([payload], ctx)[0]
+
+@batch_rule('RULE.Beaming.cross_voice_mixed_stem_slope_balance')
+def cross_voice_batch(payloads, ctx):
+    batch = BeamBatch()
+    groups = []
+    for p in payloads:
+        positions, directions = p['voiceNotePositionsSP'], p['voiceStemDirections']
+        if len(positions) != len(directions):
+            raise ValueError(f'{len(positions)} voices of positions but {len(directions)} of stem directions')
+        groups.append([batch.add(pos, dirs, p['beamThicknessSP']) for pos, dirs in zip(positions, directions)])
+    sol = solve(batch)
+    out = []
+    for gs in groups:
+        common, voices, score = balance_voices(sol, gs, BALANCE_WEIGHT)
+        out.append({'slopeSPPerSpaceAdjusted': common, 'voiceSlopesSPPerSpace': voices, 'balanceScore': score})
+    return out
+
+@rule('RULE.Beaming.cross_voice_mixed_stem_slope_balance')
+def cross_voice_mixed_stem_slope_balance(payload, ctx):
+    return cross_voice_batch([payload], ctx)[0]
@@ -0,0 +1,141 @@
+"""
+Collision rules on the worklist solver in `ruleskit.lattice`.
+
+RULE.Collision.priority_lattice takes `grobTypes` in stacking order (outward
+from the staff) and `proximities`, where proximities[i] is the current
+clearance between grob i and grob i+1; optional `forcedPositions` lists grob
+indices that must not move (the rule's forced_positions exception). When
+forced grobs leave no room to clear a conflict the rule raises ValueError
+rather than return an overlap. Output:
+`offsetsPerGrob` ({index: {x, y}}, y = displacement along the stacking axis)
+and `offsets`, the largest displacement per grob type.
+
+Each pairwise Collision.* policy below is registered as the lattice's edge
+resolver for its type pair (min gap + who yields), and the pairwise
+operations with box inputs run the same resolver on their two grobs. Their
+*YOffsetSP outputs are displacements away from the partner (>= 0). Lyrics are
+the interval from LYRIC_DESCENT_SP below to LYRIC_ASCENT_SP above the
+baseline; `minGapSP` overrides the policy's gap. The fingering policies also
+take the lattice inputs (grobTypes/proximities) their registry entries
+declare, with `minClearanceSP` as the override.
+"""
+from ..runtime import rule
+from ..lattice import edge_resolver, yield_policy, resolve_pair, solve
+from ..lyrics import LYRIC_ASCENT_SP, LYRIC_DESCENT_SP
+
+# (type, type) -> (min gap in sp, type that holds its place); from x-rule parameters.
+POLICIES = {
+    ('dynamic', 'lyric'): (0.25, 'dynamic'),       # lyrics_vs_dynamics_stacking
+    ('fingering', 'dynamic'): (0.2, 'dynamic'),    # fingering_vs_dynamics_priority
+    ('fingering', 'ornament'): (0.2, 'ornament'),  # fingering_vs_ornaments_priority
+    ('ornament', 'lyric'): (0.25, 'ornament'),     # ornament_vs_lyrics_priority
+    ('accidental', 'lyric'): (0.25, 'accidental'), # accidental_vs_lyrics_priority
+    ('rehearsal', 'dynamic'): (0.3, 'dynamic'),    # rehearsal_vs_dynamics_priority
+    ('hairpin', 'lyric'): (0.25, 'hairpin'),       # hairpin_vs_lyrics_priority
+    ('tempo', 'lyric'): (0.3, 'tempo'),            # tempo_mark_vs_lyrics_priority
+    ('rehearsal', 'tempo'): (0.3, 'tempo'),        # rehearsal_vs_tempo_priority
+}
+
+for (_a, _b), (_gap, _stronger) in POLICIES.items():
+    edge_resolver(_a, _b)(yield_policy(_gap, _stronger))
+
+def _lattice(payload, resolvers=None):
+    types = payload['grobTypes']
+    gaps = payload.get('proximities') or [0.0] * (len(types) - 1)
+    forced = payload.get('forcedPositions') or ()
+    for i in forced:
+        if not 0 <= i < len(types):
+            raise ValueError(f'forcedPositions index {i} out of range')
+    sol = solve(types, gaps, forced=forced, resolvers=resolvers)
+    if sol.unresolved:
+        pairs = ', '.join(f'{types[i]}#{i}/{types[i + 1]}#{i + 1}' for i in sol.unresolved)
+        raise ValueError(f'forcedPositions leave no room to separate {pairs}')
+    per_grob, by_type = {}, {}
+    for i, (t, y) in enumerate(zip(types, sol.offsets)):
+        per_grob[str(i)] = {'x': 0.0, 'y': y}
+        if t not in by_type or abs(y) > abs(by_type[t]['y']):
+            by_type[t] = {'x': 0.0, 'y': y}
+    return {'offsetsPerGrob': per_grob, 'offsets': by_type}
+
+@rule('RULE.Collision.priority_lattice')
+def priority_lattice(payload, ctx):
+    return _lattice(payload)
+
+def _lyric_box(baseline):
+    return {'y': baseline - LYRIC_DESCENT_SP, 'h': LYRIC_DESCENT_SP + LYRIC_ASCENT_SP}
+
+def _pair(payload, type_a, box_a, type_b, box_b, gap_key='minGapSP'):
+    gap, stronger = POLICIES.get((type_a, type_b)) or POLICIES[(type_b, type_a)]
+    override = payload.get(gap_key)
+    resolver = yield_policy(override, stronger) if override is not None else None
+    return resolve_pair(type_a, box_a, type_b, box_b, resolver=resolver)
+
+def _vs_lyrics(payload, grob, box_key, out_key):
+    lyric, other = _pair(payload, 'lyric', _lyric_box(payload['lyricsBaselineSP']), grob, payload[box_key])
+    out = {'lyricYOffsetSP': lyric}
+    if out_key:
+        out[out_key] = other
+    return out
+
+@rule('RULE.Collision.lyrics_vs_dynamics_stacking')
+def lyrics_vs_dynamics_stacking(payload, ctx):
+    return _vs_lyrics(payload, 'dynamic', 'dynamicsBBox', 'dynamicsYOffsetSP')
+
+@rule('RULE.Collision.accidental_vs_lyrics_priority')
+def accidental_vs_lyrics_priority(payload, ctx):
+    return _vs_lyrics(payload, 'accidental', 'accidentalBBox', None)
+
+@rule('RULE.Collision.hairpin_vs_lyrics_priority')
+def hairpin_vs_lyrics_priority(payload, ctx):
+    return _vs_lyrics(payload, 'hairpin', 'hairpinBBox', 'hairpinYOffsetSP')
+
+@rule('RULE.Collision.ornament_vs_lyrics_priority')
+def ornament_vs_lyrics_priority(payload, ctx):
+    return _vs_lyrics(payload, 'ornament', 'ornamentBBox', 'ornamentYOffsetSP')
+
+@rule('RULE.Collision.tempo_mark_vs_lyrics_priority')
+def tempo_mark_vs_lyrics_priority(payload, ctx):
+    return _vs_lyrics(payload, 'tempo', 'tempoMarkBBox', 'tempoMarkYOffsetSP')
+
+@rule('RULE.Collision.rehearsal_vs_tempo_priority')
+def rehearsal_vs_tempo_priority(payload, ctx):
+    r, t = _pair(payload, 'rehearsal', payload['rehearsalBBox'], 'tempo', payload['tempoMarkBBox'])
+    return {'rehearsalYOffsetSP': r, 'tempoMarkYOffsetSP': t}
+
+@rule('RULE.Collision.rehearsal_vs_dynamics_priority')
+def rehearsal_vs_dynamics_priority(payload, ctx):
+    r, d = _pair(payload, 'rehearsal', payload['rehearsalBBox'], 'dynamic', payload['dynamicsBBox'])
+    return {'rehearsalYOffsetSP': r, 'dynamicsYOffsetSP': d}
+
+def _fingering_vs(payload, partner, box_key):
+    """
+    Lattice form (grobTypes/proximities, the registry inputs): the chain is
+    solved with this pair's policy, minClearanceSP overriding its gap, and
+    fingeringYOffsetSP is the fingering's offset in it. Box form (`box_key`,
+    optional fingeringBBox; without it the fingering is taken to sit on the
+    partner), used when there is no lattice: fingeringYOffsetSP is the
+    fingering's shift away from the partner. Both forms also give `offsets`.
+    """
+    clearance = payload.get('minClearanceSP')
+    if 'grobTypes' in payload:
+        resolvers = None
+        if clearance is not None:
+            resolvers = {frozenset(('fingering', partner)): yield_policy(clearance, partner)}
+        out = _lattice(payload, resolvers)
+        out['fingeringYOffsetSP'] = out['offsets'].get('fingering', {'y': 0.0})['y']
+        return out
+    if box_key not in payload:
+        raise ValueError(f'expected grobTypes or {box_key}')
+    box = payload[box_key]
+    fingering = payload.get('fingeringBBox') or {'x': box.get('x', 0.0), 'y': box['y'] + box['h'], 'w': 0.0, 'h': 0.0}
+    f, other = _pair(payload, 'fingering', fingering, partner, box, gap_key='minClearanceSP')
+    return {'fingeringYOffsetSP': f, 'offsets': {'fingering': {'x': 0.0, 'y': f}, partner: {'x': 0.0, 'y': other}}}
+
+@rule('RULE.Collision.fingering_vs_dynamics_priority')
+def fingering_vs_dynamics_priority(payload, ctx):
+    # FingeringDynamicsOutput declares only the fingering's shift.
+    return {'fingeringYOffsetSP': _fingering_vs(payload, 'dynamic', 'dynamicsBBox')['fingeringYOffsetSP']}
+
+@rule('RULE.Collision.fingering_vs_ornaments_priority')
+def fingering_vs_ornaments_priority(payload, ctx):
+    return _fingering_vs(payload, 'ornament', 'ornamentBBox')
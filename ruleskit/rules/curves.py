@@ -0,0 +1,94 @@
+"""
+Slur and tie shape selection on the sampled-candidate engine in
+`ruleskit.curves`.
+
+- RULE.Slur.curvature_choice_with_collision_penalty — scores `candidates`
+  (cubic Béziers as 8 numbers) by EXCESS_CURVATURE_PENALTY times curvature
+  above the flattest candidate plus collision cost against `nearbyGrobs`
+  (BBoxes; the registry input of the same name). Without boxes a candidate's
+  precomputed `collisions` count is charged instead.
+- RULE.Tie.curvature_selection_with_clearance — generates tie candidates
+  between the `start` and `end` noteheads (TIE_HEIGHTS_SP above and below)
+  and picks the flattest one that keeps MIN_CLEARANCE_SP from noteheads and
+  `nearbyGrobs`.
+
+Both batch forms sample every candidate of every payload into one
+`CurveSamples`.
+"""
+from ..runtime import rule, batch_rule
+from ..curves import CurveSamples, choose, control_points, curvature
+
+COLLISION_PENALTY = 1.0          # x-rule parameters.collision_penalty
+EXCESS_CURVATURE_PENALTY = 0.4   # x-rule parameters.excess_curvature_penalty
+ENDPOINT_CLEARANCE_SP = 0.25     # x-rule parameters.endpoint_clearance
+MIN_CLEARANCE_SP = 0.2           # x-rule parameters.min_clearance_sp (ties)
+TIE_HEIGHTS_SP = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+TIE_HEIGHT_PENALTY = 0.4         # per staff space of tie height
+TIE_GAP_SP = 0.25                # horizontal gap between notehead and tie end
+
+@batch_rule('RULE.Slur.curvature_choice_with_collision_penalty')
+def slur_batch(payloads, ctx):
+    curves, base, spans = [], [], []
+    for p in payloads:
+        cands = p['candidates']
+        if not cands:
+            raise ValueError('at least one candidate curve is required')
+        pts = [control_points(c['controlPoints']) for c in cands]
+        curv = [c['curvature'] if c.get('curvature') is not None else curvature(q) for c, q in zip(cands, pts)]
+        flattest = min(curv)
+        charge = not p.get('nearbyGrobs')
+        start = len(curves)
+        curves.extend(pts)
+        base.extend(EXCESS_CURVATURE_PENALTY * (k - flattest) + (COLLISION_PENALTY * (c.get('collisions') or 0) if charge else 0.0)
+                    for c, k in zip(cands, curv))
+        spans.append((start, len(curves)))
+    samples = CurveSamples(curves)
+    out = []
+    for p, (lo, hi) in zip(payloads, spans):
+        boxes = p.get('nearbyGrobs') or ()
+        c, score, _ = choose(samples, base, boxes, ENDPOINT_CLEARANCE_SP, COLLISION_PENALTY, range(lo, hi))
+        res = {'chosenIndex': c - lo, 'score': score}
+        if boxes:
+            res['minClearanceSP'] = samples.min_clearance(c, boxes)
+        out.append(res)
+    return out
+
+@rule('RULE.Slur.curvature_choice_with_collision_penalty')
+def curvature_choice_with_collision_penalty(payload, ctx):
+    return slur_batch([payload], ctx)[0]
+
+def _tie_candidates(start, end):
+    x0 = start['x'] + start['w'] + TIE_GAP_SP
+    x3 = max(end['x'] - TIE_GAP_SP, x0 + 2 * TIE_GAP_SP)
+    y0 = start['y'] + start['h'] / 2.0
+    y3 = end['y'] + end['h'] / 2.0
+    q = (x3 - x0) / 4.0
+    for direction, sign in (('up', 1), ('down', -1)):
+        for h in TIE_HEIGHTS_SP:
+            # Control points at 4/3 h put the curve's apex at height h.
+            lift = sign * h * 4.0 / 3.0
+            yield direction, h, (x0, y0, x0 + q, y0 + lift, x3 - q, y3 + lift, x3, y3)
+
+@batch_rule('RULE.Tie.curvature_selection_with_clearance')
+def tie_batch(payloads, ctx):
+    curves, base, meta, spans = [], [], [], []
+    for p in payloads:
+        start = len(curves)
+        for direction, h, pts in _tie_candidates(p['start'], p['end']):
+            curves.append(pts)
+            base.append(TIE_HEIGHT_PENALTY * h)
+            meta.append((direction, h))
+        spans.append((start, len(curves)))
+    samples = CurveSamples(curves)
+    out = []
+    for p, (lo, hi) in zip(payloads, spans):
+        boxes = [p['start'], p['end']] + list(p.get('nearbyGrobs') or ())
+        c, score, _ = choose(samples, base, boxes, MIN_CLEARANCE_SP, COLLISION_PENALTY, range(lo, hi))
+        direction, h = meta[c]
+        out.append({'minClearanceSP': samples.min_clearance(c, boxes), 'direction': direction,
+                    'heightSP': h, 'controlPoints': list(curves[c]), 'score': score})
+    return out
+
+@rule('RULE.Tie.curvature_selection_with_clearance')
+def curvature_selection_with_clearance(payload, ctx):
+    return tie_batch([payload], ctx)[0]
@@ -0,0 +1,111 @@
+"""
+Lyrics and stanza-number rules on the system layout in `ruleskit.lyrics`.
+
+Every payload belongs to a system (`systemId`; a payload without one is a
+system of its own) and a verse (`verse`, an integer below MAX_VERSES,
+0 = nearest the staff, default 0); payloads of one system must agree on
+staffBaseline.
+Its syllables — lyricBBox or syllableBBoxes, in text coordinates (y
+relative to the syllable's baseline) — join that verse's line, together
+with any hyphenBBoxes, melismaLineBBoxes or extenderLineBBox. One `layout`
+per system then gives:
+
+* yOffsetSP / baselineYOffsetSP — depth of the verse baseline below
+  staffBaseline (>= MIN_DISTANCE_SP plus the verse's ascent). With
+  `varianceSP` the baseline variance rule lets a short syllable sit up to
+  min(varianceSP, MAX_VARIANCE_SP) higher than the stable baseline.
+* lyricOffsets — rightward shift of each of the payload's syllables so
+  hyphens, extenders and word spaces fit.
+* minLineLengthSP — the extender's length (at least MIN_LINE_LENGTH_SP).
+* StanzaNumber xOffsetSP / yOffsetSP — how far the number moves left to
+  clear the verse's first syllable, and the baseline y it sits on. A
+  stanza number in a verse without syllables in the pass uses its own
+  lyricsBaselineSP.
+
+A single call is a layout of one payload. The batch form lays out the
+payloads of each named system in one pass, and `lyrics_pass` does the
+same across all five operations, so all verses of a score go in one call.
+"""
+from ..runtime import rule, batch_rule
+from ..lyrics import Verse, layout, line_length, MIN_LINE_LENGTH_SP, STANZA_MIN_GAP_SP
+
+OPERATIONS = (
+    'RULE.Lyrics.vertical_alignment_with_baselines',
+    'RULE.Lyrics.baseline_adjustment_with_variance',
+    'RULE.Lyrics.hyphen_melisma_spacing_interaction',
+    'RULE.Lyrics.extender_spacing_policy',
+    'RULE.StanzaNumber.align_with_lyrics_policy',
+)
+MAX_VERSES = 64   # verses are laid out 0..max, empty ones included, so bound the index
+
+def _syllables(payload):
+    if 'syllableBBoxes' in payload:
+        return list(payload['syllableBBoxes'])
+    return [payload['lyricBBox']] if 'lyricBBox' in payload else []
+
+def lyrics_pass(calls, ctx=None):
+    """calls: [(operationId, payload)] -> outputs in order, one layout per systemId (unnamed: per payload)."""
+    systems = {}
+    for i, (op, payload) in enumerate(calls):
+        if op not in OPERATIONS:
+            raise ValueError(f'{op} is not a lyrics layout rule')
+        system = payload.get('systemId')
+        systems.setdefault(('_solo', i) if system is None else system, []).append(i)
+    out = [None] * len(calls)
+    for members in systems.values():
+        lines = {}          # verse -> (syllables, hyphens, extenders, melismas)
+        spans = {}          # call index -> (verse, first syllable, count)
+        baseline = None
+        for i in members:
+            op, payload = calls[i]
+            verse = payload.get('verse', 0)
+            if not isinstance(verse, int) or isinstance(verse, bool) or not 0 <= verse < MAX_VERSES:
+                raise ValueError(f'verse must be an integer from 0 to {MAX_VERSES - 1}, got {verse!r}')
+            syl, hyph, ext, mel = lines.setdefault(verse, ([], [], [], []))
+            boxes = _syllables(payload)
+            spans[i] = (verse, len(syl), len(boxes))
+            syl.extend(boxes)
+            hyph.extend(payload.get('hyphenBBoxes') or ())
+            mel.extend(payload.get('melismaLineBBoxes') or ())
+            if payload.get('extenderLineBBox'):
+                ext.append(payload['extenderLineBBox'])
+            if 'staffBaseline' in payload:
+                if baseline is None:
+                    baseline = payload['staffBaseline']
+                elif payload['staffBaseline'] != baseline:
+                    raise ValueError(f"system {payload.get('systemId')!r} has payloads with different "
+                                     f"staffBaseline values ({baseline} and {payload['staffBaseline']})")
+        verses = [Verse(*lines.get(v, ([], [], [], []))) for v in range(max(lines) + 1)]
+        lay = layout(verses, 0.0 if baseline is None else baseline)
+        for i in members:
+            op, payload = calls[i]
+            verse, start, count = spans[i]
+            if op == 'RULE.StanzaNumber.align_with_lyrics_policy':
+                x_offset, y = lay.stanza(verse, payload['stanzaBBox'], payload.get('minGapSP', STANZA_MIN_GAP_SP))
+                if not verses[verse].syllables or baseline is None:
+                    y = payload['lyricsBaselineSP']
+                out[i] = {'xOffsetSP': x_offset, 'yOffsetSP': y}
+            elif op == 'RULE.Lyrics.vertical_alignment_with_baselines':
+                out[i] = {'yOffsetSP': lay.depth(verse)}
+            elif op == 'RULE.Lyrics.baseline_adjustment_with_variance':
+                out[i] = {'yOffsetSP': lay.depth(verse, payload.get('lyricBBox'), payload.get('varianceSP', 0.0))}
+            elif op == 'RULE.Lyrics.hyphen_melisma_spacing_interaction':
+                out[i] = {'lyricOffsets': lay.offsets[verse][start:start + count],
+                          'baselineYOffsetSP': lay.depth(verse)}
+            else:
+                ext = payload.get('extenderLineBBox')
+                out[i] = {'minLineLengthSP': line_length(ext) if ext else MIN_LINE_LENGTH_SP,
+                          'baselineYOffsetSP': lay.depth(verse)}
+    return out
+
+def _register(operation_id):
+    @batch_rule(operation_id)
+    def batch(payloads, ctx):
+        return lyrics_pass([(operation_id, p) for p in payloads], ctx)
+
+    @rule(operation_id)
+    def single(payload, ctx):
+        return lyrics_pass([(operation_id, payload)], ctx)[0]
+
+for _op in OPERATIONS:
+    _register(_op)
@@ -0,0 +1,22 @@
+"""
+RULE.OpticalSize.stroke_and_spacing_scalars — line weight and spacing scalars
+as a function of staff size. 20pt is the reference size (both scalars 1.0);
+smaller staves get relatively heavier strokes and looser spacing, larger
+staves the reverse, with strokes reacting more strongly than spacing.
+"""
+from ..runtime import rule
+
+REFERENCE_SIZE_PT = 20.0
+STROKE_EXPONENT = 0.5
+SPACING_EXPONENT = 0.25
+
+def scalars(staff_size_pt):
+    if staff_size_pt <= 0:
+        raise ValueError(f'staffSizePT must be positive, got {staff_size_pt}')
+    ratio = REFERENCE_SIZE_PT / staff_size_pt
+    return ratio ** STROKE_EXPONENT, ratio ** SPACING_EXPONENT
+
+@rule('RULE.OpticalSize.stroke_and_spacing_scalars')
+def stroke_and_spacing_scalars(payload, ctx):
+    stroke, spacing = scalars(float(payload['staffSizePT']))
+    return {'strokeScalar': stroke, 'spacingScalar': spacing}
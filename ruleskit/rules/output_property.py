@@ -0,0 +1,48 @@
+"""
+RULE.OutputProperty.override_inheritance_policy — effective grob properties
+from overrides inherited through score -> staffGroup -> staff -> voice -> grob.
+
+`overrides` takes one of two forms:
+- a single chain, {score: {...}, staffGroup: {...}, staff: {...}, voice: {...},
+  grob: {...}} (any level may be omitted); effectiveProperties is the merged
+  property map;
+- a context tree, {contexts: [{id, parent?, properties}], grobs: [{id,
+  context, properties?}]}; effectiveProperties maps each grob id (or each
+  context id when no grobs are given) to its merged properties.
+A null value reverts the property from that level down. With `allowInherit`
+false (default ALLOW_INHERIT) nothing is inherited: each grob or context gets
+only its own level's properties. Built on `ruleskit.overrides`: each context's
+effective map is cached on its layer, built once from its parent's, and
+every grob costs one merge of its own deltas onto it.
+"""
+from ..runtime import rule
+from ..overrides import ContextTree, LEVELS, chain
+
+ALLOW_INHERIT = True  # x-rule parameters.allow_inherit
+
+def _tree(overrides, inherit):
+    tree = ContextTree(overrides.get('contexts') or ())
+    grobs = overrides.get('grobs')
+    if not grobs:
+        return {cid: dict(layer.flattened(inherit)) for cid, layer in tree.layers.items()}
+    out = {}
+    for g in grobs:
+        cid = g.get('context')
+        layer = tree.get(cid)
+        if layer is None:
+            raise ValueError(f'grob {g.get("id")!r}: unknown context {cid!r}')
+        out[str(g['id'])] = layer.resolve(g.get('properties'), inherit)
+    return out
+
+@rule('RULE.OutputProperty.override_inheritance_policy')
+def override_inheritance_policy(payload, ctx):
+    overrides = payload['overrides']
+    inherit = payload.get('allowInherit', ALLOW_INHERIT)
+    if not isinstance(inherit, bool):
+        raise ValueError(f'allowInherit must be a boolean, got {inherit!r}')
+    if 'contexts' in overrides or 'grobs' in overrides:
+        return {'effectiveProperties': _tree(overrides, inherit)}
+    unknown = sorted(set(overrides) - set(LEVELS))
+    if unknown:
+        raise ValueError(f'unknown override levels {unknown}; expected {", ".join(LEVELS)} or contexts/grobs')
+    return {'effectiveProperties': dict(chain(overrides).flattened(inherit))}
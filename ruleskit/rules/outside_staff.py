@@ -0,0 +1,108 @@
+"""
+Outside-staff marks placed by one skyline pass (`ruleskit.skyline`).
+
+Each rule below reads one box, a floor (`systemTop`, or `staffBaseline` for
+instrument switches), a padding (its x-rule minimum distance or top margin,
+overridable per payload) and optional staff obstacles (notehead / nearby /
+target boxes), and is placed in outside-staff priority order — PRIORITIES,
+or `outsideStaffPriority` in the payload. `yOffsetSP` is the upward shift
+applied to the box; `position.y` is the box's new bottom.
+
+The marks of a pass are grobs of a `ruleskit.grobs.GrobStore` (X_extent,
+Y_extent, outside_staff_priority, outside_staff_padding), which the skyline
+reads column-wise and answers in Y_offset.
+
+A single call is a pass with one item. The batch form places payloads that
+name the same `systemId` in one pass (a payload without one is placed on
+its own, exactly as a single call would), and
+`outside_staff_pass` does the same across operations — rehearsal marks,
+tempo marks, ornaments, fingerings, text, bar numbers and instrument
+switches of a page in one go, each result in its own rule's output shape.
+"""
+from collections import namedtuple
+
+from ..runtime import rule, batch_rule
+from ..grobs import GrobStore
+from ..skyline import place
+
+OUTSIDE_STAFF_PADDING_SP = 0.25
+
+Mark = namedtuple('Mark', 'box floor padding padding_key priority obstacles output')
+
+MARKS = {
+    'RULE.Fingering.placement_policy':
+        Mark('fingeringBBox', None, OUTSIDE_STAFF_PADDING_SP, None, 50, 'noteheadBBoxes', 'position'),
+    'RULE.Ornaments.placement_above_below_with_collision':
+        Mark('ornamentBBox', None, OUTSIDE_STAFF_PADDING_SP, None, 100, 'nearbyGrobs', 'position'),
+    'RULE.BarNumber.placement_policy':
+        Mark('numberBBox', 'systemTop', 0.8, 'minDistanceSP', 100, None, 'yOffsetSP'),          # x-rule parameters.min_distance_sp
+    'RULE.Text.placement_policy':
+        Mark('textBBox', None, 0.6, None, 450, 'targets', 'position'),                          # x-rule parameters.min_distance_sp
+    'RULE.InstrumentSwitch.placement_policy':
+        Mark('changeTextBBox', 'staffBaseline', 0.6, None, 500, None, 'yOffsetSP'),             # x-rule parameters.min_distance_sp
+    'RULE.MetronomeMark.placement_policy':
+        Mark('markBBox', 'systemTop', 0.9, 'topMarginSP', 1000, None, 'yOffsetSP'),             # x-rule parameters.min_distance_sp
+    'RULE.TempoMarks.placement_policy':
+        Mark('tempoTextBBox', 'systemTop', 0.8, 'topMarginSP', 1000, None, 'yOffsetSP'),        # x-rule parameters.top_margin_sp
+    'RULE.RehearsalMarks.placement_policy':
+        Mark('markBBox', 'systemTop', 1.0, 'topMarginSP', 1500, None, 'yOffsetSP'),             # x-rule parameters.top_margin_sp
+}
+PRIORITIES = {op: m.priority for op, m in MARKS.items()}
+EMPTY_BOX = {'x': 0.0, 'y': 0.0, 'w': 0.0, 'h': 0.0}   # TextPlacementInput has no required box
+COLUMNS = ('X_extent', 'Y_extent', 'outside_staff_priority', 'outside_staff_padding', 'Y_offset')
+
+def _add(store, op, mark, payload):
+    """Add the payload's mark as a grob; returns its floor."""
+    box = payload.get(mark.box) or EMPTY_BOX
+    store.add(op.split('.')[1],
+              X_extent=(box['x'], box['x'] + box['w']),
+              Y_extent=(box['y'], box['y'] + box['h']),
+              outside_staff_priority=payload.get('outsideStaffPriority', mark.priority),
+              outside_staff_padding=payload.get(mark.padding_key, mark.padding) if mark.padding_key else mark.padding)
+    floor = payload.get(mark.floor) if mark.floor else None
+    return float('-inf') if floor is None else floor
+
+def _obstacles(mark, payload):
+    if not mark.obstacles:
+        return []
+    return [(b['x'], b['x'] + b['w'], b['y'] + b['h']) for b in payload.get(mark.obstacles) or ()]
+
+def _output(mark, payload, shift):
+    if mark.output == 'yOffsetSP':
+        return {'yOffsetSP': shift}
+    box = payload.get(mark.box) or EMPTY_BOX
+    if mark.box == 'textBBox':
+        return {'position': {'x': box['x'], 'y': box['y'] + shift}}
+    return {'position': {'y': box['y'] + shift}}
+
+def outside_staff_pass(calls, ctx=None):
+    """calls: [(operationId, payload)] -> outputs in order, one skyline pass per systemId (unnamed: per payload)."""
+    systems = {}
+    for i, (op, payload) in enumerate(calls):
+        if op not in MARKS:
+            raise ValueError(f'{op} is not an outside-staff placement rule')
+        system = payload.get('systemId')
+        systems.setdefault(('_solo', i) if system is None else system, []).append(i)
+    out = [None] * len(calls)
+    for members in systems.values():
+        store, floors, obstacles = GrobStore(len(members), dense=COLUMNS), [], []
+        for i in members:
+            op, payload = calls[i]
+            floors.append(_add(store, op, MARKS[op], payload))
+            obstacles.extend(_obstacles(MARKS[op], payload))
+        for i, shift in zip(members, place(store, obstacles, floors)):
+            op, payload = calls[i]
+            out[i] = _output(MARKS[op], payload, shift)
+    return out
+
+def _register(operation_id):
+    @batch_rule(operation_id)
+    def batch(payloads, ctx):
+        return outside_staff_pass([(operation_id, p) for p in payloads], ctx)
+
+    @rule(operation_id)
+    def single(payload, ctx):
+        return outside_staff_pass([(operation_id, payload)], ctx)[0]
+
+for _op in MARKS:
+    _register(_op)
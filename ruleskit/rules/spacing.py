@@ -0,0 +1,150 @@
+"""
+Horizontal spacing rules on `ruleskit.spacing`.
+
+- RULE.Spacing.duration_base_with_optical_corrections — column widths
+  (notehead + articulation padding), accidental lead-ins, and gaps from the
+  duration-derived ideal distances with an optical stem correction; an
+  up-stem followed by a down-stem gets OPTICAL_STEM_ADJ_WEIGHT more room,
+  the reverse that much less. Rods: minColumnGap plus the next column's
+  lead-in. With an optional `lineWidth` the line is justified to it.
+- RULE.Spacing.keep_inside_system_constraints — `columns` are column widths;
+  breaks minimise LINE_FILL_PENALTY * slack^2 per line (the last line is
+  free), a column wider than the line is overfull, and every line but the
+  last is justified. `columnPositions` restart at 0 on each line.
+- RULE.NoteSpacing.spacing_policy — `columns` are column positions; gaps are
+  opened to `minGapsSP` (a number or one per gap), and justified to an
+  optional `lineWidth` (measured to the last column).
+
+The batch forms put every line of every payload into one `LineBatch`.
+"""
+from ..runtime import rule, batch_rule
+from ..spacing import LineBatch, ideal_distances, justify
+
+MIN_COLUMN_GAP_SP = 0.5            # x-rule parameters.min_column_gap
+ACCIDENTAL_LEADING_PADDING_SP = 0.25  # x-rule parameters.accidental_leading_padding
+ARTICULATION_PADDING_SP = 0.2      # x-rule parameters.articulation_padding
+OPTICAL_STEM_ADJ_WEIGHT = 0.4      # x-rule parameters.optical_stem_adj_weight
+LINE_FILL_PENALTY = 1.0            # x-rule parameters.line_fill_penalty
+OVERFULL_PENALTY = 10.0            # x-rule parameters.overfull_penalty
+ACCIDENTAL_WIDTH_SP = 1.0          # accidentalSharp advance when the font table has none
+
+def _per_column(values, n, name, default):
+    values = list(values) if values else [default]
+    if len(values) == 1:
+        values *= n
+    if len(values) != n:
+        raise ValueError(f'{name}: expected 1 or {n} values, got {len(values)}')
+    return values
+
+def _accidental_width(ctx):
+    adv = ctx.advance_pt('accidentalSharp') if ctx is not None and ctx.glyphs else None
+    return ctx.to_sp(adv) if adv else ACCIDENTAL_WIDTH_SP
+
+def _columns(payload, ctx):
+    durations = payload['durations']
+    n = len(durations)
+    stems = _per_column(payload.get('stems'), n, 'stems', 'up')
+    pre = _per_column(payload.get('preItems'), n, 'preItems', 'none')
+    post = _per_column(payload.get('postItems'), n, 'postItems', 'none')
+    heads = _per_column(payload['noteheadWidths'], n, 'noteheadWidths', None)
+    min_gap = payload.get('minColumnGap', MIN_COLUMN_GAP_SP)
+    pad = payload.get('accidentalPadding', ACCIDENTAL_LEADING_PADDING_SP)
+    widths = [h + (ARTICULATION_PADDING_SP if p != 'none' else 0.0) for h, p in zip(heads, post)]
+    acc = _accidental_width(ctx)
+    lead = [acc + pad if p == 'accidental' else 0.0 for p in pre]
+    dist = ideal_distances(durations, ctx.spacing_scalar if ctx is not None else 1.0)
+    ideals, rods = [], []
+    for i in range(n - 1):
+        optical = 0.0
+        if stems[i] != stems[i + 1]:
+            optical = OPTICAL_STEM_ADJ_WEIGHT if stems[i] == 'up' else -OPTICAL_STEM_ADJ_WEIGHT
+        ideals.append(dist[i] - widths[i] + optical)
+        rods.append(min_gap + lead[i + 1])
+    return widths, lead, ideals, rods, [1.0 / d for d in dist[:-1]]
+
+@batch_rule('RULE.Spacing.duration_base_with_optical_corrections')
+def duration_base_batch(payloads, ctx):
+    batch = LineBatch()
+    cols = []
+    for p in payloads:
+        widths, lead, ideals, rods, stiffness = _columns(p, ctx)
+        batch.add(ideals, rods, widths, p.get('lineWidth'), lead[0], stiffness)
+        cols.append((widths, lead))
+    sol = justify(batch)
+    return [{'columnPositions': sol.positions(line), 'columnMinWidths': widths,
+             'gaps': sol.gaps(line), 'leadIn': lead}
+            for line, (widths, lead) in enumerate(cols)]
+
+@rule('RULE.Spacing.duration_base_with_optical_corrections')
+def duration_base_with_optical_corrections(payload, ctx):
+    return duration_base_batch([payload], ctx)[0]
+
+def break_lines(widths, line_width):
+    """Column indices that start a new line (not 0), minimising fill penalties."""
+    n = len(widths)
+    cost = [0.0] + [float('inf')] * n
+    back = [0] * (n + 1)
+    for j in range(1, n + 1):
+        total = 0.0
+        for i in range(j - 1, -1, -1):
+            total += widths[i]
+            if total > line_width and i < j - 1:
+                break
+            if total > line_width:
+                penalty = OVERFULL_PENALTY * (total - line_width) / line_width
+            elif j == n:
+                penalty = 0.0
+            else:
+                penalty = LINE_FILL_PENALTY * ((line_width - total) / line_width) ** 2
+            if cost[i] + penalty < cost[j]:
+                cost[j], back[j] = cost[i] + penalty, i
+    starts, j = [], n
+    while j > 0:
+        starts.append(back[j])
+        j = back[j]
+    return starts[::-1][1:]
+
+@batch_rule('RULE.Spacing.keep_inside_system_constraints')
+def keep_inside_batch(payloads, ctx):
+    batch = LineBatch()
+    plans = []
+    for p in payloads:
+        width, cols = float(p['lineWidth']), [float(c) for c in p['columns']]
+        if not width > 0:
+            raise ValueError(f'lineWidth must be positive, got {width}')
+        breaks = break_lines(cols, width)
+        bounds = [0] + breaks + [len(cols)]
+        lines = []
+        for k, (lo, hi) in enumerate(zip(bounds, bounds[1:])):
+            last = k == len(bounds) - 2
+            # Columns are the springs; a trailing zero-width column closes the line.
+            lines.append(batch.add(cols[lo:hi], cols[lo:hi], [0.0] * (hi - lo + 1), None if last else width))
+        overfull = sum(max(0.0, sum(cols[lo:hi]) - width) for lo, hi in zip(bounds, bounds[1:]))
+        plans.append((breaks, lines, overfull))
+    sol = justify(batch)
+    return [{'systemBreaks': breaks,
+             'columnPositions': [x for line in lines for x in sol.positions(line)[:-1]],
+             'overfull': overfull}
+            for breaks, lines, overfull in plans]
+
+@rule('RULE.Spacing.keep_inside_system_constraints')
+def keep_inside_system_constraints(payload, ctx):
+    return keep_inside_batch([payload], ctx)[0]
+
+@batch_rule('RULE.NoteSpacing.spacing_policy')
+def spacing_policy_batch(payloads, ctx):
+    batch = LineBatch()
+    for p in payloads:
+        xs = [float(x) for x in p['columns']]
+        if not xs:
+            raise ValueError('columns is empty')
+        min_gaps = p.get('minGapsSP', MIN_COLUMN_GAP_SP)
+        rods = _per_column(min_gaps if isinstance(min_gaps, list) else [min_gaps], len(xs) - 1, 'minGapsSP', None)
+        ideals = [b - a for a, b in zip(xs, xs[1:])]
+        batch.add(ideals, rods, [0.0] * len(xs), p.get('lineWidth'), xs[0])
+    sol = justify(batch)
+    return [{'columnPositions': sol.positions(line)} for line in range(len(payloads))]
+
+@rule('RULE.NoteSpacing.spacing_policy')
+def spacing_policy(payload, ctx):
+    return spacing_policy_batch([payload], ctx)[0]
@@ -0,0 +1,100 @@
+"""
+Spanner placement rules with shared breaking in `ruleskit.spanners`.
+
+Every rule here accepts optional `startColumn` / `endColumn` / `systemBreaks`
+and then also returns `segments`: one {system, startColumn, endColumn,
+brokenLeft, brokenRight, leftPaddingSP, rightPaddingSP} per system the
+spanner touches. The batch forms put all spanners sharing the same
+`systemBreaks` into one `SpannerIndex` and break them in one sweep.
+
+Vertical placement (`yOffsetSP`) is the spanner's distance outwards from its
+reference — `systemBaseline` for pedals, `systemTop` for trills and text
+spanners (default 0, the staff top of the boxes' frame) — never less than
+the rule's minimum distance. Ottavas have no box: their `yOffsetSP` is the y
+of the line, the minimum distance above the staff top (staffBaseline, the
+bottom line, + STAFF_HEIGHT_SP) for 8va / 15ma / 22ma, or below staffBaseline
+for 8vb / 15mb / 22mb. Glissandi instead move up just enough to clear
+overlapping `nearbyGrobs` by `minGapSP`.
+"""
+from ..runtime import rule, batch_rule
+from ..spanners import SpannerIndex
+
+MIN_DISTANCE_SP = 0.8   # x-rule parameters.min_distance_sp
+MIN_GAP_SP = 0.25       # x-rule parameters.min_gap_sp (glissando)
+MIN_HEIGHT_SP = 1.0     # x-rule parameters.min_height_sp (volta)
+STAFF_HEIGHT_SP = 4.0   # five-line staff, bottom line to top line
+
+OTTAVA_ABOVE = ('8va', '15ma', '22ma')
+OTTAVA_BELOW = ('8vb', '15mb', '22mb')
+
+def _ottava(p):
+    kind = p['ottavaType']
+    gap = p.get('minDistanceSP', MIN_DISTANCE_SP)
+    if kind in OTTAVA_ABOVE:
+        return {'yOffsetSP': p['staffBaseline'] + STAFF_HEIGHT_SP + gap}
+    if kind in OTTAVA_BELOW:
+        return {'yOffsetSP': p['staffBaseline'] - gap}
+    raise ValueError(f'unknown ottavaType {kind!r}; expected one of {", ".join(OTTAVA_ABOVE + OTTAVA_BELOW)}')
+
+def _pedal(p):
+    box = p['pedalTextBBox']
+    return {'yOffsetSP': max(MIN_DISTANCE_SP, p['systemBaseline'] - (box['y'] + box['h']))}
+
+def _trill(p):
+    floor = p.get('minDistanceSP', MIN_DISTANCE_SP)
+    top = p.get('systemTop')
+    return {'yOffsetSP': floor if top is None else max(floor, p['trillTextBBox']['y'] - top)}
+
+def _text_spanner(p):
+    floor = p.get('minDistanceSP', MIN_DISTANCE_SP)
+    return {'yOffsetSP': max(floor, p['spannerBBox']['y'] - p.get('systemTop', 0.0))}
+
+def _duration_line(p):
+    return {'yOffsetSP': max(MIN_DISTANCE_SP, p.get('minDistanceSP', 0.0))}
+
+def _volta(p):
+    return {'heightSP': max(MIN_HEIGHT_SP, p.get('heightSP', 0.0))}
+
+def _glissando(p):
+    box = p['glissandoBBox']
+    gap = p.get('minGapSP', MIN_GAP_SP)
+    shift = 0.0
+    for g in p.get('nearbyGrobs') or ():
+        if g['x'] < box['x'] + box['w'] and box['x'] < g['x'] + g['w']:
+            shift = max(shift, g['y'] + g['h'] + gap - box['y'])
+    return {'yOffsetSP': shift}
+
+def _place(payloads, kind, place):
+    out = [place(p) for p in payloads]
+    groups = {}
+    for i, p in enumerate(payloads):
+        if 'startColumn' in p:
+            groups.setdefault(tuple(p.get('systemBreaks') or ()), []).append(i)
+    for breaks, members in groups.items():
+        index = SpannerIndex((payloads[i]['startColumn'], payloads[i].get('endColumn', payloads[i]['startColumn']), kind)
+                             for i in members)
+        pieces = index.segments(breaks)
+        for i, segs in zip(members, pieces):
+            out[i]['segments'] = [
+                {'system': index.system_of(s.start), 'startColumn': s.start, 'endColumn': s.end,
+                 'brokenLeft': s.broken_left, 'brokenRight': s.broken_right,
+                 'leftPaddingSP': s.left_padding, 'rightPaddingSP': s.right_padding}
+                for s in segs]
+    return out
+
+def _register(operation_id, kind, place):
+    @batch_rule(operation_id)
+    def batch(payloads, ctx):
+        return _place(payloads, kind, place)
+
+    @rule(operation_id)
+    def single(payload, ctx):
+        return _place([payload], kind, place)[0]
+
+_register('RULE.Ottava.placement_policy', 'ottava', _ottava)
+_register('RULE.Pedal.line_and_text_policy', 'pedal', _pedal)
+_register('RULE.TrillSpanner.placement_policy', 'trill', _trill)
+_register('RULE.TextSpanner.placement_policy', 'textSpanner', _text_spanner)
+_register('RULE.RepeatVolta.layout_policy', 'volta', _volta)
+_register('RULE.Glissando.placement_policy', 'glissando', _glissando)
+_register('RULE.DurationLine.placement_policy', 'durationLine', _duration_line)
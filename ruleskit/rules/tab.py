@@ -0,0 +1,42 @@
+"""
+Tablature rules.
+
+RULE.Tab.notehead_string_fret_policy takes the caller's `stringNumbers` /
+`fretNumbers`, or — with optional `pitches` (MIDI per event; a list for a
+chord) and `tunings` (open strings, string 1 first; default standard guitar)
+— chooses them itself with the Viterbi assignment in `ruleskit.tab`, and
+returns them flattened in note order with `stringNumbers` / `fretNumbers`.
+Stems go up unless `preferUpStems` is false (one per event).
+
+RULE.TabStaffSymbol.string_tuning_layout places one line per string,
+`stringGapSP` apart from the top line down.
+"""
+from ..runtime import rule
+from ..tab import STANDARD_TUNING, assign
+
+PREFER_UP_STEMS = True   # x-rule parameters.prefer_up_stems
+STRING_GAP_SP = 0.5      # x-rule parameters.string_gap_sp
+
+@rule('RULE.Tab.notehead_string_fret_policy')
+def notehead_string_fret_policy(payload, ctx):
+    direction = 'up' if payload.get('preferUpStems', PREFER_UP_STEMS) else 'down'
+    events = payload.get('pitches')
+    if events is None:
+        strings, frets = payload['stringNumbers'], payload['fretNumbers']
+        if len(strings) != len(frets):
+            raise ValueError(f'{len(strings)} string numbers but {len(frets)} fret numbers')
+        return {'stemDirections': [direction] * len(frets)}
+    fingerings = assign(events, payload.get('tunings') or STANDARD_TUNING)
+    return {
+        'stemDirections': [direction] * len(fingerings),
+        'stringNumbers': [s for f in fingerings for s, _ in f],
+        'fretNumbers': [fret for f in fingerings for _, fret in f],
+    }
+
+@rule('RULE.TabStaffSymbol.string_tuning_layout')
+def string_tuning_layout(payload, ctx):
+    count = payload['stringCount']
+    if len(payload['tunings']) != count:
+        raise ValueError(f'stringCount {count} but {len(payload["tunings"])} tunings')
+    gap = payload.get('stringGapSP', STRING_GAP_SP)
+    return {'linePositionsSP': [-i * gap for i in range(count)]}
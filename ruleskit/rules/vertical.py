@@ -0,0 +1,81 @@
+"""
+RULE.Vertical.min_dist_padding_and_stretch on `ruleskit.springs`.
+
+`objectBBoxes` are a system's staves / axis groups top to bottom (y up, one
+frame). Gap i — from the bottom of box i to the top of box i+1 — is a spring
+whose ideal length is the current gap and whose rod is minDistances[i]
+(one value applies to every gap; default MIN_STAFF_GAP_SP). Without
+`systemHeightSP` the gaps are just pushed open to their minimums; with it the
+chain is stretched (or compressed, down to the rods) so the system spans that
+height, spare space going to each gap in proportion to STRETCH_WEIGHT.
+
+Output: `staffPositions` (new y of each box), `objectOffsets` (new y - old y)
+and `minStaffGap`. The batch form solves every system of a page in one call.
+`StaffStack.update` re-solves incrementally after one box (a staff's skyline)
+changes.
+"""
+from ..runtime import rule, batch_rule
+from ..springs import SpringChain
+
+MIN_STAFF_GAP_SP = 1.5   # x-rule parameters.min_staff_gap
+STRETCH_WEIGHT = 1.0     # x-rule parameters.stretch_weight
+
+class StaffStack:
+    def __init__(self, boxes, min_distances=None, height=None):
+        n = len(boxes)
+        if n == 0:
+            raise ValueError('objectBBoxes is empty')
+        dists = list(min_distances) if min_distances else [MIN_STAFF_GAP_SP]
+        if len(dists) == 1:
+            dists *= max(n - 1, 1)
+        if len(dists) < n - 1:
+            raise ValueError(f'{n} objects need {n - 1} minDistances, got {len(dists)}')
+        self.boxes = list(boxes)
+        self.top = float(boxes[0]['y'] + boxes[0]['h'])
+        target = None
+        if height is not None:
+            target = height - sum(b['h'] for b in boxes)
+        gaps = [self._gap(i) for i in range(n - 1)]
+        self.chain = SpringChain(dists[:n - 1], gaps, [1.0 / STRETCH_WEIGHT] * (n - 1), target)
+        self.chain.solve()
+
+    def _gap(self, i):
+        upper, lower = self.boxes[i], self.boxes[i + 1]
+        return upper['y'] - (lower['y'] + lower['h'])
+
+    def update(self, i, box):
+        """Replace box i and re-solve the (at most two) gaps it touches."""
+        old, self.boxes[i] = self.boxes[i], box
+        if i == 0:
+            self.top = box['y'] + box['h']
+        chain = self.chain
+        if chain.target is not None and box['h'] != old['h']:
+            chain.retarget(chain.target + old['h'] - box['h'])
+        for g in (i - 1, i):
+            if 0 <= g < len(chain):
+                chain.update(g, ideal=self._gap(g))
+
+    def positions(self):
+        ys, top = [], self.top
+        lengths = self.chain.lengths()
+        for i, box in enumerate(self.boxes):
+            ys.append(top - box['h'])
+            if i < len(lengths):
+                top -= box['h'] + lengths[i]
+        return ys
+
+    def result(self):
+        ys = self.positions()
+        return {
+            'staffPositions': ys,
+            'objectOffsets': [y - b['y'] for y, b in zip(ys, self.boxes)],
+            'minStaffGap': min(self.chain.lengths(), default=0.0),
+        }
+
+@batch_rule('RULE.Vertical.min_dist_padding_and_stretch')
+def min_dist_batch(payloads, ctx):
+    return [StaffStack(p['objectBBoxes'], p.get('minDistances'), p.get('systemHeightSP')).result() for p in payloads]
+
+@rule('RULE.Vertical.min_dist_padding_and_stretch')
+def min_dist_padding_and_stretch(payload, ctx):
+    return min_dist_batch([payload], ctx)[0]
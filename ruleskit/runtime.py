@@ -0,0 +1,101 @@
+"""
+Rule registry and dispatcher. A rule is a plain function taking the decoded
+request payload (dict) and the shared fixture context (`ruleskit.fixtures`),
+returning the response payload (dict); it is bound to its operationId with the
+`@rule(...)` decorator. A rule may also register a batch form with
+`@batch_rule(...)`, taking a list of payloads and returning a list of outputs;
+`Runtime.apply_batch` falls back to per-payload calls otherwise.
+
+The operation table comes from the precompiled spec index (`ruleskit.spec`);
+rule-family modules are imported on first use (`ruleskit.rules.load_family`).
+
+Attach a `ruleskit.tracing.Tracer` (`Runtime(tracer=...)`) to record a span
+per invocation.
+"""
+from time import perf_counter_ns
+
+from . import spec
+from . import rules
+
+_RULES = {}
+_BATCH = {}
+
+class RuleError(Exception):
+    """Base class for runtime dispatch errors."""
+
+class UnknownOperation(RuleError, KeyError):
+    """The operationId or path is not declared in the typed spec."""
+
+class RuleNotImplemented(RuleError, LookupError):
+    """The operation is declared but has no registered implementation."""
+
+def rule(operation_id):
+    def register(fn):
+        _RULES[operation_id] = fn
+        return fn
+    return register
+
+def batch_rule(operation_id):
+    def register(fn):
+        _BATCH[operation_id] = fn
+        return fn
+    return register
+
+class Runtime:
+    def __init__(self, operations=None, tracer=None):
+        from .fixtures import fixture_context
+        self.fixture_context = fixture_context
+        self.operations = operations if operations is not None else spec.load_index()
+        self.by_path = {op.path: op for op in self.operations.values()}
+        self.tracer = tracer
+
+    def resolve(self, path):
+        op = self.by_path.get(path)
+        if op is None:
+            raise UnknownOperation(path)
+        return op
+
+    def _load(self, operation_id):
+        rules.load_family(operation_id)
+        return _RULES.get(operation_id)
+
+    def implemented(self):
+        rules.load_all()
+        return sorted(rid for rid in _RULES if rid in self.operations)
+
+    def apply(self, operation_id, payload, ctx=None):
+        if operation_id not in self.operations:
+            raise UnknownOperation(operation_id)
+        fn = _RULES.get(operation_id) or self._load(operation_id)
+        if fn is None:
+            raise RuleNotImplemented(operation_id)
+        if ctx is None:
+            ctx = self.fixture_context()
+        tracer = self.tracer
+        if tracer is None or not tracer.sampled():
+            return fn(payload, ctx)
+        t0 = perf_counter_ns()
+        try:
+            return fn(payload, ctx)
+        finally:
+            tracer.record(self.operations[operation_id], t0, perf_counter_ns())
+
+    def apply_batch(self, operation_id, payloads, ctx=None):
+        if operation_id not in self.operations:
+            raise UnknownOperation(operation_id)
+        if ctx is None:
+            ctx = self.fixture_context()
+        single = _RULES.get(operation_id) or self._load(operation_id)
+        fn = _BATCH.get(operation_id)
+        if fn is None:
+            if single is None:
+                raise RuleNotImplemented(operation_id)
+            fn = lambda ps, c: [single(p, c) for p in ps]
+        tracer = self.tracer
+        if tracer is None or not tracer.sampled():
+            return fn(payloads, ctx)
+        t0 = perf_counter_ns()
+        try:
+            return fn(payloads, ctx)
+        finally:
+            tracer.record(self.operations[operation_id], t0, perf_counter_ns(), batch=len(payloads))
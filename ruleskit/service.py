@@ -0,0 +1,207 @@
+"""
+HTTP rule service: POST /apply/<agent>/<rule> with the typed request payload,
+answered with the typed response payload. Paths and operationIds come from the
+typed spec. Request bodies are decoded per Content-Type and responses encoded
+per Accept (application/json, or application/msgpack when available).
+Every request gets a response with a JSON {error} body on failure: 400 for
+a body that is not an object or input a rule rejects (REJECTED), 501 for an
+operation without an implementation, 500 for any other exception.
+Fixture context comes from optional query parameters (?font=&staffSize=&paper=,
+defaults Bravura/20pt/A4). Identical concurrent requests are coalesced via
+single-flight; GET /stats reports the coalesced-request counter and
+GET /metrics exposes Prometheus metrics (see `ruleskit.metrics`).
+
+With --trace FILE, rule spans plus one `service` span per request (tagged
+cache: computed|coalesced) are written as Chrome trace JSON on shutdown.
+
+Usage: python -m ruleskit.service [--host 127.0.0.1] [--port 8080]
+                                  [--trace FILE] [--trace-sample RATE]
+"""
+import argparse
+import socket
+import threading
+from time import perf_counter_ns
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from .runtime import Runtime, UnknownOperation, RuleNotImplemented
+from .singleflight import SingleFlight, request_key
+from .fixtures import from_fixtures
+from .tracing import Tracer, Fanout
+from .metrics import Metrics
+from . import wire
+
+REJECTED = (ValueError, KeyError, TypeError)   # rule errors answered 400 (bad input, not a server fault)
+
+KEEPALIVE_TIMEOUT = 15.0  # seconds an idle keep-alive connection is kept open
+
+class RuleHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.track(self.connection, busy=False)
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            self.server.untrack(self.connection)
+
+    def parse_request(self):
+        # Busy from a received request line until its response is written;
+        # a connection waiting for its next request is idle.
+        self.server.track(self.connection, busy=True)
+        return super().parse_request()
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        finally:
+            self.server.track(self.connection, busy=False)
+
+    def _send(self, status, body, ctype=wire.JSON):
+        self._code = status
+        self.send_response(status)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        if self.server.draining:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, wire.encode({'error': message}))
+
+    def do_GET(self):
+        if self.path == '/stats':
+            return self._send(200, wire.encode(self.server.flight.stats()))
+        if self.path == '/metrics':
+            text = self.server.metrics.render(self.server.flight.inflight())
+            return self._send(200, text.encode('utf-8'), 'text/plain; version=0.0.4')
+        self._error(404, f'unknown path {self.path}')
+
+    def do_POST(self):
+        metrics = self.server.metrics
+        self._op = self._cache = self._code = None
+        metrics.enter()
+        t0 = perf_counter_ns()
+        try:
+            self._apply()
+        finally:
+            metrics.leave()
+            if self._op is not None:
+                metrics.request(self._op, self._code, (perf_counter_ns() - t0) / 1e9, self._cache)
+
+    def _apply(self):
+        runtime = self.server.runtime
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length)
+        url = urlsplit(self.path)
+        try:
+            op = runtime.resolve(url.path)
+        except UnknownOperation:
+            return self._error(404, f'unknown path {url.path}')
+        self._op = op
+        try:
+            ctx = from_fixtures(dict(parse_qsl(url.query)))
+        except (ValueError, TypeError) as e:
+            return self._error(400, f'invalid fixtures: {e}')
+        ctype = wire.media_type(self.headers.get('Content-Type'))
+        if ctype not in wire.supported():
+            return self._error(415, f'unsupported media type {ctype}; expected one of {", ".join(wire.supported())}')
+        try:
+            payload = wire.decode(raw, ctype)
+        except Exception as e:
+            return self._error(400, f'invalid {ctype} body: {e}')
+        if not isinstance(payload, dict):
+            return self._error(400, f'request body must be an object, got {type(payload).__name__}')
+        rid = op.operation_id
+        accept = wire.negotiate(self.headers.get('Accept'))
+        compute = lambda: wire.encode(runtime.apply(rid, payload, ctx), accept)
+        variant = f'{accept}|{ctx.font}|{ctx.staff_size_pt}|{ctx.paper}'
+        tracer = self.server.tracer
+        t0 = perf_counter_ns()
+        try:
+            body, shared = self.server.flight.do(request_key(rid, payload, variant), compute)
+        except RuleNotImplemented:
+            return self._error(501, f'no implementation registered for {rid}')
+        except REJECTED as e:
+            return self._error(400, f'{rid}: {e}')
+        except Exception as e:
+            return self._error(500, f'{rid}: {type(e).__name__}: {e}')
+        self._cache = 'coalesced' if shared else 'computed'
+        if tracer is not None and tracer.sampled():
+            tracer.record(op, t0, perf_counter_ns(), cache=self._cache, cat='service')
+        self._send(200, body, accept)
+
+class RuleServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, runtime=None, tracer=None, sock=None):
+        # sock: an already listening socket (pre-forked workers share the parent's).
+        super().__init__(address, RuleHandler, bind_and_activate=sock is None)
+        if sock is not None:
+            self.socket.close()
+            self.socket = sock
+            self.server_address = sock.getsockname()
+        self.metrics = Metrics()
+        self.tracer = tracer
+        self.runtime = runtime or Runtime()
+        self.runtime.tracer = Fanout(self.metrics, tracer) if tracer else self.metrics
+        self.flight = SingleFlight()
+        self.draining = False
+        self._connections = {}  # socket -> busy
+        self._connections_lock = threading.Lock()
+
+    def track(self, conn, busy):
+        with self._connections_lock:
+            self._connections[conn] = busy
+
+    def untrack(self, conn):
+        with self._connections_lock:
+            self._connections.pop(conn, None)
+
+    def drain(self):
+        """
+        Stop accepting and close keep-alive connections: in-flight requests
+        finish and answer with Connection: close, idle ones are shut now.
+        """
+        self.draining = True
+        self.shutdown()
+        with self._connections_lock:
+            idle = [c for c, busy in self._connections.items() if not busy]
+        for conn in idle:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8080)
+    ap.add_argument('--trace', help='write Chrome trace JSON here on shutdown')
+    ap.add_argument('--trace-sample', type=float, default=1.0, help='fraction of invocations traced')
+    args = ap.parse_args(argv)
+    tracer = Tracer(args.trace_sample) if args.trace else None
+    server = RuleServer((args.host, args.port), tracer=tracer)
+    print(f'Serving {len(server.runtime.implemented())}/{len(server.runtime.operations)} rules on http://{args.host}:{args.port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Coalesced requests: {server.flight.coalesced}")
+        server.server_close()
+        if tracer is not None:
+            tracer.write(args.trace)
+            print(f'Wrote {len(tracer.events)} trace events to {args.trace}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Single-flight execution of identical in-flight rule requests.
+
+Part extraction and score views often post byte-identical payloads to the same
+operation at the same moment. Requests are keyed by a digest of the operationId
+and the canonical JSON form of the payload (sorted keys, compact separators —
+the same canonicalisation the ratified lock uses), so key order and whitespace
+differences still coalesce. The first caller computes; concurrent callers with
+the same key block on that computation and share its result or exception.
+Nothing is cached once the call completes.
+"""
+import json, hashlib, threading
+
+def canonical(payload):
+    return json.dumps(payload, sort_keys=True, separators=(',',':'), ensure_ascii=False)
+
+def request_key(operation_id, payload, variant=''):
+    """Digest of operationId + canonical payload; `variant` separates response encodings."""
+    h = hashlib.sha256(operation_id.encode('utf-8'))
+    h.update(b'\n')
+    h.update(canonical(payload).encode('utf-8'))
+    h.update(b'\n')
+    h.update(variant.encode('utf-8'))
+    return h.hexdigest()
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def inflight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key, fn):
+        """Run `fn()` once per in-flight `key`; returns (result, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self):
+        with self._lock:
+            return {'coalesced': self.coalesced, 'inflight': len(self._calls)}
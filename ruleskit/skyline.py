@@ -0,0 +1,88 @@
+"""
+Outside-staff placement against an incrementally updated skyline.
+
+A `Skyline` is the upper envelope of everything placed so far over a fixed
+set of x coordinates (all item and obstacle edges of a system, known up
+front). It is a segment tree over the elementary x intervals where each node
+keeps the height assigned to its whole range (`tag`) and the maximum over its
+subtree (`top`); raising a range and asking for the maximum over a range are
+both O(log n), with no lazy propagation since heights only ever go up.
+
+`place` works on the grobs of a `ruleskit.grobs.GrobStore`, reading the
+X_extent, Y_extent, outside_staff_priority and outside_staff_padding columns
+in place. It sorts the grobs by outside-staff priority (lower first, i.e.
+closer to the staff; ties keep grob order) and drops each one onto the
+skyline: its bottom goes to max(own bottom, floor, skyline over its x range +
+padding), then its top is added to the skyline for the grobs that follow.
+The shift is written to the grob's Y_offset.
+"""
+from bisect import bisect_left
+import math
+
+class Skyline:
+    def __init__(self, xs):
+        self.xs = sorted(set(xs))
+        n = max(len(self.xs) - 1, 1)
+        self.n = n
+        self.tag = [-math.inf] * (4 * n)
+        self.top = [-math.inf] * (4 * n)
+
+    def _span(self, x1, x2):
+        # zero-width boxes still cover one interval, the last one at the rightmost x
+        lo = min(bisect_left(self.xs, x1), self.n - 1)
+        hi = min(max(bisect_left(self.xs, x2), lo + 1), self.n)
+        return lo, hi
+
+    def raise_to(self, x1, x2, height):
+        lo, hi = self._span(x1, x2)
+        self._raise(1, 0, self.n, lo, hi, height)
+
+    def _raise(self, node, lo, hi, a, b, height):
+        if b <= lo or hi <= a:
+            return
+        if a <= lo and hi <= b:
+            if height > self.tag[node]:
+                self.tag[node] = height
+            if height > self.top[node]:
+                self.top[node] = height
+            return
+        mid = (lo + hi) // 2
+        self._raise(2 * node, lo, mid, a, b, height)
+        self._raise(2 * node + 1, mid, hi, a, b, height)
+        self.top[node] = max(self.top[node], self.top[2 * node], self.top[2 * node + 1])
+
+    def height(self, x1, x2):
+        lo, hi = self._span(x1, x2)
+        return self._height(1, 0, self.n, lo, hi)
+
+    def _height(self, node, lo, hi, a, b):
+        if b <= lo or hi <= a:
+            return -math.inf
+        if a <= lo and hi <= b:
+            return self.top[node]
+        mid = (lo + hi) // 2
+        return max(self.tag[node], self._height(2 * node, lo, mid, a, b), self._height(2 * node + 1, mid, hi, a, b))
+
+def place(store, obstacles=(), floors=None):
+    """
+    store: GrobStore whose grobs all have X_extent, Y_extent,
+    outside_staff_priority and outside_staff_padding set; obstacles:
+    [(x1, x2, top)] already on the staff; floors: lowest bottom per grob
+    (default none). Returns the Y_offset column (upward shift per grob, >= 0).
+    """
+    n = len(store)
+    x_ext, y_ext = store.column('X_extent'), store.column('Y_extent')
+    priority, padding = store.column('outside_staff_priority'), store.column('outside_staff_padding')
+    offsets = store.column('Y_offset')
+    xs = x_ext.tolist() + [x for o in obstacles for x in o[:2]]
+    sky = Skyline(xs or [0.0, 1.0])
+    for x1, x2, top in obstacles:
+        sky.raise_to(x1, x2, top)
+    for i in sorted(range(n), key=priority.__getitem__):
+        x1, x2, y, top, pad = x_ext[2 * i], x_ext[2 * i + 1], y_ext[2 * i], y_ext[2 * i + 1], padding[i]
+        floor = -math.inf if floors is None else floors[i]
+        # shift relative to the box so a padding comes out exact, not via y + padding - y
+        shift = max(0.0, floor - y + pad, sky.height(x1, x2) - y + pad)
+        offsets[i] = shift
+        sky.raise_to(x1, x2, top + shift)
+    return offsets
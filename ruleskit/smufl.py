@@ -0,0 +1,186 @@
+"""
+Compact, memory-mapped SMuFL glyph metrics for whitelisted glyphs.
+
+`scripts/build_smufl_table.py` compiles a font's metadata JSON into a
+fixed-layout little-endian table; `load_table` mmaps it read-only so every
+worker process shares the same pages, and lookups index straight into the
+mapped float64 records.
+
+Layout (version 1):
+  header   '<4sHHHII'  magic b'SMFL', version, glyph_count, anchor_count,
+                       names_size, records_offset
+  names    UTF-8, '\\n'-joined: glyph names (id order) then anchor names
+  records  glyph_count x (6 + 2 x anchor_count) float64, 8-byte aligned:
+           advance, bbox SW x/y, bbox NE x/y, thickness, then (x, y) per anchor
+Missing values are NaN. Glyph ids follow smufl/whitelist.json order.
+
+`field` resolves the REGISTRY's smufl_inputs entries: advance, bbox,
+baseline (origin height above the bbox bottom, from bbox SW y), thickness
+and stroke (the same engraving-default line weight), anchors.<name>.
+"""
+import json, math, mmap, struct, sys
+from array import array
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+WHITELIST = ROOT / 'smufl' / 'whitelist.json'
+
+MAGIC = b'SMFL'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHII')
+ADVANCE, SW_X, SW_Y, NE_X, NE_Y, THICKNESS = range(6)
+BASE_FIELDS = 6
+FIELDS = ('advance', 'bbox', 'baseline', 'thickness', 'stroke')  # plus anchors.<name> / anchor.<name>
+NAN = float('nan')
+
+# Whitelisted glyphs whose thickness (line weight; `stroke`) comes from
+# engravingDefaults: pseudo-glyphs drawn as lines, and noteheads, whose stroke
+# is the stem drawn with them.
+THICKNESS_DEFAULTS = {
+    'noteheadBlack': 'stemThickness',
+    'noteheadHalf': 'stemThickness',
+    'noteheadWhole': 'stemThickness',
+    'beam': 'beamThickness',
+    'staffLine': 'staffLineThickness',
+    'ledgerLine': 'legerLineThickness',
+    'barlineSingle': 'thinBarlineThickness',
+    'barlineDouble': 'thinBarlineThickness',
+    'barlineFinal': 'thickBarlineThickness',
+    'hairpinCrescendo': 'hairpinThickness',
+    'hairpinDecrescendo': 'hairpinThickness',
+}
+
+def whitelisted_glyphs():
+    return json.loads(WHITELIST.read_text())['glyphs']
+
+def _per_glyph(meta):
+    """Normalise font metadata into {glyph: {advance, bbox(sw, ne), anchors}}.
+
+    Accepts standard SMuFL font metadata (glyphAdvanceWidths, glyphBBoxes,
+    glyphsWithAnchors) or a list of records per schemas/smufl.metadata.schema.json.
+    """
+    out = {}
+    if isinstance(meta, list):
+        for g in meta:
+            b = g.get('bbox')
+            out[g['name']] = {
+                'advance': g.get('advance'),
+                'bbox': ((b['x'], b['y']), (b['x'] + b['w'], b['y'] + b['h'])) if b else None,
+                'anchors': g.get('anchors') or {},
+            }
+        return out
+    for name, adv in (meta.get('glyphAdvanceWidths') or {}).items():
+        out.setdefault(name, {})['advance'] = adv
+    for name, b in (meta.get('glyphBBoxes') or {}).items():
+        out.setdefault(name, {})['bbox'] = (tuple(b['bBoxSW']), tuple(b['bBoxNE']))
+    for name, anchors in (meta.get('glyphsWithAnchors') or {}).items():
+        out.setdefault(name, {})['anchors'] = anchors
+    return out
+
+def compile_table(meta, glyphs=None):
+    """Return the binary table for `meta` restricted to `glyphs` (whitelist by default)."""
+    glyphs = list(glyphs or whitelisted_glyphs())
+    per = _per_glyph(meta)
+    defaults = (meta.get('engravingDefaults') or {}) if isinstance(meta, dict) else {}
+    anchor_names = sorted({a for g in glyphs for a in (per.get(g, {}).get('anchors') or {})})
+    aidx = {a: i for i, a in enumerate(anchor_names)}
+    stride = BASE_FIELDS + 2 * len(anchor_names)
+    recs = array('d', [NAN]) * (len(glyphs) * stride)
+    for gid, name in enumerate(glyphs):
+        g = per.get(name, {})
+        base = gid * stride
+        if g.get('advance') is not None:
+            recs[base + ADVANCE] = g['advance']
+        if g.get('bbox'):
+            (swx, swy), (nex, ney) = g['bbox']
+            recs[base + SW_X:base + NE_Y + 1] = array('d', [swx, swy, nex, ney])
+        if THICKNESS_DEFAULTS.get(name) in defaults:
+            recs[base + THICKNESS] = defaults[THICKNESS_DEFAULTS[name]]
+        for a, (x, y) in (g.get('anchors') or {}).items():
+            off = base + BASE_FIELDS + 2 * aidx[a]
+            recs[off] = x
+            recs[off + 1] = y
+    if sys.byteorder != 'little':
+        recs.byteswap()
+    names = '\n'.join(glyphs + anchor_names).encode('utf-8')
+    pad = -(HEADER.size + len(names)) % 8
+    records_offset = HEADER.size + len(names) + pad
+    header = HEADER.pack(MAGIC, VERSION, len(glyphs), len(anchor_names), len(names), records_offset)
+    return header + names + b'\0' * pad + recs.tobytes()
+
+class GlyphTable:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, na, names_size, roff = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path}: not a SMuFL table (version {VERSION})')
+        names = self._mm[HEADER.size:HEADER.size + names_size].decode('utf-8').split('\n') if names_size else []
+        self.glyphs = names[:n]
+        self.anchor_names = names[n:n + na]
+        self.ids = {g: i for i, g in enumerate(self.glyphs)}
+        self._anchor = {a: i for i, a in enumerate(self.anchor_names)}
+        self._stride = BASE_FIELDS + 2 * na
+        if sys.byteorder == 'little':
+            self._f = memoryview(self._mm)[roff:roff + 8 * n * self._stride].cast('d')
+        else:
+            self._f = array('d', self._mm[roff:roff + 8 * n * self._stride])
+            self._f.byteswap()
+
+    def glyph_id(self, glyph):
+        return glyph if isinstance(glyph, int) else self.ids[glyph]
+
+    def _value(self, glyph, k):
+        v = self._f[self.glyph_id(glyph) * self._stride + k]
+        return None if math.isnan(v) else v
+
+    def advance(self, glyph):
+        return self._value(glyph, ADVANCE)
+
+    def thickness(self, glyph):
+        return self._value(glyph, THICKNESS)
+
+    stroke = thickness
+
+    def baseline(self, glyph):
+        """Height of the baseline (the glyph origin) above the bbox bottom, or None."""
+        swy = self._value(glyph, SW_Y)
+        return None if swy is None else -swy
+
+    def bbox(self, glyph):
+        """Bounding box as a BBox dict (x, y, w, h) in staff spaces, or None."""
+        base = self.glyph_id(glyph) * self._stride
+        swx, swy, nex, ney = self._f[base + SW_X:base + NE_Y + 1]
+        if math.isnan(swx):
+            return None
+        return {'x': swx, 'y': swy, 'w': nex - swx, 'h': ney - swy}
+
+    def anchor(self, glyph, name):
+        a = self._anchor.get(name)
+        if a is None:
+            return None
+        off = self.glyph_id(glyph) * self._stride + BASE_FIELDS + 2 * a
+        x, y = self._f[off], self._f[off + 1]
+        return None if math.isnan(x) else (x, y)
+
+    def field(self, entry):
+        """Resolve a REGISTRY smufl_inputs entry such as 'noteheadBlack.advance'."""
+        glyph, _, fld = entry.partition('.')
+        if glyph not in self.ids:
+            raise ValueError(f'{entry}: glyph {glyph!r} is not in the table (see smufl/whitelist.json)')
+        if fld in FIELDS:
+            return getattr(self, fld)(glyph)
+        if fld.startswith(('anchors.', 'anchor.')):
+            return self.anchor(glyph, fld.split('.', 1)[1])
+        raise ValueError(f'{entry}: unsupported field {fld!r}; expected one of '
+                         f'{", ".join(FIELDS)}, anchors.<name>')
+
+_TABLES = {}
+
+def load_table(path):
+    """Map a compiled table once per process (forked children share the mapping)."""
+    key = str(Path(path).resolve())
+    table = _TABLES.get(key)
+    if table is None:
+        table = _TABLES[key] = GlyphTable(key)
+    return table
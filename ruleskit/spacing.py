@@ -0,0 +1,120 @@
+"""
+Horizontal spacing and line justification.
+
+Durations map to ideal column distances the usual way: the shortest note in
+a line gets SHORTEST_DURATION_SPACE increments of SPACING_INCREMENT_SP, and
+each doubling of duration adds one increment. Gaps between columns are
+springs whose stiffness is the inverse of that ideal distance, so stretching
+a line widens long notes more than short ones, in proportion.
+
+`LineBatch` packs the gaps of many lines (a whole score) into ragged flat
+arrays — ideal, rod (minimum) and 1/stiffness per gap, target width per
+line — and `justify` solves every line in one plain Python loop over those
+arrays (NumPy is not a dependency, so nothing here is vectorized; the packing
+only saves per-line objects). The force per line is closed form,
+
+    F = (target - sum ideal) / sum (1 / stiffness)
+
+which is exact whenever no gap is pushed below its rod (any stretched line,
+since ideals never start below rods). Only lines that have to be compressed
+onto their rods (accidental lead-ins, minimum column gaps) fall back to the
+spring/rod selection in `ruleskit.springs`.
+"""
+from array import array
+import math
+
+from .springs import SpringChain
+
+SPACING_INCREMENT_SP = 1.2
+SHORTEST_DURATION_SPACE = 2.0
+DURATIONS = {'w': 1.0, 'h': 0.5, 'q': 0.25, 'e': 0.125, 's': 0.0625, 't': 0.03125, 'x': 0.015625}
+
+def ideal_distances(durations, scalar=1.0):
+    """Ideal left-edge-to-left-edge distance per column, in sp."""
+    try:
+        lengths = [DURATIONS[d] if isinstance(d, str) else float(d) for d in durations]
+    except KeyError as e:
+        raise ValueError(f'unknown duration {e.args[0]!r}; expected one of {", ".join(DURATIONS)}') from None
+    for d in lengths:
+        if not 0 < d < math.inf:
+            raise ValueError(f'durations must be positive and finite, got {d!r}')
+    shortest = min(lengths)
+    return [scalar * SPACING_INCREMENT_SP * (SHORTEST_DURATION_SPACE + math.log2(d / shortest)) for d in lengths]
+
+class LineBatch:
+    """Line l owns gaps offsets[l]:offsets[l+1]; its gaps must fill target[l] (None: natural)."""
+
+    def __init__(self):
+        self.offsets = array('q', [0])
+        self.ideal = array('d')
+        self.rod = array('d')
+        self.inv = array('d')
+        self.start = array('d')   # position of the line's first column
+        self.fixed = array('d')   # column widths, not stretchable
+        self.targets = []
+
+    def __len__(self):
+        return len(self.targets)
+
+    def add(self, ideals, rods, widths, target=None, start=0.0, stiffness=None):
+        """widths: one per column (len(ideals) + 1); ideals/rods/stiffness per gap."""
+        n = len(ideals)
+        if len(rods) != n or len(widths) != n + 1:
+            raise ValueError(f'{n} gaps need {n} rods and {n + 1} column widths')
+        for i in range(n):
+            ideal, rod = float(ideals[i]), float(rods[i])
+            self.ideal.append(max(ideal, rod))
+            self.rod.append(rod)
+            k = stiffness[i] if stiffness is not None else 1.0 / max(ideal, rod, 1e-9)
+            if not k > 0:
+                raise ValueError('spring stiffness must be positive')
+            self.inv.append(1.0 / k)
+        self.fixed.extend(float(w) for w in widths)
+        self.offsets.append(len(self.ideal))
+        self.start.append(float(start))
+        self.targets.append(target)
+        return len(self.targets) - 1
+
+class Justified:
+    def __init__(self, batch, lengths, forces):
+        self.batch = batch
+        self.lengths = lengths   # array('d'): solved gap lengths, flat like the batch
+        self.forces = forces
+
+    def positions(self, line):
+        """Left edge of every column of the line."""
+        b = self.batch
+        lo, hi = b.offsets[line], b.offsets[line + 1]
+        x = b.start[line]
+        out = [x]
+        for i in range(lo, hi):
+            x += b.fixed[i + line] + self.lengths[i]
+            out.append(x)
+        return out
+
+    def gaps(self, line):
+        b = self.batch
+        return list(self.lengths[b.offsets[line]:b.offsets[line + 1]])
+
+def justify(batch):
+    lengths = array('d', batch.ideal)
+    forces = array('d', bytes(8 * len(batch)))
+    ideal, rod, inv, fixed = batch.ideal, batch.rod, batch.inv, batch.fixed
+    for line, target in enumerate(batch.targets):
+        if target is None:
+            continue
+        lo, hi = batch.offsets[line], batch.offsets[line + 1]
+        if lo == hi:
+            continue
+        # Line l's column widths sit at fixed[lo + l : hi + l + 1].
+        room = target - batch.start[line] - sum(fixed[lo + line:hi + line + 1])
+        inv_sum = sum(inv[lo:hi])
+        force = (room - sum(ideal[lo:hi])) / inv_sum
+        if force < 0:
+            chain = SpringChain(rod[lo:hi], ideal[lo:hi], [1.0 / k for k in inv[lo:hi]], room)
+            force = chain.solve()
+            lengths[lo:hi] = array('d', chain.lengths())
+        else:
+            lengths[lo:hi] = array('d', [d + force * k for d, k in zip(ideal[lo:hi], inv[lo:hi])])
+        forces[line] = force
+    return Justified(batch, lengths, forces)
@@ -0,0 +1,157 @@
+"""
+Breaking spanners (ottava, pedal, trill, text spanner, volta, glissando,
+duration line, ...) at system breaks.
+
+Spanners are column ranges [start, end]. `systemBreaks` are the columns that
+start a new system (as returned by RULE.Spacing.keep_inside_system_constraints),
+so a spanner is broken at break b exactly when start < b <= end.
+
+`SpannerIndex` keeps every spanner of a score in one static interval tree:
+spanners sorted by start, with the maximum end of each subtree stored at its
+midpoint (an implicit, balanced BST over the sorted array). `segments`
+breaks everything in one sweep — spanners in start order against the sorted
+breaks — and caches the pieces per spanner. `rebreak` diffs the old and new
+breaks; only spanners stabbed by a changed boundary (O(log n + k) per
+boundary) are re-split, everything else keeps its cached segments.
+
+Each piece carries its bound paddings: an end at the spanner's own start or
+end column uses the kind's bound padding, an end at a system break (a
+continuation) uses the broken padding, which leaves room for the clef and
+key signature on the left and the barline side on the right.
+"""
+from bisect import bisect_right
+from collections import namedtuple
+
+Segment = namedtuple('Segment', 'start end broken_left broken_right left_padding right_padding')
+
+BOUND_PADDING_SP = 0.0
+BROKEN_LEFT_PADDING_SP = 1.0
+BROKEN_RIGHT_PADDING_SP = 0.5
+
+# kind -> (left bound, right bound, broken left, broken right) paddings in sp
+PADDINGS = {
+    'default': (BOUND_PADDING_SP, BOUND_PADDING_SP, BROKEN_LEFT_PADDING_SP, BROKEN_RIGHT_PADDING_SP),
+    'ottava': (0.0, 0.5, 1.5, 0.5),       # continuation repeats the "(8)" text
+    'pedal': (0.0, 0.25, 1.0, 0.0),
+    'trill': (0.0, 0.5, 1.5, 0.5),
+    'textSpanner': (0.0, 0.25, 1.0, 0.5),
+    'volta': (0.0, 0.0, 0.0, 0.0),        # brackets meet the barlines
+    'glissando': (0.5, 0.5, 1.0, 0.5),
+    'durationLine': (0.25, 0.0, 1.0, 0.0),
+}
+
+class SpannerIndex:
+    def __init__(self, spanners=()):
+        """spanners: iterable of (start, end) or (start, end, kind)."""
+        self.starts, self.ends, self.kinds = [], [], []
+        for sp in spanners:
+            self.add(*sp)
+        self._tree = None
+        self._breaks = None
+        self._cache = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, start, end, kind='default'):
+        if end < start:
+            raise ValueError(f'spanner ends (column {end}) before it starts (column {start})')
+        if kind not in PADDINGS:
+            raise ValueError(f'unknown spanner kind {kind!r}; expected one of {", ".join(PADDINGS)}')
+        self.starts.append(start)
+        self.ends.append(end)
+        self.kinds.append(kind)
+        self._tree = self._cache = None
+        return len(self.starts) - 1
+
+    def _build(self):
+        order = sorted(range(len(self.starts)), key=lambda i: self.starts[i])
+        starts = [self.starts[i] for i in order]
+        ends = [self.ends[i] for i in order]
+        maxend = [0] * len(order)
+
+        def fill(lo, hi):
+            if lo >= hi:
+                return -1
+            mid = (lo + hi) // 2
+            maxend[mid] = max(ends[mid], fill(lo, mid), fill(mid + 1, hi))
+            return maxend[mid]
+
+        fill(0, len(order))
+        self._tree = (order, starts, ends, maxend)
+
+    def stab(self, column):
+        """Spanners broken by a system starting at `column` (start < column <= end)."""
+        if self._tree is None:
+            self._build()
+        order, starts, ends, maxend = self._tree
+        out = []
+        stack = [(0, len(order))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if maxend[mid] < column:
+                continue
+            stack.append((lo, mid))
+            if starts[mid] < column:
+                if ends[mid] >= column:
+                    out.append(order[mid])
+                stack.append((mid + 1, hi))
+        return out
+
+    def _split(self, i, breaks):
+        start, end = self.starts[i], self.ends[i]
+        bound_l, bound_r, broken_l, broken_r = PADDINGS[self.kinds[i]]
+        k = bisect_right(breaks, start)
+        pieces, lo = [], start
+        while k < len(breaks) and breaks[k] <= end:
+            b = breaks[k]
+            pieces.append(Segment(lo, b - 1, lo != start, True, bound_l if lo == start else broken_l, broken_r))
+            lo, k = b, k + 1
+        pieces.append(Segment(lo, end, lo != start, False, bound_l if lo == start else broken_l, bound_r))
+        return pieces
+
+    def segments(self, breaks):
+        """Pieces per spanner (in insertion order) for these breaks, in one sweep."""
+        breaks = sorted(set(breaks))
+        if self._tree is None:
+            self._build()
+        order = self._tree[0]
+        cache = [None] * len(order)
+        k = 0
+        for i in order:
+            start, end = self.starts[i], self.ends[i]
+            while k < len(breaks) and breaks[k] <= start:
+                k += 1
+            if k == len(breaks) or breaks[k] > end:
+                bound_l, bound_r, _, _ = PADDINGS[self.kinds[i]]
+                cache[i] = [Segment(start, end, False, False, bound_l, bound_r)]
+            else:
+                cache[i] = self._split(i, breaks)
+        self._breaks, self._cache = breaks, cache
+        return cache
+
+    def rebreak(self, breaks):
+        """Re-split only spanners crossing a boundary that changed; returns their ids."""
+        breaks = sorted(set(breaks))
+        if self._cache is None:
+            self.segments(breaks)
+            return list(range(len(self)))
+        changed = set(breaks).symmetric_difference(self._breaks)
+        dirty = set()
+        for column in changed:
+            dirty.update(self.stab(column))
+        for i in dirty:
+            self._cache[i] = self._split(i, breaks)
+        self._breaks = breaks
+        return sorted(dirty)
+
+    def pieces(self, i):
+        """Cached segments of spanner i under the current breaks."""
+        return self._cache[i]
+
+    def system_of(self, column):
+        """Index of the system containing a column under the current breaks."""
+        return bisect_right(self._breaks or [], column)
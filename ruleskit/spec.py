@@ -0,0 +1,91 @@
+"""
+Operation table derived from openapi/rules-as-functions.typed.yaml.
+Each entry carries what the runtime needs per operationId: path, agent, status,
+priority, trace anchors, the typed request/response component names and the
+rule parameters.
+
+`scripts/build_openapi_typed.py` also writes the table, plus a digest of each
+referenced component schema with its $refs resolved, to the precompiled
+index openapi/rules-as-functions.index.json (`compile_index`). The runtime
+loads only that index (`load_index`), so starting up does not parse the typed
+YAML; `lint_typed_openapi.py` fails when the index is stale.
+"""
+from collections import namedtuple
+from pathlib import Path
+import hashlib
+import json
+
+ROOT = Path(__file__).resolve().parents[1]
+TYPED = ROOT / 'openapi' / 'rules-as-functions.typed.yaml'
+INDEX = ROOT / 'openapi' / 'rules-as-functions.index.json'
+
+Operation = namedtuple('Operation', 'operation_id path agent status priority trace request response parameters')
+
+def _component(node):
+    ref = ((node or {}).get('content', {}).get('application/json', {}).get('schema') or {}).get('$ref', '')
+    return ref.split('/')[-1] or None
+
+def _load_yaml(path):
+    import yaml
+    return yaml.load(Path(path).read_text(), Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+def _resolve(schema, comps, seen=()):
+    if isinstance(schema, dict):
+        ref = schema.get('$ref', '')
+        if ref.startswith('#/components/schemas/'):
+            name = ref.split('/')[-1]
+            if name in comps and name not in seen:
+                return _resolve(comps[name], comps, seen + (name,))
+            return schema
+        return {k: _resolve(v, comps, seen) for k, v in schema.items()}
+    if isinstance(schema, list):
+        return [_resolve(v, comps, seen) for v in schema]
+    return schema
+
+def schema_digest(name, comps):
+    """sha256 of the component schema with its $refs resolved (canonical JSON)."""
+    data = json.dumps(_resolve(comps[name], comps, (name,)), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def load_components(path=TYPED):
+    doc = _load_yaml(path)
+    return (doc.get('components') or {}).get('schemas') or {}
+
+def _operations(doc):
+    ops = {}
+    for p, item in (doc.get('paths') or {}).items():
+        post = item.get('post') or {}
+        xr = post.get('x-rule') or {}
+        rid = post['operationId']
+        ops[rid] = Operation(
+            operation_id=rid,
+            path=p,
+            agent=xr.get('agent'),
+            status=xr.get('status', 'provisional'),
+            priority=xr.get('priority'),
+            trace=tuple(xr.get('trace') or ()),
+            request=_component(post.get('requestBody')),
+            response=_component((post.get('responses') or {}).get('200')),
+            parameters=xr.get('parameters') or {},
+        )
+    return ops
+
+def compile_index(doc):
+    """Typed spec document -> JSON-serialisable precompiled index."""
+    comps = (doc.get('components') or {}).get('schemas') or {}
+    ops = _operations(doc)
+    names = sorted({n for op in ops.values() for n in (op.request, op.response) if n in comps})
+    return {
+        'version': 1,
+        'operations': {rid: dict(op._asdict(), trace=list(op.trace)) for rid, op in sorted(ops.items())},
+        'schemas': {n: schema_digest(n, comps) for n in names},
+    }
+
+def load_index(path=INDEX):
+    with open(path, encoding='utf-8') as f:
+        index = json.load(f)
+    return {rid: Operation(**dict(entry, trace=tuple(entry['trace']))) for rid, entry in index['operations'].items()}
+
+def load_operations(path=TYPED):
+    """Operation table parsed from the typed YAML (tooling; the runtime uses `load_index`)."""
+    return _operations(_load_yaml(path))
@@ -0,0 +1,199 @@
+"""
+Springs and rods along one axis (a system's staves, a line's columns).
+
+Gap i of a `SpringChain` is a spring with an ideal length and a stiffness,
+and a rod that it may not be compressed below. Under a common force F (> 0
+stretches, < 0 compresses) gap i is
+
+    length_i(F) = max(rod_i, ideal_i + F / stiffness_i)
+
+so each gap has a breakpoint b_i = (rod_i - ideal_i) * stiffness_i: for F
+below it the rod holds the gap, above it the spring does. Fitting the chain
+to a target length means solving sum length_i(F) = target for F. `solve`
+does that by selection over the breakpoints (quickselect-style partitioning
+with running sums of the settled gaps), expected O(n) with no sort. Without a
+target the force is 0 and every gap is max(rod, ideal).
+
+The chain keeps the partition sums of its last solve. `update` changes one
+gap and re-solves incrementally: the force is recomputed from the sums, and a
+sorted copy of the breakpoints (built on the first update) moves the
+partition one crossed breakpoint at a time, O(log n) each — usually none or
+one, since one gap barely moves the force of a long chain. The partition is
+an index into that sorted copy (springs before it, rods from it on), so gaps
+with equal breakpoints can sit on either side of it.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+import math
+import random
+
+EPSILON = 1e-12
+
+class SpringChain:
+    def __init__(self, rods, ideals, stiffness=None, target=None):
+        n = len(rods)
+        if len(ideals) != n:
+            raise ValueError(f'{n} rods but {len(ideals)} ideal lengths')
+        self.rods = array('d', rods)
+        self.ideals = array('d', ideals)
+        self.inv = array('d', (1.0 / k for k in stiffness) if stiffness is not None else [1.0] * n)
+        if any(not v > 0 for v in self.inv):
+            raise ValueError('spring stiffness must be positive')
+        self.target = target
+        self.force = 0.0
+        self._sorted = None   # [(breakpoint, gap)] ascending, once an update needs it
+        self._split = -math.inf   # after a full solve: springs are the gaps breaking at or below it
+        self._k = 0               # springs are _sorted[:_k]
+        self._sums = None   # (sum of rod-held rods, sum of spring ideals, sum of spring 1/k)
+
+    def __len__(self):
+        return len(self.rods)
+
+    def breakpoint(self, i):
+        return (self.rods[i] - self.ideals[i]) / self.inv[i]
+
+    def length(self, i):
+        return max(self.rods[i], self.ideals[i] + self.force * self.inv[i])
+
+    def lengths(self):
+        f, rods, ideals, inv = self.force, self.rods, self.ideals, self.inv
+        return [max(r, d + f * k) for r, d, k in zip(rods, ideals, inv)]
+
+    def positions(self, start=0.0):
+        """Running sums of the gap lengths: n + 1 positions from `start`."""
+        out = [start]
+        for length in self.lengths():
+            start += length
+            out.append(start)
+        return out
+
+    def solve(self):
+        if self.target is None:
+            self.force = 0.0
+            return self.force
+        self._select()
+        return self.force
+
+    def _force_from(self, rod_sum, ideal_sum, inv_sum, rods_only):
+        if inv_sum <= 0:
+            return rods_only
+        return (self.target - rod_sum - ideal_sum) / inv_sum
+
+    def _select(self):
+        rods, ideals, inv, target = self.rods, self.ideals, self.inv, self.target
+        cand = list(range(len(rods)))
+        rod_sum = ideal_sum = inv_sum = 0.0
+        lo = -math.inf   # largest breakpoint known to be at or below F
+        hi = math.inf    # smallest breakpoint known to be above F
+        rng = random.Random(len(cand))
+        while cand:
+            p = self.breakpoint(cand[rng.randrange(len(cand))])
+            total = rod_sum + ideal_sum + p * inv_sum
+            for i in cand:
+                total += max(rods[i], ideals[i] + p * inv[i])
+            below, above = [], []
+            for i in cand:
+                (below if self.breakpoint(i) <= p else above).append(i)
+            if total > target + EPSILON:
+                # F < p: gaps breaking at or above p are held by their rods.
+                for i in above:
+                    rod_sum += rods[i]
+                cand = [i for i in below if self.breakpoint(i) < p]
+                rod_sum += sum(rods[i] for i in below if self.breakpoint(i) >= p)
+                hi = min(hi, p)
+            else:
+                # F >= p: gaps breaking at or below p are springs.
+                for i in below:
+                    ideal_sum += ideals[i]
+                    inv_sum += inv[i]
+                lo = max(lo, p)
+                cand = above
+        self._sums = (rod_sum, ideal_sum, inv_sum)
+        self._split = lo
+        if self._sorted is not None:
+            self._k = bisect_right(self._sorted, (lo, math.inf))
+        # Overfull (every gap on its rod): the largest force that keeps them there.
+        self.force = self._force_from(rod_sum, ideal_sum, inv_sum, hi)
+        if inv_sum > 0:
+            self.force = min(max(self.force, lo), hi)
+
+    def update(self, i, rod=None, ideal=None, stiffness=None):
+        """Change gap i and re-solve; returns the new force."""
+        if self.target is None or self._sums is None or self._sums[2] <= 0:
+            self._set(i, rod, ideal, stiffness)
+            self._sorted = None
+            return self.solve()
+        order = self._order()
+        k = self._k
+        rod_sum, ideal_sum, inv_sum = self._sums
+        at = bisect_left(order, (self.breakpoint(i), i))
+        if at < k:
+            ideal_sum -= self.ideals[i]
+            inv_sum -= self.inv[i]
+            k -= 1
+        else:
+            rod_sum -= self.rods[i]
+        del order[at]
+        self._set(i, rod, ideal, stiffness)
+        at = bisect_left(order, (self.breakpoint(i), i))
+        order.insert(at, (self.breakpoint(i), i))
+        if at < k:
+            ideal_sum += self.ideals[i]
+            inv_sum += self.inv[i]
+            k += 1
+        else:
+            rod_sum += self.rods[i]   # at the split it starts as a rod; the walk settles it
+        return self._walk(rod_sum, ideal_sum, inv_sum, k)
+
+    def retarget(self, target):
+        """Change the target length and re-solve from the last partition."""
+        self.target = target
+        if target is None or self._sums is None or self._sums[2] <= 0:
+            return self.solve()
+        self._order()
+        return self._walk(*self._sums, self._k)
+
+    def _order(self):
+        if self._sorted is None:
+            self._sorted = sorted((self.breakpoint(j), j) for j in range(len(self)))
+            self._k = bisect_right(self._sorted, (self._split, math.inf))
+        return self._sorted
+
+    def _walk(self, rod_sum, ideal_sum, inv_sum, k):
+        # Move the split towards the new force one gap at a time; each step is
+        # exact (the nearest crossed gap really changes side).
+        order = self._sorted
+        while True:
+            if inv_sum <= 0:
+                self._select()
+                return self.force
+            force = self._force_from(rod_sum, ideal_sum, inv_sum, None)
+            if k < len(order) and order[k][0] <= force:
+                j = order[k][1]
+                rod_sum -= self.rods[j]
+                ideal_sum += self.ideals[j]
+                inv_sum += self.inv[j]
+                k += 1
+            elif k > 0 and order[k - 1][0] > force:
+                j = order[k - 1][1]
+                rod_sum += self.rods[j]
+                ideal_sum -= self.ideals[j]
+                inv_sum -= self.inv[j]
+                k -= 1
+            else:
+                break
+        self._sums = (rod_sum, ideal_sum, inv_sum)
+        self._k = k
+        self._split = order[k - 1][0] if k else -math.inf
+        self.force = force
+        return self.force
+
+    def _set(self, i, rod, ideal, stiffness):
+        if rod is not None:
+            self.rods[i] = rod
+        if ideal is not None:
+            self.ideals[i] = ideal
+        if stiffness is not None:
+            if not stiffness > 0:
+                raise ValueError('spring stiffness must be positive')
+            self.inv[i] = 1.0 / stiffness
@@ -0,0 +1,145 @@
+"""
+Deterministic synthetic score workloads for load testing.
+
+`generate` walks a synthetic score system by system (measures x staves) and
+yields `{"operationId", "input", "fixtures"}` records for the spacing,
+beaming, collision, lyrics, vertical and pagination rules — the same record
+shape `ruleskit.batch` consumes. The full mix is generated whether or not
+the runtime implements each operation yet; consumers skip the ones it
+answers with RuleNotImplemented (501). Each system
+draws from its own RNG seeded by (seed, system index), so output is
+reproducible, any system range can be regenerated independently, and only
+one system is ever held in memory.
+
+Knobs: staves, measures, measures_per_system, systems_per_page, events per
+measure (note density) and per-note probabilities for lyrics, dynamics and
+fingerings.
+"""
+import random
+
+FIXTURES = {'font': 'Bravura', 'staffSize': '20pt', 'paper': 'A4'}
+DURATIONS = ('w', 'h', 'q', 'e', 's')
+DURATION_WEIGHTS = (1, 3, 10, 8, 3)
+BEAMED = ('e', 's')
+STAFF_HEIGHT_SP = 4.0
+LINE_WIDTH_SP = 180.0
+
+def _rec(rid, payload):
+    return {'operationId': rid, 'input': payload, 'fixtures': FIXTURES}
+
+def _bbox(rnd, x, y, w, h):
+    return {'x': round(x, 3), 'y': round(y, 3), 'w': round(w * rnd.uniform(0.8, 1.2), 3), 'h': round(h * rnd.uniform(0.8, 1.2), 3)}
+
+def _staff_line(rnd, measures, events_per_measure):
+    """Events of one staff across a system: (duration, staff position, stem)."""
+    events = []
+    for _ in range(measures):
+        n = max(1, int(rnd.gauss(events_per_measure, events_per_measure / 4)))
+        for _ in range(n):
+            d = rnd.choices(DURATIONS, DURATION_WEIGHTS)[0]
+            pos = rnd.randint(-6, 6) * 0.5
+            events.append((d, pos, 'up' if pos < 0 else 'down'))
+    return events
+
+def system_records(seed, system, staves=4, measures_per_system=4, events_per_measure=6,
+                   lyrics=0.3, dynamics=0.1, fingering=0.1):
+    rnd = random.Random(f'{seed}:{system}')
+    staff_boxes = []
+    column_widths = None
+    for staff in range(staves):
+        events = _staff_line(rnd, measures_per_system, events_per_measure)
+        n = len(events)
+        pre = ['accidental' if rnd.random() < 0.15 else 'none' for _ in range(n)]
+        post = [rnd.choice(('stacc', 'accent')) if rnd.random() < 0.1 else 'none' for _ in range(n)]
+        yield _rec('RULE.Spacing.duration_base_with_optical_corrections', {
+            'durations': [e[0] for e in events],
+            'stems': [e[2] for e in events],
+            'preItems': pre,
+            'postItems': post,
+            'noteheadWidths': [1.18 if e[0] != 'w' else 1.62 for e in events],
+        })
+        if column_widths is None:
+            column_widths = [round(1.5 + rnd.uniform(0.0, 2.5), 3) for _ in range(n)]
+        # Beam groups: runs of 2-4 consecutive beamable notes.
+        run = []
+        for e in events + [('q', 0.0, 'up')]:
+            if e[0] in BEAMED and len(run) < 4:
+                run.append(e)
+                continue
+            if len(run) >= 2:
+                yield _rec('RULE.Beaming.geometry_slope_and_segments', {
+                    'notePositionsSP': [r[1] for r in run],
+                    'stemDirections': [r[2] for r in run],
+                    'beamThicknessSP': 0.5,
+                })
+            run = [e] if e[0] in BEAMED else []
+        # Outside-staff items under/over this staff.
+        grobs, prox, syllables = [], [], []
+        for i in range(n):
+            has_lyric = rnd.random() < lyrics
+            has_dyn = rnd.random() < dynamics
+            if rnd.random() < fingering:
+                grobs.append('fingering')
+                prox.append(round(rnd.uniform(0.0, 1.5), 3))
+                if has_dyn:
+                    yield _rec('RULE.Collision.fingering_vs_dynamics_priority', {
+                        'dynamicsBBox': _bbox(rnd, i * 2.0, -6.0, 2.2, 1.2),
+                        'minClearanceSP': 0.3,
+                    })
+            if has_lyric:
+                grobs.append('lyric')
+                prox.append(round(rnd.uniform(0.0, 1.5), 3))
+                syllables.append(_bbox(rnd, i * 2.0, -0.3, 1.8, 1.5))
+            if has_dyn:
+                grobs.append('dynamic')
+                prox.append(round(rnd.uniform(0.0, 1.5), 3))
+                if has_lyric:
+                    yield _rec('RULE.Collision.lyrics_vs_dynamics_stacking', {
+                        'lyricsBaselineSP': -7.5,
+                        'dynamicsBBox': _bbox(rnd, i * 2.0, -6.0, 2.2, 1.2),
+                        'minGapSP': 0.5,
+                    })
+        if grobs:
+            yield _rec('RULE.Collision.priority_lattice', {'grobTypes': grobs, 'proximities': prox})
+        if syllables:
+            yield _rec('RULE.Lyrics.vertical_alignment_with_baselines', {
+                'syllableBBoxes': syllables,
+                'staffBaseline': 0.0,
+            })
+        extent = STAFF_HEIGHT_SP + rnd.uniform(1.0, 4.0) * (1 + lyrics + dynamics)
+        staff_boxes.append(_bbox(rnd, 0.0, -extent / 2, LINE_WIDTH_SP, extent))
+    yield _rec('RULE.Spacing.keep_inside_system_constraints', {'lineWidth': LINE_WIDTH_SP, 'columns': column_widths})
+    yield _rec('RULE.Vertical.min_dist_padding_and_stretch', {
+        'objectBBoxes': staff_boxes,
+        'minDistances': [round(rnd.uniform(6.0, 9.0), 3) for _ in range(staves)],
+    })
+
+def generate(seed=0, staves=4, measures=64, measures_per_system=4, systems_per_page=3,
+             events_per_measure=6, lyrics=0.3, dynamics=0.1, fingering=0.1, start_system=0,
+             operations=None):
+    """
+    Yield workload records for the whole score (lazily, one system at a time),
+    every operation in the mix unless `operations` names the ones to keep.
+    """
+    operations = None if operations is None else set(operations)
+    for rec in _records(seed, staves, measures, measures_per_system, systems_per_page,
+                        events_per_measure, lyrics, dynamics, fingering, start_system):
+        if operations is None or rec['operationId'] in operations:
+            yield rec
+
+def _records(seed, staves, measures, measures_per_system, systems_per_page,
+             events_per_measure, lyrics, dynamics, fingering, start_system):
+    systems = -(-measures // measures_per_system)
+    page_widths = []
+    for system in range(start_system, systems):
+        per = min(measures_per_system, measures - system * measures_per_system)
+        yield from system_records(seed, system, staves, per, events_per_measure, lyrics, dynamics, fingering)
+        page_widths.append(round(LINE_WIDTH_SP * random.Random(f'{seed}:{system}:w').uniform(0.85, 1.05), 3))
+        # Cast off two pages' worth of systems at a time so there is a break to choose.
+        if len(page_widths) == systems_per_page * 2 or system == systems - 1:
+            yield _rec('RULE.Pagination.castoff_fill_vs_overfull_penalties', {
+                'systemWidths': page_widths,
+                'breakOpportunities': list(range(1, len(page_widths))),
+                'pageSize': 'A4',
+            })
+            page_widths = []
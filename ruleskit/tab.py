@@ -0,0 +1,109 @@
+"""
+String/fret assignment for tablature.
+
+Each event (a note or a chord, as MIDI pitches) has a set of playable
+fingerings: one distinct string per note, fret = pitch - open string,
+0..MAX_FRET, and the fretted notes within MAX_SPAN frets of each other.
+Candidate sets depend only on (pitches, tuning), so they are enumerated once
+per distinct chord (`candidates`, memoized) and ranked by a static cost —
+higher positions cost a little, open strings nothing — keeping the best
+MAX_CANDIDATES.
+
+`assign` runs Viterbi over the passage: the cost of moving between two
+fingerings is the hand shift (distance between their mean fretted
+positions; open-string-only fingerings leave the hand where it was). A
+state is a fingering together with the hand position it leaves, so an
+open-string event keeps one state per hand position reaching it rather than
+collapsing them into the cheapest; after each event only the BEAM_WIDTH
+cheapest states survive. Work is
+O(events x BEAM_WIDTH x MAX_CANDIDATES) with no per-event enumeration after
+the first occurrence of a chord.
+"""
+from functools import lru_cache
+
+STANDARD_TUNING = (64, 59, 55, 50, 45, 40)   # string 1 (highest) first
+MAX_FRET = 24
+MAX_SPAN = 4
+MAX_CANDIDATES = 16
+BEAM_WIDTH = 8
+POSITION_WEIGHT = 0.05    # static cost per fret of hand position
+SHIFT_WEIGHT = 1.0        # cost per fret of hand movement
+
+class Fingering(tuple):
+    """((string, fret), ...) in the event's note order, plus hand position and static cost."""
+    __slots__ = ()
+
+    @property
+    def hand(self):
+        fretted = [f for _, f in self if f]
+        return sum(fretted) / len(fretted) if fretted else None
+
+def _static_cost(fingering):
+    fretted = [f for _, f in fingering if f]
+    return POSITION_WEIGHT * (sum(fretted) / len(fretted) if fretted else 0.0)
+
+@lru_cache(maxsize=4096)
+def candidates(pitches, tuning):
+    """Playable fingerings of a chord (tuple of pitches), cheapest first."""
+    options = []
+    for p in pitches:
+        opts = [(s + 1, p - open_) for s, open_ in enumerate(tuning) if 0 <= p - open_ <= MAX_FRET]
+        if not opts:
+            raise ValueError(f'pitch {p} is not playable on tuning {list(tuning)} (frets 0-{MAX_FRET})')
+        options.append(opts)
+    found = []
+
+    def walk(i, used, chosen, lo, hi):
+        if i == len(options):
+            found.append(Fingering(chosen))
+            return
+        for string, fret in options[i]:
+            if string in used:
+                continue
+            nlo, nhi = (min(lo, fret), max(hi, fret)) if fret else (lo, hi)
+            if nhi - nlo > MAX_SPAN:
+                continue
+            walk(i + 1, used | {string}, chosen + ((string, fret),), nlo, nhi)
+
+    walk(0, frozenset(), (), MAX_FRET + 1, -1)
+    if not found:
+        raise ValueError(f'chord {list(pitches)} has no fingering within a {MAX_SPAN}-fret span')
+    found.sort(key=_static_cost)
+    return tuple(found[:MAX_CANDIDATES])
+
+def _midi(value):
+    """A MIDI number given as int or integral float (JSON may send 60.0)."""
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f'pitch {value} is not a whole MIDI number')
+        return int(value)
+    return value
+
+def assign(events, tuning=STANDARD_TUNING):
+    """events: pitch or sequence of pitches per event -> one Fingering per event."""
+    tuning = tuple(_midi(t) for t in tuning)
+    # state: (cost, hand position, backpointer index into history[-1], fingering)
+    history = []
+    beam = [(0.0, None, -1, None)]
+    for event in events:
+        pitches = (_midi(event),) if isinstance(event, (int, float)) else tuple(_midi(p) for p in event)
+        best = {}   # (fingering, hand carried forward) -> cheapest state
+        for fing in candidates(pitches, tuning):
+            hand, static = fing.hand, _static_cost(fing)
+            for k, (cost, prev_hand, _, _) in enumerate(beam):
+                shift = abs(hand - prev_hand) if hand is not None and prev_hand is not None else 0.0
+                total = cost + SHIFT_WEIGHT * shift + static
+                carried = hand if hand is not None else prev_hand
+                key = (fing, carried)
+                if key not in best or total < best[key][0]:
+                    best[key] = (total, carried, k, fing)
+        beam = sorted(best.values(), key=lambda s: s[0])[:BEAM_WIDTH]
+        history.append(beam)
+    if not history:
+        return []
+    out, k = [], 0
+    for layer in reversed(history):
+        state = layer[k]
+        out.append(state[3])
+        k = state[2]
+    return out[::-1]
@@ -0,0 +1,46 @@
+"""
+Wire formats for rule payloads. JSON is always available; MessagePack
+(application/msgpack, as declared next to application/json on every typed path)
+comes from the `msgpack` package in requirements.txt; an install without it
+still serves JSON and answers msgpack requests with 415.
+
+MessagePack decodes straight into the runtime's representation (dicts, lists,
+floats) and rule outputs are packed directly, with no JSON text in between.
+"""
+import json
+
+try:
+    import msgpack
+except ImportError:  # not installed: JSON only
+    msgpack = None
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+
+def supported():
+    return (JSON, MSGPACK) if msgpack is not None else (JSON,)
+
+def media_type(header):
+    return (header or JSON).split(';', 1)[0].strip().lower() or JSON
+
+def negotiate(accept):
+    """Pick the response media type from an Accept header (JSON by default)."""
+    for part in (accept or '').split(','):
+        mt = media_type(part)
+        if mt in supported():
+            return mt
+    return JSON
+
+def decode(body, mt=JSON):
+    if mt == MSGPACK and msgpack is not None:
+        return msgpack.unpackb(body, raw=False) if body else {}
+    if mt != JSON:
+        raise ValueError(f'unsupported media type {mt}')
+    return json.loads(body or b'{}')
+
+def encode(obj, mt=JSON):
+    if mt == MSGPACK and msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    if mt != JSON:
+        raise ValueError(f'unsupported media type {mt}')
+    return json.dumps(obj, separators=(',',':')).encode('utf-8')
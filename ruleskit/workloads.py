@@ -0,0 +1,82 @@
+"""
+Rule workloads: (operationId, input, fixtures) samples used by the benchmark
+and load-test tooling. `from_tests` derives them from the inputs declared in
+tests/*.yml cases and REGISTRY test_plan cases, with the test plan's fixtures;
+`from_ndjson` samples a record file such as scripts/generate_workload.py output.
+`batch_inputs` spreads a few samples into a batch of distinct payloads.
+"""
+import json
+from pathlib import Path
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+REG = ROOT / 'rules' / 'REGISTRY.yaml'
+TESTS = ROOT / 'tests'
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+BATCH_SYSTEM_SIZE = 16   # payloads per systemId in a benchmark batch
+BATCH_X_STEP_SP = 4.0    # horizontal distance between successive payloads of a system
+
+def from_tests(reg_path=REG, tests_dir=TESTS):
+    """Return {operationId: [(input, fixtures), ...]} for every case with an input."""
+    out = {}
+    plan_fixtures = {}
+    for r in (yaml.load(Path(reg_path).read_text(), Loader=Loader) or {}).get('rules', []):
+        plan = r.get('test_plan') or {}
+        plan_fixtures[r['id']] = plan.get('fixtures')
+        for c in plan.get('cases') or []:
+            if c.get('input') is not None:
+                out.setdefault(r['id'], []).append((c['input'], c.get('fixtures') or plan.get('fixtures')))
+    for tf in sorted(Path(tests_dir).glob('*.yml')):
+        doc = yaml.load(tf.read_text(), Loader=Loader) or {}
+        rid = doc.get('rule')
+        for c in doc.get('cases') or []:
+            if c.get('input') is not None:
+                fx = c.get('fixtures') or doc.get('fixtures') or plan_fixtures.get(rid)
+                out.setdefault(rid, []).append((c['input'], fx))
+    return out
+
+def from_ndjson(path, limit_per_op=1000):
+    """Return {operationId: [(input, fixtures), ...]} keeping at most `limit_per_op` each."""
+    out = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            samples = out.setdefault(rec['operationId'], [])
+            if len(samples) < limit_per_op:
+                samples.append((rec.get('input') or {}, rec.get('fixtures')))
+    return out
+
+def _moved(value, dx):
+    if isinstance(value, dict):
+        if all(isinstance(value.get(k), (int, float)) for k in ('x', 'y', 'w', 'h')):
+            return {**value, 'x': value['x'] + dx}
+        return {k: _moved(v, dx) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_moved(v, dx) for v in value]
+    return value
+
+def batch_inputs(inputs, size, system_size=BATCH_SYSTEM_SIZE):
+    """
+    `size` distinct payloads for a batch benchmark from a few sample inputs.
+
+    Payload j is input j mod len(inputs) with every box moved
+    (j mod system_size) * BATCH_X_STEP_SP, i.e. by its position within its
+    system, so x restarts at each system. Each run of `system_size` payloads shares a systemId
+    (and the staffBaseline of its first payload), so the batch forms that lay
+    out a system in one pass see systems of different marks rather than one
+    payload repeated.
+    """
+    out, baseline = [], None
+    for j in range(size):
+        k = j % system_size
+        payload = _moved(inputs[j % len(inputs)], k * BATCH_X_STEP_SP)
+        payload['systemId'] = f'batch-{j // system_size}'
+        if k == 0:
+            baseline = payload.get('staffBaseline')
+        if 'staffBaseline' in payload and baseline is not None:
+            payload['staffBaseline'] = baseline
+        out.append(payload)
+    return out
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Per-rule microbenchmarks for the ruleskit runtime.
+
+Workloads come from the inputs declared in tests/*.yml and REGISTRY
+test_plan cases (see ruleskit.workloads), or from an NDJSON record file such
+as scripts/generate_workload.py output (--workload). For every implemented operationId
+this measures single-call latency (p50/p99) and throughput, plus batched
+throughput and per-payload latency (each batch call's time divided by the
+batch size, p50/p99 over --batches calls) via Runtime.apply_batch — on distinct payloads grouped into
+systems (ruleskit.workloads.batch_inputs), so the batch forms that stack a
+whole system in one pass are measured on realistic systems — and prints the
+results grouped by agent.
+
+  --save    write results as the JSON baseline (default bench/rule-baselines.json)
+  --check   compare against the baseline; exit 1 when a rule's p50 latency or
+            batch throughput regresses by more than --threshold (default 25%)
+"""
+import sys, json, time, argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from ruleskit import Runtime
+from ruleskit.fixtures import from_fixtures
+from ruleskit.workloads import from_tests, from_ndjson, batch_inputs
+
+BASELINE = ROOT / 'bench' / 'rule-baselines.json'
+
+def percentile(sorted_vals, q):
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * (len(sorted_vals) - 1) + 0.5))]
+
+def bench_op(rt, rid, samples, iterations, batch_size, batches):
+    prepared = [(inp, from_fixtures(fx)) for inp, fx in samples]
+    lat = []
+    clock = time.perf_counter_ns
+    for i in range(iterations):
+        inp, ctx = prepared[i % len(prepared)]
+        t0 = clock()
+        rt.apply(rid, inp, ctx)
+        lat.append(clock() - t0)
+    lat.sort()
+    ctx0 = prepared[0][1]
+    same = [inp for inp, ctx in prepared if ctx is ctx0]
+    batch = batch_inputs(same, batch_size)
+    per_payload = []
+    for _ in range(batches):
+        t0 = clock()
+        rt.apply_batch(rid, batch, ctx0)
+        per_payload.append((clock() - t0) / batch_size)
+    per_payload.sort()
+    dt = sum(per_payload) * batch_size / 1e9
+    return {
+        'samples': len(samples),
+        'p50_us': round(percentile(lat, 0.50) / 1e3, 3),
+        'p99_us': round(percentile(lat, 0.99) / 1e3, 3),
+        'mean_us': round(sum(lat) / len(lat) / 1e3, 3),
+        'single_ops_per_s': round(len(lat) / (sum(lat) / 1e9)) if sum(lat) else None,
+        'batch_ops_per_s': round(batch_size * batches / dt) if dt else None,
+        'batch_p50_us': round(percentile(per_payload, 0.50) / 1e3, 3),
+        'batch_p99_us': round(percentile(per_payload, 0.99) / 1e3, 3),
+    }
+
+def regressions(results, baseline, threshold):
+    out = []
+    for rid, cur in results.items():
+        prev = baseline.get(rid)
+        if not prev:
+            continue
+        if prev.get('p50_us') and cur['p50_us'] > prev['p50_us'] * (1 + threshold):
+            out.append(f"{rid}: p50 {cur['p50_us']}us vs baseline {prev['p50_us']}us")
+        if prev.get('batch_ops_per_s') and cur['batch_ops_per_s'] < prev['batch_ops_per_s'] / (1 + threshold):
+            out.append(f"{rid}: batch {cur['batch_ops_per_s']}/s vs baseline {prev['batch_ops_per_s']}/s")
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description='Per-rule microbenchmarks')
+    ap.add_argument('--ops', help='only operationIds containing this substring')
+    ap.add_argument('--workload', type=Path, help='NDJSON {operationId, input, fixtures} records')
+    ap.add_argument('--max-samples', type=int, default=1000, help='samples kept per operationId from --workload')
+    ap.add_argument('--iterations', type=int, default=2000)
+    ap.add_argument('--batch-size', type=int, default=256)
+    ap.add_argument('--batches', type=int, default=20)
+    ap.add_argument('--baseline', type=Path, default=BASELINE)
+    ap.add_argument('--save', action='store_true')
+    ap.add_argument('--check', action='store_true')
+    ap.add_argument('--threshold', type=float, default=0.25)
+    args = ap.parse_args()
+
+    rt = Runtime()
+    workloads = from_ndjson(args.workload, args.max_samples) if args.workload else from_tests()
+    implemented = set(rt.implemented())
+    results = {}
+    for rid in sorted(implemented):
+        if args.ops and args.ops not in rid:
+            continue
+        samples = workloads.get(rid)
+        if not samples:
+            print(f'(no workload with inputs for {rid})', file=sys.stderr)
+            continue
+        results[rid] = bench_op(rt, rid, samples, args.iterations, args.batch_size, args.batches)
+
+    by_agent = {}
+    for rid, res in results.items():
+        by_agent.setdefault(rt.operations[rid].agent, []).append((rid, res))
+    for agent in sorted(by_agent, key=lambda a: -sum(r['mean_us'] for _, r in by_agent[a])):
+        rows = by_agent[agent]
+        print(f"{agent} — {sum(r['mean_us'] for _, r in rows):.1f}us mean per call across {len(rows)} rules")
+        for rid, r in rows:
+            print(f"  {rid}: p50 {r['p50_us']}us p99 {r['p99_us']}us single {r['single_ops_per_s']}/s "
+                  f"batch {r['batch_ops_per_s']}/s (p50 {r['batch_p50_us']}us p99 {r['batch_p99_us']}us per payload)")
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True))
+        print(f'Wrote baseline for {len(results)} rules to {args.baseline}')
+    if args.check:
+        if not args.baseline.exists():
+            print(f'No baseline at {args.baseline}; run with --save first')
+            sys.exit(1)
+        bad = regressions(results, json.loads(args.baseline.read_text()), args.threshold)
+        if bad:
+            print('RULE BENCHMARK REGRESSIONS:')
+            for b in bad:
+                print(' -', b)
+            sys.exit(1)
+        print(f'Rule benchmarks OK — no regressions beyond {args.threshold:.0%}.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compare JSON and MessagePack throughput on real rule traffic (request decode +
+response encode, the service's per-request wire cost).
+
+Requests come from the synthetic score workload (`ruleskit.synth`, sized with
+--staves / --measures) or from an NDJSON record file such as
+scripts/generate_workload.py output (--workload). Each response is the actual
+`Runtime.apply` output for its request, computed once up front; records the
+runtime rejects are left out. Results are reported overall and per operation.
+
+RULE.VerticalAlign.stack_and_padding_policy (VerticalAlignStackInput) has no
+implementation yet, so it is benchmarked on hand-built traffic: one system of
+--align-staves BBoxes per payload (or an NDJSON file of payloads, --payloads)
+with a response of the declared shape, one yOffsetsSP entry per box.
+"""
+import sys, json, time, random, argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from ruleskit import Runtime, RuleNotImplemented, wire, synth
+from ruleskit.fixtures import from_fixtures
+from ruleskit.service import REJECTED
+
+VERTICAL_ALIGN = 'RULE.VerticalAlign.stack_and_padding_policy'
+
+def align_payloads(count, staves, seed=0):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(count):
+        y = 0.0
+        boxes = []
+        for _ in range(staves):
+            h = 4.0 + rnd.uniform(0.0, 6.0)
+            boxes.append({'x': 0.0, 'y': round(y, 4), 'w': round(rnd.uniform(80.0, 120.0), 4), 'h': round(h, 4)})
+            y += h + rnd.uniform(2.0, 8.0)
+        out.append({'bboxes': boxes, 'minGapSP': 1.5})
+    return out
+
+def align_response(payload):
+    return {'yOffsetsSP': [b['y'] for b in payload['bboxes']]}
+
+def exchanges(records):
+    """(operationId, request payload, response output) for every record the runtime answers."""
+    rt = Runtime()
+    out, skipped = [], 0
+    for rec in records:
+        rid, payload = rec['operationId'], rec.get('input') or {}
+        try:
+            out.append((rid, payload, rt.apply(rid, payload, from_fixtures(rec.get('fixtures')))))
+        except (RuleNotImplemented, *REJECTED):
+            skipped += 1
+    if skipped:
+        print(f'({skipped} records skipped: not implemented or rejected)', file=sys.stderr)
+    return out
+
+def bench(mt, items, repeat):
+    bodies = [wire.encode(payload, mt) for _, payload, _ in items]
+    outputs = [output for _, _, output in items]
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for body, out in zip(bodies, outputs):
+            wire.decode(body, mt)
+            wire.encode(out, mt)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    nbytes = sum(len(b) for b in bodies)
+    return {'media': mt, 'requests_per_s': round(len(items) / best), 'mb_per_s': round(nbytes / best / 1e6, 1),
+            'avg_request_bytes': round(nbytes / len(items)),
+            'avg_response_bytes': round(sum(len(wire.encode(o, mt)) for o in outputs) / len(items))}
+
+def main():
+    ap = argparse.ArgumentParser(description='JSON vs MessagePack wire benchmark')
+    ap.add_argument('--workload', type=Path, help='NDJSON {operationId, input, fixtures} records')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--staves', type=int, default=8)
+    ap.add_argument('--measures', type=int, default=64)
+    ap.add_argument('--payloads', type=Path, help='NDJSON file of VerticalAlignStackInput payloads')
+    ap.add_argument('--align-count', type=int, default=2000)
+    ap.add_argument('--align-staves', type=int, default=40)
+    ap.add_argument('--repeat', type=int, default=5)
+    args = ap.parse_args()
+    if args.workload:
+        records = [json.loads(line) for line in args.workload.read_text().splitlines() if line.strip()]
+    else:
+        records = synth.generate(args.seed, args.staves, args.measures)
+    items = exchanges(records)
+    if not items:
+        sys.exit('no records the runtime can answer')
+    by_op = {}
+    for item in items:
+        by_op.setdefault(item[0], []).append(item)
+    results = {'all': [bench(mt, items, args.repeat) for mt in wire.supported()]}
+    for rid in sorted(by_op):
+        results[rid] = [bench(mt, by_op[rid], args.repeat) for mt in wire.supported()]
+    if args.payloads:
+        align = [json.loads(line) for line in args.payloads.read_text().splitlines() if line.strip()]
+    else:
+        align = align_payloads(args.align_count, args.align_staves)
+    align_items = [(VERTICAL_ALIGN, p, align_response(p)) for p in align]
+    results[VERTICAL_ALIGN + ' (hand-built)'] = [bench(mt, align_items, args.repeat) for mt in wire.supported()]
+    if wire.MSGPACK not in wire.supported():
+        print('msgpack not installed — binary format skipped (pip install msgpack)', file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
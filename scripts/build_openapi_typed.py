@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
-import sys
+import sys, json
 from pathlib import Path
 import yaml
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from ruleskit.spec import INDEX, compile_index  # noqa: E402
+
 UNTYPED = ROOT / 'openapi' / 'rules-as-functions.yaml'
 TYPED = ROOT / 'openapi' / 'rules-as-functions.typed.yaml'
+# Binary wire format offered next to JSON on every operation (same schema).
+BINARY_MEDIA = 'application/msgpack'
+
+def declare_binary_media(post):
+    for node in (post.get('requestBody'), (post.get('responses') or {}).get('200')):
+        content = (node or {}).get('content') or {}
+        if 'application/json' in content:
+            content[BINARY_MEDIA] = {'schema': dict(content['application/json']['schema'])}
 
 def ensure_components(doc):
     comp = doc.setdefault('components', {}).setdefault('schemas', {})
@@ -784,7 +795,10 @@ def main():
             if xr.get('status') == 'ratified':
                 post['requestBody'] = {'required': True, 'content': {'application/json': {'schema': {'$ref': '#/components/schemas/GenericContext'}}}}
                 post['responses'] = {'200': {'description': op['post'].get('responses',{}).get('200',{}).get('description','OK'), 'content': {'application/json': {'schema': {'$ref': '#/components/schemas/GenericAdjustments'}}}}}
+        declare_binary_media(post)
     TYPED.write_text(yaml.safe_dump(typed, sort_keys=False))
+    # Precompiled index for the runtime (operation table + resolved schema digests)
+    INDEX.write_text(json.dumps(compile_index(typed), indent=1) + '\n')
     print('Typed OpenAPI updated with parity for all rules (placeholders for new ops).')
 
 if __name__ == '__main__':
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Compile SMuFL font metadata (e.g. bravura_metadata.json) into the compact glyph
+table that ruleskit memory-maps: advance, bbox, anchors and engraving-default
+thicknesses for every glyph in smufl/whitelist.json.
+
+Usage: python scripts/build_smufl_table.py FONT_METADATA.json [--out PATH]
+Default output: smufl/<fontName>.glyphs.bin
+"""
+import sys, json, argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from ruleskit import smufl
+
+def main():
+    ap = argparse.ArgumentParser(description='Compile SMuFL metadata into a glyph table')
+    ap.add_argument('metadata', type=Path)
+    ap.add_argument('--out', type=Path)
+    args = ap.parse_args()
+    meta = json.loads(args.metadata.read_text())
+    glyphs = smufl.whitelisted_glyphs()
+    data = smufl.compile_table(meta, glyphs)
+    name = (meta.get('fontName') if isinstance(meta, dict) else None) or args.metadata.stem.split('_')[0]
+    out = args.out or ROOT / 'smufl' / f'{name}.glyphs.bin'
+    out.write_bytes(data)
+    table = smufl.GlyphTable(out)
+    missing = [g for g in glyphs if table.advance(g) is None and table.bbox(g) is None and table.thickness(g) is None]
+    print(f'Wrote {out} ({len(data)} bytes, {len(glyphs)} glyphs, {len(table.anchor_names)} anchor kinds).')
+    if missing:
+        print(f'No metrics in font for: {", ".join(missing)}')
+
+if __name__ == '__main__':
+    main()
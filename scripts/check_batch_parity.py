@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Ensure every batch form agrees with its single-call rule.
+
+For each operation with a registered batch form, the inputs of its YAML test
+cases (and REGISTRY test_plan cases) are applied one by one and then as one
+batch — repeated a few times over, so unrelated payloads share the batch —
+and every batch output must equal the single-call output for that payload.
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from ruleskit import Runtime, rules                   # noqa: E402
+from ruleskit.runtime import _BATCH                   # noqa: E402
+from ruleskit.workloads import from_tests             # noqa: E402
+
+REPEAT = 3
+TOLERANCE = 1e-9
+
+def same(a, b):
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)) and not isinstance(a, bool):
+        return abs(a - b) <= TOLERANCE
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    return a == b
+
+def main():
+    rt = Runtime()
+    rules.load_all()
+    samples = from_tests()
+    failures, checked = [], 0
+    for rid in sorted(_BATCH):
+        inputs = [inp for inp, _ in samples.get(rid, ())]
+        if rid not in rt.operations or not inputs:
+            continue
+        singles = [rt.apply(rid, p) for p in inputs]
+        batch = rt.apply_batch(rid, inputs * REPEAT)
+        for k, out in enumerate(batch):
+            checked += 1
+            if not same(out, singles[k % len(inputs)]):
+                failures.append((rid, k % len(inputs), singles[k % len(inputs)], out))
+    if failures:
+        print('BATCH PARITY GATE FAILED: batch output differs from single calls:')
+        for rid, i, single, out in failures:
+            print(f' - {rid} input #{i}: single {single!r} != batch {out!r}')
+        sys.exit(1)
+    print(f'Batch parity OK — {checked} batch outputs match their single calls.')
+
+if __name__ == '__main__':
+    main()
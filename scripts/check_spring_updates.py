@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Ensure incremental spring-chain solves agree with a fresh solve.
+
+Random chains (seeded; small integer rods and ideals so breakpoints tie
+often) get a run of `SpringChain.update` / `retarget` steps, and after every
+step the gap lengths must equal those of a new chain with the same gaps
+solved from scratch. A fixed case with tied breakpoints and a StaffStack
+update with systemHeightSP check the same through the vertical rule.
+"""
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from ruleskit.springs import SpringChain            # noqa: E402
+from ruleskit.rules.vertical import StaffStack       # noqa: E402
+
+CHAINS = 1000
+STEPS = 15
+TOLERANCE = 1e-9
+
+def fresh(chain):
+    f = SpringChain(list(chain.rods), list(chain.ideals), [1.0 / k for k in chain.inv], chain.target)
+    f.solve()
+    return f.lengths()
+
+def differs(a, b):
+    return any(abs(x - y) > TOLERANCE for x, y in zip(a, b))
+
+def random_steps(seed=0):
+    rnd = random.Random(seed)
+    for c in range(CHAINS):
+        n = rnd.randint(1, 8)
+        chain = SpringChain([rnd.choice((0, 0, 1, 2, rnd.uniform(0, 3))) for _ in range(n)],
+                            [rnd.choice((0, 2, 3, rnd.uniform(0, 3))) for _ in range(n)],
+                            [rnd.choice((1, 1, 2, 0.5)) for _ in range(n)],
+                            rnd.uniform(0, 15))
+        chain.solve()
+        for s in range(STEPS):
+            if rnd.random() < 0.7:
+                i, field = rnd.randrange(n), rnd.choice(('rod', 'ideal', 'stiffness'))
+                value = rnd.choice((0, 1, 2, 3, rnd.uniform(0, 3)))
+                if field == 'stiffness' and value <= 0:
+                    value = 1
+                chain.update(i, **{field: value})
+                step = f'update({i}, {field}={value})'
+            else:
+                target = rnd.choice((0, 3, 6, rnd.uniform(0, 20)))
+                chain.retarget(target)
+                step = f'retarget({target})'
+            expected = fresh(chain)
+            if differs(chain.lengths(), expected):
+                yield f'chain #{c} step {s} {step}: {chain.lengths()} != fresh {expected}'
+
+def fixed_cases():
+    chain = SpringChain([0, 0, 1, 2], [3, 0, 2, 0], target=6)
+    chain.solve()
+    chain.update(3, rod=0)
+    if differs(chain.lengths(), fresh(chain)):
+        yield f'tied breakpoints: update(3, rod=0) gives {chain.lengths()} (sum {sum(chain.lengths())}), fresh {fresh(chain)}'
+    boxes = [{'x': 0, 'y': -4 - 9 * i, 'w': 20, 'h': 4} for i in range(5)]
+    stack = StaffStack(boxes, [1.5], 50)
+    stack.update(2, {'x': 0, 'y': -21, 'w': 20, 'h': 5})
+    ys = stack.positions()
+    height = stack.top - ys[-1]
+    if abs(height - 50) > TOLERANCE:
+        yield f'StaffStack.update: system is {height} sp tall, expected 50'
+
+def main():
+    failures = list(fixed_cases()) + list(random_steps())
+    if failures:
+        print('SPRING UPDATE GATE FAILED: incremental solve differs from a fresh solve:')
+        for f in failures[:20]:
+            print(' -', f)
+        sys.exit(1)
+    print(f'Spring updates OK — {CHAINS * STEPS} update/retarget steps match a fresh solve.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Fuzz rule implementations with schema-valid random inputs generated from the
+typed components (see ruleskit.fuzz), in-process or against a running rule
+service (--url), and report the slowest inputs per rule plus any errors.
+
+  --adversarial   huge arrays, degenerate BBoxes, extreme staff-space values
+  --save FILE     write the slowest cases as NDJSON {operationId, input, ms}
+
+Inputs a rule rejects (400 from the service) are counted per operation and
+left out of the latency ranking; an operation rejecting more than
+--max-rejected of its inputs is not really being exercised and fails the run.
+Exits 1 when an implementation raises anything the service would not answer
+with 400/501 (in-process), or when the service answers 5xx, drops the
+connection or stops answering (--url; fuzzing stops at the first such input).
+"""
+import sys, json, time, heapq, argparse, urllib.request, urllib.error
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from ruleskit import Runtime, RuleNotImplemented, spec, fuzz
+from ruleskit.service import REJECTED
+
+TIMEOUT = 30.0
+
+class ServiceDown(Exception):
+    """The service closed the connection or stopped answering."""
+
+def call_service(url, path, payload):
+    """-> (rejected, error): rejected for a 4xx answer, error for a 5xx one."""
+    req = urllib.request.Request(url.rstrip('/') + path, data=json.dumps(payload).encode('utf-8'),
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=TIMEOUT) as r:
+            r.read()
+            return False, None
+    except urllib.error.HTTPError as e:
+        if e.code == 501:
+            raise RuleNotImplemented(path)
+        if e.code < 500:
+            return True, None
+        return False, f'HTTP {e.code}: {e.read()[:200]!r}'
+    except OSError as e:   # URLError (refused, unreachable), ConnectionResetError, timeouts
+        raise ServiceDown(f'{type(e).__name__}: {getattr(e, "reason", e)}') from None
+
+def main():
+    ap = argparse.ArgumentParser(description='Schema-driven rule fuzzer')
+    ap.add_argument('--ops', help='only operationIds containing this substring')
+    ap.add_argument('--count', type=int, default=500, help='inputs per operationId')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--adversarial', action='store_true')
+    ap.add_argument('--max-items', type=int, default=8)
+    ap.add_argument('--huge-items', type=int, default=10000)
+    ap.add_argument('--top', type=int, default=3, help='slowest cases reported per rule')
+    ap.add_argument('--url', help='fuzz a running service instead of the in-process runtime')
+    ap.add_argument('--save', type=Path)
+    ap.add_argument('--max-rejected', type=float, default=0.5,
+                    help='fail when an operation rejects more than this fraction of its inputs')
+    args = ap.parse_args()
+
+    rt = Runtime()
+    gens = fuzz.generators(rt.operations, spec.load_components(), args.adversarial,
+                           max_items=args.max_items, huge_items=args.huge_items)
+    targets = sorted(gens) if args.url else rt.implemented()
+    slowest, errors, rejected = {}, [], {}
+    down = False
+    for rid in targets:
+        if args.ops and args.ops not in rid:
+            continue
+        op = rt.operations[rid]
+        heap = []
+        tried = refused = 0
+        try:
+            for i, payload in enumerate(fuzz.samples(gens[rid], args.count, args.seed)):
+                t0 = time.perf_counter()
+                err, refused_this = None, False
+                if args.url:
+                    try:
+                        refused_this, err = call_service(args.url, op.path, payload)
+                    except ServiceDown as e:
+                        errors.append((rid, f'service unreachable on this input: {e}', payload))
+                        down = True
+                        break
+                else:
+                    try:
+                        rt.apply(rid, payload)
+                    except REJECTED:
+                        refused_this = True   # a valid outcome (400 from the service), but not a timing
+                    except RuleNotImplemented:
+                        raise
+                    except Exception as e:
+                        err = f'{type(e).__name__}: {e}'
+                ms = (time.perf_counter() - t0) * 1e3
+                tried += 1
+                if err:
+                    errors.append((rid, err, payload))
+                if refused_this:
+                    refused += 1
+                    continue
+                item = (ms, i, payload)
+                if len(heap) < args.top:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
+        except RuleNotImplemented:
+            continue
+        slowest[rid] = sorted(heap, reverse=True)
+        if tried:
+            rejected[rid] = (refused, tried)
+        if down:
+            break
+
+    for rid in sorted(slowest, key=lambda r: -slowest[r][0][0] if slowest[r] else 0):
+        worst = slowest[rid]
+        if worst:
+            sizes = ', '.join(f'{ms:.2f}ms ({len(json.dumps(p))}B)' for ms, _, p in worst)
+            print(f'{rid}: {sizes}')
+    if args.save:
+        with args.save.open('w', encoding='utf-8') as f:
+            for rid, worst in slowest.items():
+                for ms, _, p in worst:
+                    f.write(json.dumps({'operationId': rid, 'input': p, 'ms': round(ms, 3)}) + '\n')
+    refusing = {rid: r for rid, r in rejected.items() if r[0]}
+    if refusing:
+        print('Rejected inputs:')
+        for rid, (refused, tried) in sorted(refusing.items(), key=lambda kv: -kv[1][0] / kv[1][1]):
+            print(f'  {rid}: {refused}/{tried} ({refused / tried:.0%})')
+    unexercised = sorted(rid for rid, (refused, tried) in rejected.items() if refused > args.max_rejected * tried)
+    if errors:
+        print(f'FUZZ FAILURES ({len(errors)}):')
+        for rid, err, _ in errors[:20]:
+            print(f' - {rid}: {err}')
+    if unexercised:
+        print(f'MOSTLY REJECTED (> {args.max_rejected:.0%} of inputs; the generated inputs do not exercise these):')
+        for rid in unexercised:
+            print(f' - {rid}')
+    if errors or unexercised:
+        sys.exit(1)
+    print(f'Fuzzed {len(slowest)} rules x {args.count} inputs — no failures.')
+
+if __name__ == '__main__':
+    main()
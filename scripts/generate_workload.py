@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Write a deterministic synthetic score workload as NDJSON
+({operationId, input, fixtures} per line) for ruleskit.batch,
+scripts/bench_rules.py --workload and load tests. Every operation in the
+synthetic mix is written, implemented or not; the consumers skip records the
+runtime answers with 501. Streams to the output, so
+workload size is bounded by disk, not memory.
+
+Examples:
+  python scripts/generate_workload.py --staves 100 --measures 200 -o orchestra.ndjson
+  python scripts/generate_workload.py --staves 1 --measures 10000 --lyrics 0.9 --dynamics 0.4 --fingering 0.5
+"""
+import sys, json, argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from ruleskit import synth
+
+def main():
+    ap = argparse.ArgumentParser(description='Generate a synthetic score workload (NDJSON)')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--staves', type=int, default=4)
+    ap.add_argument('--measures', type=int, default=64)
+    ap.add_argument('--measures-per-system', type=int, default=4)
+    ap.add_argument('--systems-per-page', type=int, default=3)
+    ap.add_argument('--events-per-measure', type=float, default=6)
+    ap.add_argument('--lyrics', type=float, default=0.3, help='probability of a lyric syllable per note')
+    ap.add_argument('--dynamics', type=float, default=0.1, help='probability of a dynamic per note')
+    ap.add_argument('--fingering', type=float, default=0.1, help='probability of a fingering per note')
+    ap.add_argument('--output', '-o', type=Path, help='output file (default: stdout)')
+    args = ap.parse_args()
+    sink = args.output.open('w', encoding='utf-8') if args.output else sys.stdout
+    n = 0
+    try:
+        for rec in synth.generate(args.seed, args.staves, args.measures, args.measures_per_system,
+                                  args.systems_per_page, args.events_per_measure,
+                                  args.lyrics, args.dynamics, args.fingering):
+            sink.write(json.dumps(rec, separators=(',',':')) + '\n')
+            n += 1
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    print(f'Wrote {n} records.', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -4,14 +4,20 @@ Lint the typed OpenAPI for determinism and concreteness:
 - For every array schema, require `minItems`.
 - For every path in untyped spec, require an equivalent path in typed spec.
 - For typed request/response, forbid GenericInput/GenericOutput.
+- Every typed request/response offers application/msgpack with the JSON schema.
+- The precompiled runtime index matches the typed spec.
 """
 import sys, yaml, json, hashlib
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from ruleskit.spec import INDEX, compile_index  # noqa: E402
+
 UNTYPED = ROOT / 'openapi' / 'rules-as-functions.yaml'
 TYPED = ROOT / 'openapi' / 'rules-as-functions.typed.yaml'
 LOCK = ROOT / 'openapi' / 'typed-ratified-lock.json'
+BINARY_MEDIA = 'application/msgpack'
 
 def _resolve_ref(schema, comps):
     if isinstance(schema, dict) and '$ref' in schema:
@@ -78,6 +84,10 @@ def main():
         if not xr:
             errs.append(f"Path {p} missing x-rule vendor extension")
             continue
+        for label, node in (('request', post.get('requestBody')), ('response', (post.get('responses') or {}).get('200'))):
+            content = (node or {}).get('content') or {}
+            if content.get(BINARY_MEDIA, {}).get('schema') != content.get('application/json', {}).get('schema'):
+                errs.append(f"Path {p} {label} must declare {BINARY_MEDIA} with the application/json schema")
         # Require status in x-rule
         status = xr.get('status')
         if status not in ('draft','provisional','ratified'):
@@ -125,6 +135,12 @@ def main():
     else:
         errs.append('Ratified lock file missing: openapi/typed-ratified-lock.json — generate via scripts/update_ratified_lock.py')
 
+    # Precompiled index must be regenerated with the typed spec
+    if not INDEX.exists():
+        errs.append('Precompiled index missing: openapi/rules-as-functions.index.json — run build_openapi_typed.py')
+    elif json.loads(INDEX.read_text()) != json.loads(json.dumps(compile_index(typ))):
+        errs.append('Precompiled index is stale — run build_openapi_typed.py')
+
     if errs:
         print('TYPED OPENAPI LINT FAILED')
         for e in errs:
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Execute tests/*.yml against the ruleskit runtime.
+
+A case runs when it carries an `input` payload (fixtures come from the case or
+the file, falling back to Bravura/20pt/A4); cases without input, or whose rule
+has no implementation yet, are reported as skipped. Each expectation's JSON
+pointer and comparison are compiled once into an accessor/predicate; a trailing
+`/count` segment on an array yields its length. Tolerance widens the bound
+(`>=`: actual >= value - tolerance, `==`/`approx`: |actual - value| <= tolerance).
+
+Cases are sharded across a process pool. Results go to the console and
+optionally to JUnit XML (--junit) and JSON (--json), with per-case timings.
+Exits 1 when any executed case fails.
+"""
+import sys, json, time, argparse, os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+import xml.etree.ElementTree as ET
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+TESTS = ROOT / 'tests'
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+_MISSING = object()
+
+@lru_cache(maxsize=None)
+def compile_path(pointer):
+    tokens = [t.replace('~1', '/').replace('~0', '~') for t in pointer.split('/')[1:]]
+    steps = tuple(int(t) if t.isdigit() else t for t in tokens)
+    def get(doc):
+        node = doc
+        for t in steps:
+            if isinstance(node, list):
+                if t == 'count':
+                    node = len(node)
+                elif isinstance(t, int) and t < len(node):
+                    node = node[t]
+                else:
+                    return _MISSING
+            elif isinstance(node, dict) and str(t) in node:
+                node = node[str(t)]
+            else:
+                return _MISSING
+        return node
+    return get
+
+def _num_eq(a, v, tol):
+    if isinstance(a, (int, float)) and isinstance(v, (int, float)):
+        return abs(a - v) <= tol
+    return a == v
+
+OPS = {
+    '>=': lambda a, v, tol: a >= v - tol,
+    '>': lambda a, v, tol: a > v - tol,
+    '<=': lambda a, v, tol: a <= v + tol,
+    '<': lambda a, v, tol: a < v + tol,
+    '==': _num_eq,
+    '!=': lambda a, v, tol: not _num_eq(a, v, tol),
+    'approx': lambda a, v, tol: _num_eq(a, v, tol or 1e-6),
+}
+
+_COMPILED = {}
+
+def _hashable(v):
+    return json.dumps(v, sort_keys=True) if isinstance(v, (dict, list)) else v
+
+def compile_expectation(path, op, value, tolerance):
+    # Cached on a hashable stand-in for list/dict values; the check itself
+    # compares against the original value.
+    key = (path, op, type(value).__name__, _hashable(value), tolerance)
+    check = _COMPILED.get(key)
+    if check is None:
+        check = _COMPILED[key] = _compile_expectation(path, op, value, tolerance)
+    return check
+
+def _compile_expectation(path, op, value, tolerance):
+    get = compile_path(path)
+    cmp = OPS.get(op)
+    if cmp is None:
+        raise ValueError(f'unknown op {op!r}')
+    tol = float(tolerance or 0.0)
+    def check(doc):
+        actual = get(doc)
+        if actual is _MISSING:
+            return f'{path}: missing'
+        try:
+            ok = cmp(actual, value, tol)
+        except TypeError:
+            ok = False
+        return None if ok else f'{path}: {actual!r} {op} {value!r} failed (tolerance {tol})'
+    return check
+
+def collect(paths):
+    cases = []
+    for tf in paths:
+        doc = yaml.load(tf.read_text(), Loader=Loader) or {}
+        rid = doc.get('rule')
+        for c in doc.get('cases') or []:
+            cases.append({
+                'file': tf.name,
+                'rule': rid,
+                'name': c.get('name'),
+                'input': c.get('input'),
+                'fixtures': c.get('fixtures') or doc.get('fixtures'),
+                'expectations': c.get('expectations') or [],
+            })
+    return cases
+
+_RUNTIME = None
+
+def run_shard(shard):
+    global _RUNTIME
+    from ruleskit import Runtime, RuleNotImplemented
+    from ruleskit.fixtures import from_fixtures
+    if _RUNTIME is None:
+        _RUNTIME = Runtime()
+    results = []
+    for case in shard:
+        res = {'file': case['file'], 'rule': case['rule'], 'name': case['name'], 'time': 0.0}
+        if case['input'] is None:
+            res.update(status='skipped', message='no input')
+            results.append(res)
+            continue
+        t0 = time.perf_counter()
+        try:
+            checks = [compile_expectation(e['path'], e['op'], e['value'], e.get('tolerance')) for e in case['expectations']]
+            out = _RUNTIME.apply(case['rule'], case['input'], from_fixtures(case['fixtures']))
+            errors = [m for m in (chk(out) for chk in checks) if m]
+            res.update(status='failed' if errors else 'passed', message='; '.join(errors))
+        except RuleNotImplemented:
+            res.update(status='skipped', message='rule not implemented')
+        except Exception as e:
+            res.update(status='error', message=f'{type(e).__name__}: {e}')
+        res['time'] = time.perf_counter() - t0
+        results.append(res)
+    return results
+
+def run(cases, workers, shard_size):
+    shards = [cases[i:i + shard_size] for i in range(0, len(cases), shard_size)]
+    if workers == 1 or len(shards) <= 1:
+        return [r for s in shards for r in run_shard(s)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [r for rs in pool.map(run_shard, shards) for r in rs]
+
+def write_junit(results, path, elapsed):
+    suites = ET.Element('testsuites', name='engraving-rules', time=f'{elapsed:.4f}')
+    by_file = {}
+    for r in results:
+        by_file.setdefault(r['file'], []).append(r)
+    for fname, rs in by_file.items():
+        suite = ET.SubElement(suites, 'testsuite', name=fname, tests=str(len(rs)),
+                              failures=str(sum(r['status'] == 'failed' for r in rs)),
+                              errors=str(sum(r['status'] == 'error' for r in rs)),
+                              skipped=str(sum(r['status'] == 'skipped' for r in rs)),
+                              time=f"{sum(r['time'] for r in rs):.6f}")
+        for r in rs:
+            tc = ET.SubElement(suite, 'testcase', classname=r['rule'] or fname, name=str(r['name']), time=f"{r['time']:.6f}")
+            if r['status'] in ('failed', 'error', 'skipped'):
+                tag = {'failed': 'failure', 'error': 'error', 'skipped': 'skipped'}[r['status']]
+                ET.SubElement(tc, tag, message=r['message'])
+    ET.ElementTree(suites).write(path, encoding='utf-8', xml_declaration=True)
+
+def main():
+    ap = argparse.ArgumentParser(description='Run YAML rule tests against ruleskit')
+    ap.add_argument('files', nargs='*', type=Path, help='test files (default: tests/*.yml)')
+    ap.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    ap.add_argument('--shard-size', type=int, default=64)
+    ap.add_argument('--junit', type=Path)
+    ap.add_argument('--json', type=Path)
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    cases = collect(args.files or sorted(TESTS.glob('*.yml')))
+    results = run(cases, args.workers, args.shard_size)
+    elapsed = time.perf_counter() - t0
+    counts = {s: sum(r['status'] == s for r in results) for s in ('passed', 'failed', 'error', 'skipped')}
+    if args.junit:
+        write_junit(results, args.junit, elapsed)
+    if args.json:
+        args.json.write_text(json.dumps({'elapsed': elapsed, 'counts': counts, 'results': results}, indent=2))
+    bad = [r for r in results if r['status'] in ('failed', 'error')]
+    for r in bad:
+        print(f" - {r['file']}::{r['name']} [{r['status']}] {r['message']}")
+    print(f"Rule tests executed in {elapsed:.2f}s — " + ', '.join(f'{k}: {v}' for k, v in counts.items()))
+    if bad:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
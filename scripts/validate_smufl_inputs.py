@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-# scripts/validate_smufl_inputs.py — validate smufl_inputs in REGISTRY against whitelist.
+# scripts/validate_smufl_inputs.py — validate smufl_inputs in REGISTRY against whitelist
+# and check that each one resolves through ruleskit.smufl.GlyphTable.field.
 import json, yaml, sys
 from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
@@ -20,6 +21,34 @@ for r in REG.get("rules", []):
             errors.append(f"{r['id']}: unknown glyph '{glyph}'")
         if field and field not in allowed_fields:
             errors.append(f"{r['id']}: unknown field '{field}'")
+# Every declared entry must also resolve through the runtime glyph table
+# (ruleskit.smufl.GlyphTable.field), here compiled from stand-in metrics.
+sys.path.insert(0, str(ROOT))
+import tempfile
+from ruleskit import smufl
+
+anchors = sorted({f.split(".", 1)[1] for f in allowed_fields if f.startswith(("anchors.", "anchor."))})
+meta = {
+    "glyphAdvanceWidths": {g: 1.0 for g in WL["glyphs"]},
+    "glyphBBoxes": {g: {"bBoxSW": [0.0, -0.5], "bBoxNE": [1.0, 1.0]} for g in WL["glyphs"]},
+    "glyphsWithAnchors": {g: {a: [1.0, 0.0] for a in anchors} for g in WL["glyphs"]},
+    "engravingDefaults": {k: 0.1 for k in smufl.THICKNESS_DEFAULTS.values()},
+}
+with tempfile.NamedTemporaryFile(suffix=".glyphs.bin", delete=False) as f:
+    f.write(smufl.compile_table(meta, WL["glyphs"]))
+table = smufl.GlyphTable(f.name)
+entries = {(r["id"], e) for r in REG.get("rules", []) for e in r.get("smufl_inputs", [])}
+entries |= {("whitelist", f"{WL['glyphs'][0]}.{fld}") for fld in allowed_fields}
+for rid, entry in sorted(entries):
+    glyph = entry.split(".", 1)[0]
+    if glyph not in allowed_glyphs or "." not in entry:
+        continue
+    try:
+        table.field(entry)
+    except Exception as e:
+        errors.append(f"{rid}: {entry} does not resolve in the glyph table ({type(e).__name__}: {e})")
+Path(f.name).unlink()
+
 if errors:
     print("SMuFL mapping errors:")
     for e in errors: